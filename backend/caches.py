@@ -0,0 +1,257 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Marker for "not cached", so None/False can be cached values
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded in-process cache: entries expire `ttl` seconds after they were set and the
+    least recently used entry is dropped once `maxsize` is reached. Thread-safe, so it can
+    be shared by sync endpoints (threadpool) and async ones.
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=MISSING):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl: float = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class SyncedIdSet:
+    """
+    In-memory mirror of a set of ids that lives in the DB. Loaded with `loader` at startup,
+    updated in place by the code paths that change it, and resynced every `interval`
+    seconds to pick up changes made elsewhere (SQL editor, scripts, other workers).
+    """
+    def __init__(self, loader, interval: float, name: str = "ids"):
+        self.loader = loader
+        self.interval = interval
+        self.name = name
+        self._ids = frozenset()
+        self._lock = threading.Lock()
+        self._changes = None  # add/discard calls made while a resync is loading
+        self._stopping = threading.Event()
+        self._thread = None
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.resyncs = 0
+        self.resync_failures = 0
+        self.last_resync_ms = None
+
+    def __contains__(self, item):
+        found = item in self._ids
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, item):
+        with self._lock:
+            self._ids = self._ids | {item}
+            if self._changes is not None:
+                self._changes[item] = True
+
+    def discard(self, item):
+        with self._lock:
+            self._ids = self._ids - {item}
+            if self._changes is not None:
+                self._changes[item] = False
+
+    def resync(self):
+        """
+        Replace the set with a fresh load, keeping local changes made during the load.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._changes = {}
+        try:
+            ids = set(self.loader())
+        except Exception as e:
+            self.resync_failures += 1
+            print(f"⚠️ Could not resync {self.name}: {e}")
+            with self._lock:
+                self._changes = None
+            return False
+        with self._lock:
+            for item, present in self._changes.items():
+                if present:
+                    ids.add(item)
+                else:
+                    ids.discard(item)
+            self._ids = frozenset(ids)
+            self._changes = None
+        self.resyncs += 1
+        self.last_resync_ms = (time.perf_counter() - started) * 1000
+        return True
+
+    def start(self):
+        """
+        Load now, then resync in the background.
+        """
+        self.resync()
+        print(f"🗂️ Loaded {len(self._ids)} {self.name} (resync every {self.interval}s)")
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f"resync-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            self.resync()
+
+    def metrics(self) -> dict:
+        return {
+            "size": len(self._ids),
+            "hits": self.hits,
+            "misses": self.misses,
+            "resyncs": self.resyncs,
+            "resync_failures": self.resync_failures,
+            "last_resync_ms": round(self.last_resync_ms, 1) if self.last_resync_ms is not None else None,
+        }
+
+
+class ReconciledCounters:
+    """
+    Named counters kept in memory and bumped by the write paths, so reads never count rows.
+    Every `interval` seconds they are replaced by an exact recount from `loader` (a dict of
+    counts), which corrects drift from other workers or writes made outside the API.
+    """
+    def __init__(self, loader, interval: float, name: str = "counters"):
+        self.loader = loader
+        self.interval = interval
+        self.name = name
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._deltas = None  # incr() calls made while a recount is loading
+        self._stopping = threading.Event()
+        self._thread = None
+
+        # Metrics
+        self.reconciles = 0
+        self.reconcile_failures = 0
+        self.last_drift = None  # sum of |memory - recount| at the last reconcile
+        self.last_reconcile_ms = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.reconciles > 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+    def incr(self, counter: str, n: int = 1):
+        with self._lock:
+            self._counts[counter] = self._counts.get(counter, 0) + n
+            if self._deltas is not None:
+                self._deltas[counter] = self._deltas.get(counter, 0) + n
+
+    def reconcile(self):
+        """
+        Replace the counters with an exact recount, keeping increments made during it.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._deltas = {}
+        try:
+            counts = dict(self.loader())
+        except Exception as e:
+            self.reconcile_failures += 1
+            print(f"⚠️ Could not reconcile {self.name}: {e}")
+            with self._lock:
+                self._deltas = None
+            return False
+        with self._lock:
+            for counter, n in self._deltas.items():
+                counts[counter] = counts.get(counter, 0) + n
+            if self._counts:
+                self.last_drift = sum(abs(counts.get(c, 0) - self._counts.get(c, 0)) for c in set(counts) | set(self._counts))
+            self._counts = counts
+            self._deltas = None
+        self.reconciles += 1
+        self.last_reconcile_ms = (time.perf_counter() - started) * 1000
+        return True
+
+    def start(self):
+        """
+        Count now, then reconcile in the background.
+        """
+        self.reconcile()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f"reconcile-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            self.reconcile()
+
+    def metrics(self) -> dict:
+        return {
+            "counts": self.snapshot(),
+            "reconciles": self.reconciles,
+            "reconcile_failures": self.reconcile_failures,
+            "last_drift": self.last_drift,
+            "last_reconcile_ms": round(self.last_reconcile_ms, 1) if self.last_reconcile_ms is not None else None,
+        }
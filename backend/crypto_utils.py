@@ -2,7 +2,56 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding, rsa
 from cryptography.hazmat.primitives import serialization
 from cryptography.exceptions import InvalidSignature
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import base64
+import hashlib
+import os
+import threading
+
+# Parsed public keys kept in memory: each user signs many votes with the same key
+KEY_CACHE_SIZE = int(os.getenv("CRYPTO_KEY_CACHE_SIZE", "4096"))
+# Threads for verify_signatures(); OpenSSL releases the GIL while it verifies
+VERIFY_WORKERS = int(os.getenv("CRYPTO_VERIFY_WORKERS", str(os.cpu_count() or 2)))
+
+_keys = OrderedDict()  # sha256(key text) -> public key object, in LRU order
+_keys_lock = threading.Lock()
+_verify_pool = None
+_verify_pool_lock = threading.Lock()
+
+# Metrics
+key_cache_hits = 0
+key_cache_misses = 0
+
+
+def load_public_key(public_key_pem: str):
+    """
+    Parse an SPKI public key (PEM, or bare Base64 from a WebCrypto export), through a bounded LRU
+    keyed by a hash of the key text. Keys that fail to parse are not cached.
+    """
+    global key_cache_hits, key_cache_misses
+    digest = hashlib.sha256(public_key_pem.encode('utf-8')).digest()
+    with _keys_lock:
+        public_key = _keys.get(digest)
+        if public_key is not None:
+            _keys.move_to_end(digest)
+            key_cache_hits += 1
+            return public_key
+        key_cache_misses += 1
+
+    # If it's pure Base64 (from WebCrypto export), we might need to wrap it in PEM headers
+    # or load it as DER. Frontend sends SPKI (SubjectPublicKeyInfo)
+
+    # Helper: Ensure PEM formatting
+    clean_key = public_key_pem.replace("-----BEGIN PUBLIC KEY-----", "").replace("-----END PUBLIC KEY-----", "").strip()
+    der_data = base64.b64decode(clean_key)
+
+    public_key = serialization.load_der_public_key(der_data)
+    with _keys_lock:
+        _keys[digest] = public_key
+        while len(_keys) > KEY_CACHE_SIZE:
+            _keys.popitem(last=False)
+    return public_key
 
 def verify_signature(public_key_pem: str, message: str, signature_hex: str) -> bool:
     """
@@ -10,19 +59,12 @@ def verify_signature(public_key_pem: str, message: str, signature_hex: str) -> b
     Uses RSA-PSS with SHA256 (matching WebCrypto).
     """
     try:
-        # 1. Load Public Key
-        # If it's pure Base64 (from WebCrypto export), we might need to wrap it in PEM headers
-        # or load it as DER. Frontend sends SPKI (SubjectPublicKeyInfo)
-        
-        # Helper: Ensure PEM formatting
-        clean_key = public_key_pem.replace("-----BEGIN PUBLIC KEY-----", "").replace("-----END PUBLIC KEY-----", "").strip()
-        der_data = base64.b64decode(clean_key)
-        
-        public_key = serialization.load_der_public_key(der_data)
+        # 1. Load Public Key (parsed once per key, see load_public_key)
+        public_key = load_public_key(public_key_pem)
 
         # 2. Decode Signature (Hex -> Bytes)
         signature_bytes = bytes.fromhex(signature_hex)
-        
+
         # 3. Verify
         # WebCrypto default: RSA-PSS, saltLength=32
         public_key.verify(
@@ -35,10 +77,36 @@ def verify_signature(public_key_pem: str, message: str, signature_hex: str) -> b
             hashes.SHA256()
         )
         return True
-    
+
     except InvalidSignature:
         print("❌ Invalid Signature")
         return False
     except Exception as e:
         print(f"❌ Crypto Error: {e}")
         return False
+
+def verify_signatures(items: list) -> list:
+    """
+    Batch verify_signature over (public_key_pem, message, signature_hex) triples, in parallel
+    on a shared thread pool of VERIFY_WORKERS threads. Returns one bool per triple, in order.
+    """
+    items = list(items)
+    if len(items) < 2:
+        return [verify_signature(*item) for item in items]
+    return list(_get_verify_pool().map(lambda item: verify_signature(*item), items))
+
+def _get_verify_pool() -> ThreadPoolExecutor:
+    global _verify_pool
+    with _verify_pool_lock:
+        if _verify_pool is None:
+            _verify_pool = ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix="verify")
+        return _verify_pool
+
+def metrics() -> dict:
+    lookups = key_cache_hits + key_cache_misses
+    return {
+        "key_cache_size": len(_keys),
+        "key_cache_hits": key_cache_hits,
+        "key_cache_misses": key_cache_misses,
+        "key_cache_hit_rate": round(key_cache_hits / lookups, 4) if lookups else None,
+    }
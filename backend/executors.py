@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExecutorSaturated(RuntimeError):
+    """
+    Raised instead of queueing when a BoundedExecutor already holds its maximum of jobs.
+    """
+
+
+class BoundedExecutor:
+    """
+    Thread pool for CPU-heavy work (bcrypt, ...) kept apart from the server's shared threadpool.
+    At most `workers` jobs run and `max_queue` wait; anything beyond that is rejected right
+    away with ExecutorSaturated, so a burst turns into fast errors instead of a growing backlog.
+    """
+    def __init__(self, workers: int, max_queue: int, name: str = "pool"):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.name = name
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._in_flight = 0  # running + queued
+
+        # Metrics
+        self.running = 0
+        self.peak_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_ms = 0.0
+        self.total_run_ms = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.running)
+
+    def submit(self, fn, *args):
+        """
+        Queue fn(*args) and return its concurrent Future.
+
+        Raises: ExecutorSaturated if `workers + max_queue` jobs are already in flight.
+        """
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(f"{self.name} is saturated ({self._in_flight} jobs in flight)")
+            self._in_flight += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self._in_flight - self.workers)
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self.running += 1
+                self.total_wait_ms += (started - submitted) * 1000
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self._in_flight -= 1
+                    self.completed += 1
+                    self.total_run_ms += (time.perf_counter() - started) * 1000
+
+        try:
+            return self._pool.submit(job)
+        except RuntimeError:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+    async def run(self, fn, *args):
+        """
+        Await fn(*args) on the pool without holding the event loop or a server thread.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_ms / self.completed, 1) if self.completed else None,
+            "avg_run_ms": round(self.total_run_ms / self.completed, 1) if self.completed else None,
+        }
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+
+class GroupCommitter:
+    """
+    Group commit for single-row inserts: rows submitted within `max_delay` seconds of each
+    other (up to `max_batch`) are written with one multi-row INSERT, and every caller gets
+    its own inserted row back.
+
+    A multi-row INSERT is all or nothing, so when a batch fails its rows are retried one by
+    one: the offending row's caller gets the database error (e.g. a unique-constraint
+    violation) and the others still succeed.
+
+    `insert` is an async callable taking a list of rows and returning the inserted rows in
+    the same order (PostgREST returns INSERT ... RETURNING rows in input order).
+    """
+    def __init__(self, insert, max_batch: int, max_delay: float, name: str = "rows"):
+        self.insert = insert
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.name = name
+        self._pending = []  # (row, future)
+        self._timer = None
+        self._flushes = set()  # In-flight flush tasks, so close() can wait for them
+
+        # Metrics
+        self.batches = 0
+        self.rows = 0
+        self.max_batch_seen = 0
+        self.retried_batches = 0
+        self.failed_rows = 0
+        self.total_flush_ms = 0.0
+        self.last_flush_ms = None
+
+    async def submit(self, row: dict) -> dict:
+        """
+        Queue `row` for the next batch and wait for it to be written.
+        Returns: the inserted row. Raises: the error of this row's insert.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush_now)
+        return await future
+
+    def _flush_now(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list):
+        started = time.perf_counter()
+        rows = [row for row, _ in batch]
+        try:
+            inserted = await self.insert(rows)
+            if len(inserted) != len(rows):
+                raise RuntimeError(f"Inserted {len(inserted)} of {len(rows)} {self.name}")
+            outcomes = inserted
+        except Exception:
+            if len(rows) == 1:
+                outcomes = [await self._insert_one(rows[0])]
+            else:
+                # Isolate the failing rows: each one is written (or fails) on its own
+                self.retried_batches += 1
+                outcomes = await asyncio.gather(*(self._insert_one(row) for row in rows))
+
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue  # Caller went away (request cancelled)
+            if isinstance(outcome, Exception):
+                self.failed_rows += 1
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+        self.batches += 1
+        self.rows += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        self.total_flush_ms += self.last_flush_ms
+
+    async def _insert_one(self, row: dict):
+        try:
+            return (await self.insert([row]))[0]
+        except Exception as e:
+            return e
+
+    async def close(self):
+        """
+        Write whatever is still buffered and wait for in-flight batches.
+        """
+        self._flush_now()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def metrics(self) -> dict:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "avg_batch_size": round(self.rows / self.batches, 2) if self.batches else None,
+            "max_batch_size": self.max_batch_seen,
+            "retried_batches": self.retried_batches,
+            "failed_rows": self.failed_rows,
+            "avg_flush_ms": round(self.total_flush_ms / self.batches, 1) if self.batches else None,
+            "last_flush_ms": round(self.last_flush_ms, 1) if self.last_flush_ms is not None else None,
+        }
@@ -0,0 +1,11 @@
+-- Keyset pagination for /api/feed: one index per sort mode, matching its ORDER BY
+-- (sort columns DESC, then id DESC as the tie-breaker), so each page is an index seek.
+CREATE INDEX IF NOT EXISTS idx_rumors_feed_latest ON rumors (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_rumors_feed_popularity ON rumors (vote_count DESC, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_rumors_feed_relevance ON rumors (trust_score DESC, created_at DESC, id DESC);
+
+-- The cursor compares these columns with = and <, which never match NULL
+UPDATE rumors SET vote_count = 0 WHERE vote_count IS NULL;
+UPDATE rumors SET trust_score = 0 WHERE trust_score IS NULL;
+ALTER TABLE rumors ALTER COLUMN vote_count SET NOT NULL;
+ALTER TABLE rumors ALTER COLUMN trust_score SET NOT NULL;
@@ -0,0 +1,23 @@
+-- SP (Surprisingly Popular) resolution results written back by the trust engine.
+-- verified_result stays reserved for the oracle (it fires trg_verify_rumor), so the
+-- crowd's current verdict gets its own column next to the existing trust_score.
+ALTER TABLE rumors ADD COLUMN IF NOT EXISTS sp_status TEXT DEFAULT 'pending';
+
+-- Bulk write-back: one UPDATE for a whole batch of results.
+-- updates: [{"id": "<rumor uuid>", "status": "verified", "trust_score": 0.42}, ...]
+CREATE OR REPLACE FUNCTION apply_rumor_resolutions(updates JSONB) RETURNS INT AS $$
+DECLARE
+    updated INT;
+BEGIN
+    UPDATE rumors r
+    SET sp_status = u.status,
+        trust_score = u.trust_score
+    FROM jsonb_to_recordset(updates) AS u(id UUID, status TEXT, trust_score FLOAT)
+    WHERE r.id = u.id
+      AND (r.sp_status IS DISTINCT FROM u.status OR r.trust_score IS DISTINCT FROM u.trust_score);
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE INDEX IF NOT EXISTS idx_votes_rumor_id ON votes(rumor_id);
@@ -1,11 +1,17 @@
 from fastapi.testclient import TestClient
-from backend.main import app, supabase, engine
+from backend.main import app, supabase, engine, SECRET_KEY, ALGORITHM
+import jwt
 import time
 import uuid
 
 # Initialize Test Client
 client = TestClient(app)
 
+def get_feed_as(user_id):
+    # The feed personalizes for the bearer token's owner
+    token = jwt.encode({"user_id": user_id}, SECRET_KEY, algorithm=ALGORITHM)
+    return client.get("/api/feed", headers={"Authorization": f"Bearer {token}"})
+
 def run_headless_test():
     print("🧪 HEADLESS INTEGRATION TEST: The Ripple Protocol")
     print("===============================================")
@@ -58,12 +64,12 @@ def run_headless_test():
     print("\n[4/5] Checking Feeds (The Ripple Protocol)...")
     
     # Check B
-    res_b = client.get(f"/api/feed?user_id={user_b}")
+    res_b = get_feed_as(user_b)
     feed_b = res_b.json()['rumors']
     found_b = any(r['id'] == rumor_id for r in feed_b)
     
     # Check C
-    res_c = client.get(f"/api/feed?user_id={user_c}")
+    res_c = get_feed_as(user_c)
     feed_c = res_c.json()['rumors']
     found_c = any(r['id'] == rumor_id for r in feed_c)
     
@@ -89,7 +95,7 @@ def run_headless_test():
     print("    -> Rumor is now VERIFIED. Checking User C's feed again...")
     
     # Check C again
-    res_c_new = client.get(f"/api/feed?user_id={user_c}")
+    res_c_new = get_feed_as(user_c)
     feed_c_new = res_c_new.json()['rumors']
     found_c_new = any(r['id'] == rumor_id for r in feed_c_new)
     
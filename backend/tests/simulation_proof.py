@@ -1,67 +1,75 @@
 import networkx as nx
 import random
-import matplotlib.pyplot as plt
 import statistics
 
-def run_sybil_proof():
-    print("🛡️  RUNNING SYBIL RESISTANCE PROOF 🛡️")
-    print("=======================================")
-    
-    # 1. Setup Parameters
-    NUM_HONEST = 50
-    NUM_BOTS = 1000  # Massive attack: 20x more bots than humans
-    NUM_BRIDGES = 1  # Only 1 foolish honest user trusts a bot
-    
-    print(f"Scenario:")
-    print(f"- Honest Users: {NUM_HONEST}")
-    print(f"- Bot Farm: {NUM_BOTS} (Fully connected internal trust)")
-    print(f"- Bridge Links (Honest->Bot): {NUM_BRIDGES}")
-    
+# 1. Setup Parameters
+NUM_HONEST = 50
+NUM_BOTS = 1000  # Massive attack: 20x more bots than humans
+NUM_BRIDGES = 1  # Only 1 foolish honest user trusts a bot
+
+def build_sybil_graph(num_honest=NUM_HONEST, num_bots=NUM_BOTS, num_bridges=NUM_BRIDGES, rng=random):
+    """
+    Build the attack scenario graph: an honest network, a dense bot farm and bridge edges.
+    Returns: (G, honest_ids, bot_ids, seeds)
+    """
     G = nx.DiGraph()
     
     # 2. Build Honest Network (Scale-Free-ish)
     print("\n[1/4] Building Honest Network...")
-    honest_ids = [f"H_{i}" for i in range(NUM_HONEST)]
+    honest_ids = [f"H_{i}" for i in range(num_honest)]
     G.add_nodes_from(honest_ids)
     
     # Random realistic connections (avg degree ~4)
     for u in honest_ids:
         # Connect to 4 random other honest users
-        targets = random.sample(honest_ids, 4)
+        targets = rng.sample(honest_ids, 4)
         for t in targets:
             if u != t:
                 G.add_edge(u, t)
                 
     # 3. Build Sybil (Bot) Farm
     # Bots trust each other perfectly to maximize their own scores
-    print(f"[2/4] Building Bot Farm of {NUM_BOTS} nodes...")
-    bot_ids = [f"B_{i}" for i in range(NUM_BOTS)]
+    print(f"[2/4] Building Bot Farm of {num_bots} nodes...")
+    bot_ids = [f"B_{i}" for i in range(num_bots)]
     G.add_nodes_from(bot_ids)
     
     # Bots form a dense cluster (Ring + Random) to trap score
-    for i in range(NUM_BOTS):
+    for i in range(num_bots):
         # Ring connection (guarantees connectivity)
-        next_bot = bot_ids[(i + 1) % NUM_BOTS]
+        next_bot = bot_ids[(i + 1) % num_bots]
         G.add_edge(bot_ids[i], next_bot)
         # Random internal connections
-        G.add_edge(bot_ids[i], random.choice(bot_ids))
+        G.add_edge(bot_ids[i], rng.choice(bot_ids))
         
     # 4. The Attack Vector (The Bridges)
-    print(f"[3/4] Creating {NUM_BRIDGES} bridge(s) from Honest -> Bot...")
+    print(f"[3/4] Creating {num_bridges} bridge(s) from Honest -> Bot...")
     # This represents a real user getting duped into trusting a bot
-    for _ in range(NUM_BRIDGES):
-        victim = random.choice(honest_ids)
-        attacker = random.choice(bot_ids)
+    for _ in range(num_bridges):
+        victim = rng.choice(honest_ids)
+        attacker = rng.choice(bot_ids)
         G.add_edge(victim, attacker)
         print(f"    -> User {victim} trusted Bot {attacker}")
-        
-    # 5. The Math (Personalized PageRank)
-    print("\n[4/4] Calculating Personalized PageRank...")
-    
+
     # CRITICAL FIX: Use Trusted Seeds
     # We assume the first 5 honest users are "Trusted Seeds" (e.g., admins, professors)
     # This anchors the trust graph so random jumps land on HONEST people, not bots.
     seeds = {honest_ids[i]: 1.0 for i in range(5)}
+
+    return G, honest_ids, bot_ids, seeds
+
+def run_sybil_proof():
+    print("🛡️  RUNNING SYBIL RESISTANCE PROOF 🛡️")
+    print("=======================================")
+    
+    print(f"Scenario:")
+    print(f"- Honest Users: {NUM_HONEST}")
+    print(f"- Bot Farm: {NUM_BOTS} (Fully connected internal trust)")
+    print(f"- Bridge Links (Honest->Bot): {NUM_BRIDGES}")
+    
+    G, honest_ids, bot_ids, seeds = build_sybil_graph()
+        
+    # 5. The Math (Personalized PageRank)
+    print("\n[4/4] Calculating Personalized PageRank...")
     
     # Run PPR
     ranks = nx.pagerank(G, alpha=0.85, personalization=seeds)
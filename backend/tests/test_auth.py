@@ -0,0 +1,85 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+# main.py imports its siblings the way the server runs it (from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+import jwt
+from backend import main
+import unittest
+
+class FakeUsers:
+    def __init__(self, banned: dict):
+        self.banned = banned
+        self.lookups = []
+
+    def table(self, name):
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, user_id):
+        self.user_id = user_id
+        return self
+
+    async def execute(self):
+        self.lookups.append(self.user_id)
+        return MagicMock(data=[{"is_banned": self.banned[self.user_id]}] if self.user_id in self.banned else [])
+
+class TestCurrentUser(unittest.TestCase):
+    def setUp(self):
+        self.users = FakeUsers({"good": False, "bot": True})
+        self._db, main.db = main.db, self.users
+        self._ban_cache, main.ban_cache = main.ban_cache, main.TTLCache(maxsize=16, ttl=60)
+
+    def tearDown(self):
+        main.db = self._db
+        main.ban_cache = self._ban_cache
+
+    def token(self, user_id):
+        return jwt.encode({"user_id": user_id}, main.SECRET_KEY, algorithm=main.ALGORITHM)
+
+    def current_user(self, token):
+        return asyncio.run(main.get_current_user_id(token))
+
+    def test_ban_check_on_async_client(self):
+        self.assertEqual(self.current_user(self.token("good")), "good")
+        self.assertEqual(self.current_user(self.token("good")), "good")
+        # The second call was answered by the ban cache
+        self.assertEqual(self.users.lookups, ["good"])
+
+        with self.assertRaises(main.HTTPException) as raised:
+            self.current_user(self.token("bot"))
+        self.assertEqual(raised.exception.status_code, 403)
+
+    def test_ban_invalidation(self):
+        self.assertEqual(self.current_user(self.token("good")), "good")
+        self.users.banned["good"] = True
+        # The honeypot writes the ban straight into the cache: locked out without a DB lookup
+        main.ban_cache.set("good", True)
+        with self.assertRaises(main.HTTPException) as raised:
+            self.current_user(self.token("good"))
+        self.assertEqual((raised.exception.status_code, self.users.lookups), (403, ["good"]))
+
+        # A ban (or unban) made elsewhere is picked up once the cached flag expires
+        self.users.banned["good"] = False
+        main.ban_cache.set("good", True, ttl=0.01)
+        time.sleep(0.02)
+        self.assertEqual(self.current_user(self.token("good")), "good")
+        self.assertEqual(self.users.lookups, ["good", "good"])
+
+    def test_invalid_token(self):
+        with self.assertRaises(main.HTTPException) as raised:
+            self.current_user("not-a-jwt")
+        self.assertEqual(raised.exception.status_code, 401)
+        self.assertEqual(self.users.lookups, [])
+
+if __name__ == '__main__':
+    unittest.main()
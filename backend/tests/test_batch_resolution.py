@@ -0,0 +1,140 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+# main.py imports its siblings the way the server runs it (from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+from fastapi.testclient import TestClient
+from backend import main
+from backend.trust_engine import TrustEngine
+import unittest
+
+def reference_sp(votes: list, ranks: dict) -> dict:
+    """
+    The original one-rumor-at-a-time SP loop, kept here as an independent reference.
+    """
+    if len(votes) < 3:
+        return {"status": "pending", "verified_result": None, "trust_score": 0.0, "stats": {"total": len(votes)}}
+    weighted_true = total_weight = sum_predictions = 0.0
+    for vote in votes:
+        weight = ranks.get(vote["user_id"], 0.0000001)
+        if vote["vote"]:
+            weighted_true += weight
+        total_weight += weight
+        sum_predictions += vote["prediction"]
+    actual_vote_prob = weighted_true / total_weight if total_weight > 0 else 0.5
+    avg_predicted_prob = sum_predictions / len(votes)
+    delta = actual_vote_prob - avg_predicted_prob
+
+    vote_count = len(votes)
+    tier, min_votes_required = "CIRCLE", 5
+    if vote_count >= 50:
+        tier, min_votes_required = "GLOBAL", 50
+    elif vote_count >= 20:
+        tier, min_votes_required = "NEIGHBOR", 20
+    if vote_count < min_votes_required:
+        return {"status": "pending", "verified_result": None, "trust_score": 0.0,
+                "stats": {"total": vote_count, "tier": tier}}
+
+    if delta > 0.05:
+        status, result = "verified", True
+    elif delta < -0.05:
+        status, result = "disputed", False
+    else:
+        status, result = "uncertain", None
+    trust_score = min(1.0, abs(delta) * 5) * min(1.0, vote_count / 20.0)
+    return {
+        "status": status,
+        "verified_result": result,
+        "trust_score": round(trust_score, 4),
+        "stats": {
+            "total_votes": vote_count,
+            "weighted_true_pct": round(actual_vote_prob, 4),
+            "avg_predicted_pct": round(avg_predicted_prob, 4),
+            "delta": round(delta, 4),
+        },
+    }
+
+class TestBatchResolution(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        self.engine = TrustEngine()
+        self.engine.trust_ranks = {f"user_{i}": rng.random() / 100 for i in range(80)}
+
+        # Vote counts around every tier boundary (pending, CIRCLE, NEIGHBOR, GLOBAL)
+        self.votes = []
+        for r, count in enumerate([0, 2, 3, 4, 5, 12, 19, 20, 35, 49, 50, 70]):
+            bias = rng.random()
+            for i in rng.sample(range(90), count):  # users 80+ have no rank
+                self.votes.append({
+                    "rumor_id": f"rumor_{r}",
+                    "user_id": f"user_{i}",
+                    "vote": rng.random() < bias,
+                    "prediction": round(rng.random(), 2),
+                })
+        rng.shuffle(self.votes)
+        self.rumor_ids = [f"rumor_{r}" for r in range(12)]
+
+    def test_batch_matches_scalar(self):
+        results = self.engine.resolve_rumors(self.rumor_ids, votes=self.votes)
+        self.assertEqual(list(results), self.rumor_ids)
+        ranks = dict(self.engine.trust_ranks)
+        for rumor_id in self.rumor_ids:
+            votes = [vote for vote in self.votes if vote["rumor_id"] == rumor_id]
+            result, expected = dict(results[rumor_id]), reference_sp(votes, ranks)
+            result.pop("message", None)
+            # NumPy sums in another order than the loop: allow a last-digit difference after rounding
+            self.assertEqual(result.pop("stats").keys(), expected["stats"].keys(), rumor_id)
+            for key, value in expected.pop("stats").items():
+                self.assertAlmostEqual(results[rumor_id]["stats"][key], value, delta=1e-4, msg=rumor_id)
+            self.assertAlmostEqual(result.pop("trust_score"), expected.pop("trust_score"), delta=1e-4, msg=rumor_id)
+            self.assertEqual(result, expected, rumor_id)
+            # The scalar entry point agrees with the batch
+            self.assertEqual(self.engine.resolve_rumor(rumor_id, votes), results[rumor_id], rumor_id)
+        self.assertEqual({result["status"] for result in results.values()} - {"pending", "uncertain"}, {"verified", "disputed"})
+
+    def test_all_rumors_with_votes(self):
+        results = self.engine.resolve_rumors(votes=self.votes)
+        # rumor_0 has no votes, so it is unknown without an explicit id list
+        self.assertEqual(set(results), set(self.rumor_ids) - {"rumor_0"})
+
+class TestResolveEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+        self.token, main.ADMIN_TOKEN = main.ADMIN_TOKEN, "s3cret"
+        self.runs = []
+        self._resolve, main.resolve_all_rumors = main.resolve_all_rumors, self.fake_resolve
+
+    def tearDown(self):
+        main.ADMIN_TOKEN = self.token
+        main.resolve_all_rumors = self._resolve
+
+    def fake_resolve(self):
+        self.runs.append(1)
+        main.batch_resolution.release()
+
+    def test_requires_admin_token(self):
+        for headers in ({}, {"X-Admin-Token": "wrong"}):
+            self.assertEqual(self.client.post("/api/resolve-rumors", headers=headers).status_code, 403)
+        main.ADMIN_TOKEN = None
+        self.assertEqual(self.client.post("/api/resolve-rumors", headers={"X-Admin-Token": ""}).status_code, 403)
+        self.assertEqual(self.runs, [])
+
+    def test_one_run_at_a_time(self):
+        headers = {"X-Admin-Token": "s3cret"}
+        self.assertTrue(main.batch_resolution.acquire(blocking=False))  # A run is in progress
+        try:
+            self.assertEqual(self.client.post("/api/resolve-rumors", headers=headers).status_code, 409)
+        finally:
+            main.batch_resolution.release()
+        self.assertEqual(self.client.post("/api/resolve-rumors", headers=headers).status_code, 200)
+        self.assertEqual(self.runs, [1])
+        self.assertFalse(main.batch_resolution.locked())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import time
+from backend.caches import TTLCache, SyncedIdSet, ReconciledCounters, MISSING
+import unittest
+
+class TestTTLCache(unittest.TestCase):
+    def test_expiry(self):
+        cache = TTLCache(maxsize=10, ttl=0.05)
+        cache.set("u1", False)
+        self.assertIs(cache.get("u1"), False)
+        time.sleep(0.06)
+        self.assertIs(cache.get("u1"), MISSING)
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_bound(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # b is now least recently used
+        cache.set("c", 3)
+        self.assertEqual(cache.get("b", None), None)
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+
+    def test_overwrite_and_metrics(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.get("u1")
+        cache.set("u1", False)
+        cache.set("u1", True)  # e.g. the honeypot ban
+        self.assertIs(cache.get("u1"), True)
+        self.assertEqual(cache.metrics(), {"size": 1, "hits": 1, "misses": 1, "hit_rate": 0.5})
+
+class TestSyncedIdSet(unittest.TestCase):
+    def test_resync_keeps_concurrent_changes(self):
+        loads = iter([["t1"], ["t1", "t2"]])
+
+        def loader():
+            ids = next(loads)
+            if ids == ["t1", "t2"]:
+                # Written through the API while the resync query was in flight
+                synced.add("t3")
+            return ids
+
+        synced = SyncedIdSet(loader, interval=60)
+        synced.resync()
+        self.assertNotIn("t2", synced)
+        synced.resync()
+        self.assertEqual([item in synced for item in ("t1", "t2", "t3")], [True, True, True])
+        self.assertEqual(synced.metrics()["hits"], 3)
+        self.assertEqual(synced.metrics()["misses"], 1)
+
+    def test_failed_resync_keeps_last_set(self):
+        synced = SyncedIdSet(lambda: ["t1"], interval=60)
+        synced.resync()
+        synced.loader = lambda: 1 / 0
+        self.assertFalse(synced.resync())
+        self.assertIn("t1", synced)
+
+class TestReconciledCounters(unittest.TestCase):
+    def test_reconcile_keeps_concurrent_increments(self):
+        loads = iter([{"users": 5, "rumors": 9}, {"users": 7, "rumors": 9}])
+
+        def loader():
+            counts = next(loads)
+            if counts["users"] == 7:
+                # Counted after the recount query ran, so it is not in the new totals
+                counters.incr("rumors")
+            return counts
+
+        counters = ReconciledCounters(loader, interval=60)
+        self.assertFalse(counters.loaded)
+        counters.reconcile()
+        counters.incr("users")
+        self.assertEqual(counters.snapshot(), {"users": 6, "rumors": 9})
+        counters.reconcile()
+        self.assertEqual(counters.snapshot(), {"users": 7, "rumors": 10})
+        # One user was registered by another worker
+        self.assertEqual(counters.metrics()["last_drift"], 1)
+
+    def test_failed_reconcile_keeps_counts(self):
+        counters = ReconciledCounters(lambda: {"users": 2}, interval=60)
+        counters.reconcile()
+        counters.loader = lambda: 1 / 0
+        self.assertFalse(counters.reconcile())
+        counters.incr("users")
+        self.assertEqual(counters.snapshot(), {"users": 3})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+# main.py imports its siblings the way the server runs it (from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.main import assemble_comment_tree, comment_page, HTTPException
+import unittest
+
+def row(comment_id, created_at, parent_id=None):
+    return {"id": comment_id, "created_at": created_at, "parent_id": parent_id, "content": comment_id}
+
+def ids(comments):
+    return [comment["id"] for comment in comments]
+
+class TestCommentTree(unittest.TestCase):
+    def test_reply_before_parent_and_orphans(self):
+        tree = assemble_comment_tree([
+            # Same timestamp as its parent and a smaller id: the reply comes first
+            row("a1", "2024-01-01", parent_id="b0"),
+            row("b0", "2024-01-01"),
+            # Parent deleted: promoted to a top-level thread, in (created_at, id) order
+            row("c0", "2024-01-02", parent_id="gone"),
+            row("d0", "2024-01-03"),
+            row("a0", "2023-12-31", parent_id="gone"),
+        ])
+        self.assertEqual(ids(tree["roots"]), ["a0", "b0", "c0", "d0"])
+        self.assertEqual(ids(tree["nodes"]["b0"]["replies"]), ["a1"])
+        self.assertNotIn("gone", tree["nodes"])
+        self.assertEqual(len(tree["nodes"]), 5)
+
+    def test_depth(self):
+        tree = assemble_comment_tree([row("c0", "1"), row("c1", "2", "c0"), row("c2", "3", "c1"), row("c3", "4", "c2")])
+        page = comment_page(tree, None, None, limit=10, depth=1)
+        c0 = page["comments"][0]
+        self.assertEqual((c0["reply_count"], ids(c0["replies"])), (1, ["c1"]))
+        c1 = c0["replies"][0]
+        # Cut off below `depth`: the count says there is more, the list stays empty
+        self.assertEqual((c1["reply_count"], c1["replies"], c1["replies_cursor"]), (1, [], None))
+        self.assertEqual(comment_page(tree, None, None, limit=10, depth=0)["comments"][0]["replies"], [])
+        self.assertEqual(page["total"], 4)
+
+    def test_cursor_boundaries(self):
+        # Ties on created_at are broken by id, so no thread is skipped or repeated across pages
+        rows = [row(f"t{i}", "2024-01-01" if i < 3 else f"2024-01-0{i}") for i in range(5)]
+        tree = assemble_comment_tree(rows)
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = comment_page(tree, None, cursor, limit=2, depth=0)
+            seen += ids(page["comments"])
+            pages += 1
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual((seen, pages), (["t0", "t1", "t2", "t3", "t4"], 3))
+
+        # An exact multiple of the page size: the last full page has no next_cursor
+        first = comment_page(assemble_comment_tree(rows[:4]), None, None, limit=2, depth=0)
+        last = comment_page(assemble_comment_tree(rows[:4]), None, first["next_cursor"], limit=2, depth=0)
+        self.assertEqual((ids(last["comments"]), last["next_cursor"]), (["t2", "t3"], None))
+
+        with self.assertRaises(HTTPException):
+            comment_page(tree, None, "not-a-cursor", limit=2, depth=0)
+
+    def test_reply_pages(self):
+        tree = assemble_comment_tree([row("p", "0")] + [row(f"r{i}", str(i + 1), "p") for i in range(5)])
+        parent = comment_page(tree, None, None, limit=2, depth=1)["comments"][0]
+        self.assertEqual((parent["reply_count"], ids(parent["replies"])), (5, ["r0", "r1"]))
+        # replies_cursor continues right after the replies already shown
+        rest = comment_page(tree, "p", parent["replies_cursor"], limit=10, depth=0)
+        self.assertEqual((ids(rest["comments"]), rest["next_cursor"]), (["r2", "r3", "r4"], None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import base64
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from backend import crypto_utils
+import unittest
+
+def make_signer():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    der = private_key.public_key().public_bytes(serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+
+    def sign(message):
+        # What WebCrypto's RSA-PSS (saltLength 32) produces
+        pss = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=32)
+        return private_key.sign(message.encode('utf-8'), pss, hashes.SHA256()).hex()
+    return base64.b64encode(der).decode(), sign
+
+class TestCryptoUtils(unittest.TestCase):
+    def test_key_parsed_once(self):
+        public_key, sign = make_signer()
+        misses = crypto_utils.key_cache_misses
+        for i in range(5):
+            self.assertTrue(crypto_utils.verify_signature(public_key, f"vote {i}", sign(f"vote {i}")))
+        self.assertEqual(crypto_utils.key_cache_misses, misses + 1)
+        self.assertIs(crypto_utils.load_public_key(public_key), crypto_utils.load_public_key(public_key))
+
+    def test_batch_matches_single(self):
+        (key_a, sign_a), (key_b, sign_b) = make_signer(), make_signer()
+        items = [
+            (key_a, "rumor_1:true", sign_a("rumor_1:true")),
+            (key_b, "rumor_1:false", sign_b("rumor_1:false")),
+            (key_a, "rumor_2:true", sign_b("rumor_2:true")),  # wrong key
+            (key_b, "tampered", sign_b("rumor_3:true")),
+            ("not a key", "rumor_4:true", sign_a("rumor_4:true")),
+        ]
+        self.assertEqual(crypto_utils.verify_signatures(items), [True, True, False, False, False])
+        self.assertEqual(crypto_utils.verify_signatures(items[:1]), [True])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+
+from backend import trust_engine
+from backend.trust_engine import TrustEngine
+import unittest
+
+class FakeEdgesQuery:
+    """
+    Minimal stand-in for the PostgREST builder: applies the keyset filter and a server row cap.
+    """
+    def __init__(self, table):
+        self.table = table
+        self.after = None
+        self.page_size = None
+
+    def select(self, columns):
+        return self
+
+    def or_(self, expression):
+        # "source_user.gt.S,and(source_user.eq.S,target_user.gt.T)"
+        source = expression.split(",")[0].split(".gt.")[1]
+        target = expression.split("target_user.gt.")[1].rstrip(")")
+        self.after = (source, target)
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, n):
+        self.page_size = n
+        return self
+
+    def execute(self):
+        rows = sorted(self.table.rows, key=lambda r: (r["source_user"], r["target_user"]))
+        if self.after:
+            rows = [r for r in rows if (r["source_user"], r["target_user"]) > self.after]
+        self.table.requests += 1
+        result = MagicMock()
+        result.data = rows[:min(self.page_size, self.table.max_rows)]
+        return result
+
+class FakeEdgesTable:
+    def __init__(self, rows, max_rows):
+        self.rows = rows
+        self.max_rows = max_rows
+        self.requests = 0
+
+class TestEdgeLoader(unittest.TestCase):
+    def setUp(self):
+        rows = []
+        for i in range(25):
+            rows.append({"source_user": f"u{i:02d}", "target_user": f"u{i + 1:02d}", "created_at": f"2024-01-{i + 1:02d}T00:00:00"})
+            rows.append({"source_user": f"u{i + 1:02d}", "target_user": f"u{i:02d}", "created_at": f"2024-01-{i + 1:02d}T00:00:00"})
+        self.table = FakeEdgesTable(rows, max_rows=7)
+        self.original = trust_engine.supabase
+        trust_engine.supabase = MagicMock()
+        trust_engine.supabase.table.side_effect = lambda name: FakeEdgesQuery(self.table)
+
+    def tearDown(self):
+        trust_engine.supabase = self.original
+
+    def test_pages_through_row_cap(self):
+        """
+        Server caps pages at 7 rows although we ask for 10: nothing may be dropped.
+        """
+        engine = TrustEngine()
+        pages = list(engine.iter_edge_pages(page_size=10))
+        self.assertTrue(all(len(page) <= 7 for page in pages))
+        self.assertEqual(sum(len(page) for page in pages), 50)
+
+    def test_build_streams_into_graph(self):
+        engine = TrustEngine()
+        graph = engine.build_trust_graph()
+        self.assertEqual(graph.number_of_edges(), 50)
+        self.assertEqual(graph.number_of_nodes(), 26)
+        self.assertEqual(engine.edges_high_water, "2024-01-25T00:00:00")
+
+if __name__ == '__main__':
+    unittest.main()
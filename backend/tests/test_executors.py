@@ -0,0 +1,36 @@
+import asyncio
+import threading
+from backend.executors import BoundedExecutor, ExecutorSaturated
+import unittest
+
+class TestBoundedExecutor(unittest.TestCase):
+    def test_rejects_when_saturated(self):
+        pool = BoundedExecutor(workers=1, max_queue=1, name="test")
+        release = threading.Event()
+        running = pool.submit(release.wait)
+        queued = pool.submit(lambda: "done")
+        with self.assertRaises(ExecutorSaturated):
+            pool.submit(lambda: "dropped")
+        self.assertEqual(pool.metrics()["rejected"], 1)
+        self.assertEqual(pool.metrics()["peak_queue_depth"], 1)
+
+        release.set()
+        self.assertTrue(running.result(5))
+        self.assertEqual(queued.result(5), "done")
+        # Room again once the backlog drained
+        self.assertEqual(pool.submit(lambda: 42).result(5), 42)
+        pool.shutdown()
+        self.assertEqual(pool.metrics()["completed"], 3)
+        self.assertEqual(pool.queue_depth, 0)
+
+    def test_run_from_event_loop(self):
+        pool = BoundedExecutor(workers=2, max_queue=0, name="test")
+
+        async def main():
+            return await asyncio.gather(pool.run(pow, 2, 10), pool.run(pow, 3, 2))
+
+        self.assertEqual(asyncio.run(main()), [1024, 9])
+        pool.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+# main.py imports its siblings the way the server runs it (from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt
+from fastapi.testclient import TestClient
+from backend import main
+import unittest
+
+class FakeQuery:
+    """
+    Just enough of the async PostgREST builder: records the selected columns and applies eq/in_.
+    """
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = []
+
+    def select(self, columns, **kwargs):
+        self.db.selects.append((self.table, columns))
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, {value}))
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, set(values)))
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def range(self, start, end):
+        return self
+
+    async def execute(self):
+        rows = [row for row in self.db.rows[self.table] if all(row[column] in values for column, values in self.filters)]
+        return MagicMock(data=rows)
+
+class FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.selects = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+class TestFeedCards(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeDB({
+            "rumors": [
+                {"id": "r1", "author_id": "a1", "sp_status": "verified", "trust_score": 0.8,
+                 "is_shadowbanned": False, "verified_result": None},
+                {"id": "r2", "author_id": "a2", "sp_status": "pending", "trust_score": 0.0,
+                 "is_shadowbanned": False, "verified_result": None},
+                # Shadowbanned, and the reader is nowhere near its author
+                {"id": "r3", "author_id": "a3", "sp_status": "pending", "trust_score": 0.0,
+                 "is_shadowbanned": True, "verified_result": None},
+            ],
+            "comments": [{"id": "c1", "rumor_id": "r1"}, {"id": "c2", "rumor_id": "r1"}, {"id": "c3", "rumor_id": "r2"}],
+            "votes": [{"user_id": "u1", "rumor_id": "r2", "vote": False}, {"user_id": "u2", "rumor_id": "r1", "vote": True}],
+            "users": [{"id": "u1", "is_banned": False}],
+        })
+        self._db, main.db = main.db, self.db
+        main.comment_trees.clear()
+        main.comment_counts.clear()
+        main.ban_cache.clear()
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        main.db = self._db
+
+    def cards(self, ids: str, headers: dict = None, **params):
+        response = self.client.get("/api/feed/cards", params=dict(params, ids=ids), headers=headers or {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cards(self):
+        token = jwt.encode({"user_id": "u1"}, main.SECRET_KEY, algorithm=main.ALGORITHM)
+        response = self.cards("r1,r2,r3,r1,missing", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response, {"cards": {
+            "r1": {"comment_count": 2, "status": "verified", "trust_score": 0.8, "has_voted": False, "my_vote": None},
+            "r2": {"comment_count": 1, "status": "pending", "trust_score": 0.0, "has_voted": True, "my_vote": False},
+        }})
+        self.assertIn("sp_status", dict(self.db.selects)["rumors"].split(","))
+
+    def test_anonymous_gets_no_vote_state(self):
+        # The vote state belongs to the token's owner: a user_id in the query string is ignored
+        response = self.cards("r1,r2", user_id="u1")
+        self.assertEqual(response["cards"]["r2"], {"comment_count": 1, "status": "pending", "trust_score": 0.0})
+        self.assertNotIn("votes", [table for table, _ in self.db.selects])
+
+        bad = self.client.get("/api/feed/cards", params={"ids": "r1"}, headers={"Authorization": "Bearer nope"})
+        self.assertEqual(bad.status_code, 401)
+
+    def test_comment_counts_are_cached(self):
+        self.cards("r1,r2")
+        self.db.selects.clear()
+        response = self.cards("r1")
+        self.assertEqual(response, {"cards": {"r1": {"comment_count": 2, "status": "verified", "trust_score": 0.8}}})
+        self.assertEqual([table for table, _ in self.db.selects], ["rumors"])
+
+    def test_too_many_ids(self):
+        ids = ",".join(f"r{i}" for i in range(main.FEED_CARDS_MAX + 1))
+        self.assertEqual(self.client.get("/api/feed/cards", params={"ids": ids}).status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
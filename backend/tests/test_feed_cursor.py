@@ -0,0 +1,132 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+# main.py imports its siblings the way the server runs it (from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import jwt
+from fastapi.testclient import TestClient
+from backend import main
+import unittest
+
+class TestFeedCursor(unittest.TestCase):
+    def test_round_trip(self):
+        row = {"id": "r9", "vote_count": 4, "created_at": "2024-05-01T10:00:00+00:00", "content": "x"}
+        columns = main.FEED_SORTS["popularity"]
+        cursor = main.encode_feed_cursor(row, columns)
+        self.assertEqual(main.decode_feed_cursor(cursor, columns), [4, "2024-05-01T10:00:00+00:00", "r9"])
+
+    def test_rejects_other_sort_and_garbage(self):
+        row = {"id": "r9", "vote_count": 4, "trust_score": 0.5, "created_at": "2024-05-01"}
+        popularity = main.encode_feed_cursor(row, main.FEED_SORTS["popularity"])
+        # Same shape (two columns + id), different order: must not be used to seek
+        for cursor, columns in [(popularity, main.FEED_SORTS["relevance"]), (popularity, main.FEED_SORTS["latest"]),
+                                ("not-a-cursor", main.FEED_SORTS["latest"]),
+                                (main.encode_feed_cursor({"id": "r9"}, ("created_at",)), ("created_at",))]:
+            with self.assertRaises(main.HTTPException) as raised:
+                main.decode_feed_cursor(cursor, columns)
+            self.assertEqual(raised.exception.status_code, 400)
+
+    def test_keyset_filter(self):
+        self.assertEqual(
+            main.feed_keyset_filter(("vote_count", "created_at"), [4, "2024-05-01T10:00:00+00:00", "r9"]),
+            'vote_count.lt."4",'
+            'and(vote_count.eq."4",created_at.lt."2024-05-01T10:00:00+00:00"),'
+            'and(vote_count.eq."4",created_at.eq."2024-05-01T10:00:00+00:00",id.lt."r9")')
+        self.assertEqual(main.feed_keyset_filter(("created_at",), ["2024-05-01", "r9"]),
+                         'created_at.lt."2024-05-01",and(created_at.eq."2024-05-01",id.lt."r9")')
+
+class FakeQuery:
+    """
+    Rumors query stand-in: after a keyset filter, PostgREST's count is the rows past the cursor.
+    """
+    def __init__(self, db):
+        self.db = db
+        self.count = None
+        self.seek = False
+
+    def select(self, *columns, count=None):
+        self.count = count
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def or_(self, filters):
+        self.seek = True
+        return self
+
+    def limit(self, n):
+        return self
+
+    def range(self, start, end):
+        return self
+
+    async def execute(self):
+        self.db.queries.append((self.count, self.seek))
+        rows = self.db.rows[3:] if self.seek else self.db.rows[:3]
+        return MagicMock(data=rows, count=(len(self.db.rows) - 3 if self.seek else len(self.db.rows)) if self.count else None)
+
+class FakeDB:
+    def __init__(self):
+        self.rows = [{"id": f"r{i}", "vote_count": 10 - i, "created_at": "2024-05-01"} for i in range(5)]
+        self.queries = []
+
+    def table(self, name):
+        return FakeQuery(self)
+
+class TestFeedTotal(unittest.TestCase):
+    def setUp(self):
+        self._db, main.db = main.db, FakeDB()
+        main.feed_total.clear()
+        for cache in main.feed_caches.values():
+            cache.clear()
+
+    def tearDown(self):
+        main.db = self._db
+
+    def test_cursor_page_counts_whole_feed(self):
+        first = asyncio.run(main.get_feed(limit=3, user_id=None))
+        self.assertEqual((first["total"], main.db.queries), (5, [("exact", False)]))
+
+        main.feed_total.clear()
+        main.db.queries.clear()
+        second = asyncio.run(main.get_feed(limit=3, cursor=first["next_cursor"], user_id=None))
+        self.assertEqual([row["id"] for row in second["rumors"]], ["r3", "r4"])
+        # The keyset page itself is not counted; the total comes from an unfiltered count
+        self.assertCountEqual(main.db.queries, [(None, True), ("exact", False)])
+        self.assertEqual(second["total"], 5)
+        self.assertEqual(main.feed_total.get("rumors"), 5)
+
+class TestFeedCaller(unittest.TestCase):
+    def setUp(self):
+        self._db, main.db = main.db, FakeDB()
+        self._voters, main.engine.voters = main.engine.voters, MagicMock()
+        main.engine.voters.voted_on = lambda user_id, rumor_ids: {"r1"} if user_id == "u1" else set()
+        main.feed_total.clear()
+        for cache in main.feed_caches.values():
+            cache.clear()
+        main.ban_cache.set("u1", False)
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        main.db = self._db
+        main.engine.voters = self._voters
+        main.ban_cache.delete("u1")
+
+    def test_has_voted_needs_a_token(self):
+        # A user_id in the query string no longer says whose votes to show
+        anonymous = self.client.get("/api/feed", params={"limit": 3, "user_id": "u1"}).json()
+        self.assertTrue(all("has_voted" not in rumor for rumor in anonymous["rumors"]))
+
+        token = jwt.encode({"user_id": "u1"}, main.SECRET_KEY, algorithm=main.ALGORITHM)
+        mine = self.client.get("/api/feed", params={"limit": 3}, headers={"Authorization": f"Bearer {token}"}).json()
+        self.assertEqual([rumor["has_voted"] for rumor in mine["rumors"]], [False, True, False])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+# main.py imports its siblings the way the server runs it (from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import base64
+import json
+import networkx as nx
+import numpy as np
+import random
+from fastapi.testclient import TestClient
+from backend import main
+from backend.trust_engine import TrustEngine, UnknownUser
+import unittest
+
+class TestGraphPayload(unittest.TestCase):
+    def setUp(self):
+        self.engine = TrustEngine()
+        edges = []
+        for inviter, invitee in [("u0", "u1"), ("u0", "u2"), ("u1", "u3"), ("u2", "u4")]:
+            edges += [(inviter, invitee), (invitee, inviter)]
+        self.engine.load_edges(edges)
+        self.engine.seeds = ["u0"]
+        self.engine.calculate_trust_ranks()
+        self.genesis_fetches = 0
+
+        def fetch_genesis_ids():
+            self.genesis_fetches += 1
+            return {"u0"}
+        self.engine.fetch_genesis_ids = fetch_genesis_ids
+
+    def test_cached_per_version(self):
+        first = self.engine.graph_payload()
+        self.assertIs(self.engine.graph_payload(), first)
+        self.assertEqual(self.genesis_fetches, 1)
+
+        data = json.loads(first.body)
+        self.assertEqual(data, json.loads(json.dumps(self.engine.get_graph_visual_data())))
+        self.assertEqual(len(data["links"]), 8)
+        self.assertEqual({node["id"] for node in data["nodes"] if node["type"] == "GENESIS"}, {"u0"})
+
+        self.engine.apply_edge_delta(added=[("u4", "u5"), ("u5", "u4")])
+        second = self.engine.graph_payload()
+        self.assertNotEqual(second.etag, first.etag)
+        self.assertEqual(len(json.loads(second.body)["nodes"]), 6)
+        self.assertEqual(self.genesis_fetches, 2)
+
+    def test_compact_matches_json(self):
+        data = json.loads(self.engine.graph_payload("json").body)
+        compact = json.loads(self.engine.graph_payload("compact").body)
+
+        def column(name, dtype):
+            return np.frombuffer(base64.b64decode(compact[name]), dtype=dtype)
+
+        ids = compact["ids"]
+        types = [compact["types"][t] for t in column("type", "u1")]
+        self.assertEqual([(node["id"], node["type"]) for node in data["nodes"]], list(zip(ids, types)))
+        np.testing.assert_allclose(column("val", "<f4"), [node["val"] for node in data["nodes"]], rtol=1e-6)
+        links = [(ids[u], ids[v]) for u, v in zip(column("source", "<i4"), column("target", "<i4"))]
+        self.assertEqual(links, [(link["source"], link["target"]) for link in data["links"]])
+
+class TestGraphViews(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.engine = TrustEngine()
+        edges = []
+        for i in range(1, 300):  # invite tree: every user has one inviter
+            inviter = f"u{rng.randrange(i)}"
+            edges += [(inviter, f"u{i}"), (f"u{i}", inviter)]
+        self.engine.load_edges(edges)
+        self.engine.seeds = ["u0", "u1"]
+        self.engine.calculate_trust_ranks()
+        self.engine.fetch_genesis_ids = lambda: {"u0", "u7"}
+        self.graph = nx.DiGraph(edges)
+
+    def view(self, *view):
+        data = json.loads(self.engine.graph_payload("json", view).body)
+        nodes = {node["id"] for node in data["nodes"]}
+        # Links are exactly the edges induced by the returned nodes
+        self.assertEqual({(link["source"], link["target"]) for link in data["links"]}, set(self.graph.subgraph(nodes).edges()))
+        return data, nodes
+
+    def test_top(self):
+        data, nodes = self.view("top", 20)
+        ranks = self.engine.trust_ranks
+        self.assertEqual(nodes, set(sorted(ranks, key=lambda u: (-ranks[u], self.engine.nodes.index[u]))[:20]))
+        self.assertEqual(data["mode"], "top")
+
+    def test_neighborhood(self):
+        _, nodes = self.view("neighborhood", "u5", 2, 1000)
+        self.assertEqual(nodes, set(nx.single_source_shortest_path_length(self.graph, "u5", cutoff=2)))
+        # Truncated hops keep their best-ranked users
+        _, nodes = self.view("neighborhood", "u0", 3, 10)
+        self.assertEqual(len(nodes), 10)
+        self.assertIn("u0", nodes)
+        with self.assertRaises(UnknownUser):
+            self.engine.graph_payload("json", ("neighborhood", "nobody", 2, 10))
+
+    def test_sample(self):
+        data, nodes = self.view("sample", 200)
+        self.assertEqual(len(nodes), 200)
+        full = json.loads(self.engine.graph_payload().body)["nodes"]
+        # Every genesis and high-trust node (137 of 300), plus low-trust ones to fill the budget
+        self.assertLessEqual({node["id"] for node in full if node["type"] != "LOW_TRUST"}, nodes)
+        self.assertIn("LOW_TRUST", {node["type"] for node in data["nodes"]})
+        # Seeded by the version: the same version always draws the same sample
+        self.assertEqual(set(self.engine.sample_nodes(self.engine.state, 200).tolist()),
+                         {self.engine.nodes.index[u] for u in nodes})
+
+    def test_sample_fills_limit(self):
+        # Genesis u0 is also the top-ranked node: its overlap must not leave a slot empty
+        n = len(self.engine.nodes)
+        for limit in (1, 2, 10, 136, 137, 138, 299, 300, 400):
+            _, nodes = self.view("sample", limit)
+            self.assertEqual(len(nodes), min(limit, n), limit)
+        ranks = self.engine.trust_ranks
+        top = sorted(ranks, key=lambda u: (-ranks[u], self.engine.nodes.index[u]))[:9]
+        _, nodes = self.view("sample", 10)
+        self.assertEqual(nodes, set(top) | {"u7"})
+
+class TestGraphDelta(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(8)
+        self.engine = TrustEngine()
+        edges = []
+        for i in range(1, 40):
+            inviter = f"u{rng.randrange(i)}"
+            edges += [(inviter, f"u{i}"), (f"u{i}", inviter)]
+        self.engine.load_edges(edges)
+        self.engine.seeds = ["u0"]
+        self.engine.calculate_trust_ranks()
+        self.engine.fetch_genesis_ids = lambda: {"u0"}
+
+    def full(self):
+        return json.loads(self.engine.graph_payload().body)
+
+    def apply(self, data, delta):
+        # What a client does with a delta
+        nodes = {node["id"]: node for node in data["nodes"]}
+        for node in delta["nodes"]["added"] + delta["nodes"]["updated"]:
+            nodes[node["id"]] = node
+        for node_id in delta["nodes"]["removed"]:
+            del nodes[node_id]
+        links = {(link["source"], link["target"]) for link in data["links"]}
+        links |= {(link["source"], link["target"]) for link in delta["links"]["added"]}
+        links -= {(link["source"], link["target"]) for link in delta["links"]["removed"]}
+        return nodes, links
+
+    def assertSameGraph(self, client, data):
+        nodes, links = client
+        self.assertEqual(links, {(link["source"], link["target"]) for link in data["links"]})
+        self.assertEqual(set(nodes), {node["id"] for node in data["nodes"]})
+        for node in data["nodes"]:
+            self.assertEqual(nodes[node["id"]]["type"], node["type"])
+            self.assertAlmostEqual(nodes[node["id"]]["val"], node["val"], delta=0.01 * node["val"] + 1e-12)
+
+    def test_deltas_replay_to_full_graph(self):
+        start = self.full()
+        self.engine.apply_edge_delta(added=[("u3", "new1"), ("new1", "u3"), ("new1", "new2"), ("new2", "new1")])
+        self.engine.apply_edge_delta(removed=[("new1", "new2"), ("new2", "new1"), ("u39", "u38")])
+        self.engine.trust_ranks = {user: score * 1.5 for user, score in self.engine.trust_ranks.items()}
+
+        delta = json.loads(self.engine.graph_delta_payload(start["version"]).body)
+        self.assertEqual(delta["since"], start["version"])
+        self.assertEqual([node["id"] for node in delta["nodes"]["added"]], ["new1"])
+        self.assertSameGraph(self.apply(start, delta), self.full())
+
+        # Up to date: nothing changed
+        current = self.engine.state.version
+        empty = json.loads(self.engine.graph_delta_payload(current).body)
+        self.assertEqual((empty["nodes"]["updated"], empty["links"]["added"]), ([], []))
+
+    def test_truncated_or_rebuilt_changelog_sends_full_graph(self):
+        start = self.full()["version"]
+        self.engine.changelog.max_items = 3
+        self.engine.apply_edge_delta(added=[("u3", "new1"), ("new1", "u3")])
+        self.assertNotIn("since", json.loads(self.engine.graph_delta_payload(start).body))
+        self.assertEqual(self.engine.graph_delta_fallbacks, 1)
+
+        self.engine.changelog.max_items = 1000
+        version = self.engine.state.version
+        self.engine.load_edges([("u0", "u1"), ("u1", "u0")])
+        self.assertNotIn("since", json.loads(self.engine.graph_delta_payload(version).body))
+
+class TestGraphEndpoint(unittest.TestCase):
+    def setUp(self):
+        # main imports trust_engine as a top-level module: use its TrustEngine
+        engine = main.trust_engine.TrustEngine()
+        engine.load_edges([("u0", "u1"), ("u1", "u0"), ("u1", "u2"), ("u2", "u1")])
+        engine.seeds = ["u0"]
+        engine.calculate_trust_ranks()
+        engine.fetch_genesis_ids = lambda: {"u0"}
+        self._engine, main.engine = main.engine, engine
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        main.engine = self._engine
+
+    def test_since_is_json_only(self):
+        version = main.engine.state.version
+        self.assertEqual(self.client.get("/api/graph", params={"since": version}).json()["since"], version)
+        response = self.client.get("/api/graph", params={"since": version, "format": "compact"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_only_unknown_users_are_404(self):
+        response = self.client.get("/api/graph", params={"mode": "neighborhood", "user_id": "nobody"})
+        self.assertEqual(response.status_code, 404)
+
+        # A KeyError from building the payload is a bug, not a missing user
+        main.engine.graph_payload = MagicMock(side_effect=KeyError("type"))
+        response = self.client.get("/api/graph", params={"mode": "top"})
+        self.assertNotEqual(response.status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+import networkx as nx
+from backend.trust_engine import TrustEngine
+import unittest
+
+class TestIncrementalRanks(unittest.TestCase):
+    def setUp(self):
+        # Small invite tree: every invite creates edges in both directions
+        self.engine = TrustEngine()
+        # The background recompute may save a snapshot: keep it out of the working directory
+        snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(snapshot_dir.cleanup)
+        self.engine.snapshot_path = os.path.join(snapshot_dir.name, "trust_snapshot.bin")
+        self.edges = []
+        for inviter, invitee in [("u0", "u1"), ("u0", "u2"), ("u1", "u3"), ("u2", "u4"), ("u3", "u5")]:
+            self.edges += [(inviter, invitee), (invitee, inviter)]
+        self.engine.load_edges(self.edges)
+        self.engine.seeds = ["u0", "u1"]
+        self.engine.calculate_trust_ranks()
+
+    def cold_ranks(self):
+        return nx.pagerank(nx.DiGraph(self.edges), alpha=0.85, personalization={"u0": 1.0, "u1": 1.0})
+
+    def assertRanksClose(self, actual, expected, places=5):
+        # Power iteration stops once the L1 change is below N * 1e-6, so compare accordingly
+        self.assertEqual(set(actual), set(expected))
+        for node, score in expected.items():
+            self.assertAlmostEqual(actual[node], score, places=places)
+
+    def test_insert_matches_cold_solve(self):
+        """
+        A new invite edge pair patched in place must give the same ranks as a full recompute.
+        """
+        self.edges += [("u4", "u6"), ("u6", "u4")]
+        ranks = self.engine.apply_edge_delta(added=[("u4", "u6"), ("u6", "u4")])
+        self.assertIn("u6", ranks)
+        self.assertRanksClose(ranks, self.cold_ranks())
+
+    def test_delete_drops_orphans(self):
+        """
+        Removing the only edges of a node removes it from the graph, like a fresh build would.
+        """
+        self.edges = [e for e in self.edges if "u5" not in e]
+        ranks = self.engine.apply_edge_delta(removed=[("u3", "u5"), ("u5", "u3")])
+        self.assertEqual(self.engine.graph.number_of_nodes(), 5)
+        self.assertNotIn("u5", ranks)
+        self.assertRanksClose(ranks, self.cold_ranks())
+
+    def test_delta_copies_only_touched_adjacency(self):
+        before = self.engine.graph
+        edges = set(before.edges())
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            # One new pair plus an edge that already exists: only the new ones are applied
+            self.engine.apply_edge_delta(added=[("u5", "u6"), ("u6", "u5"), ("u0", "u1")],
+                                         removed=[("u2", "u4"), ("u4", "u2")])
+        self.assertIn("Applied edge delta: +2 / -2 edges", out.getvalue())
+        # Readers of the previous state still see the old graph
+        self.assertEqual(set(before.edges()), edges)
+        after = self.engine.graph
+        index = self.engine.nodes.index
+        self.assertTrue(after.has_edge(index["u5"], index["u6"]))
+        self.assertFalse(after.has_edge(index["u2"], index["u4"]))
+        # Adjacency of nodes the delta didn't touch is shared, not copied
+        self.assertIs(after._succ[index["u3"]], before._succ[index["u3"]])
+        self.assertIsNot(after._succ[index["u5"]], before._succ[index["u5"]])
+
+    def test_noop_delta_keeps_ranks(self):
+        before = dict(self.engine.trust_ranks)
+        ranks = self.engine.apply_edge_delta(added=[("u0", "u1")])
+        self.assertEqual(ranks, before)
+
+    def test_rank_view_is_a_snapshot(self):
+        """
+        Ranks are stored by interned id; a view taken before a delta keeps its values.
+        """
+        before = self.engine.trust_ranks
+        u0_score = before["u0"]
+        self.engine.apply_edge_delta(added=[("u5", "u7"), ("u7", "u5")])
+        self.assertEqual(before["u0"], u0_score)
+        self.assertNotIn("u7", before)
+        self.assertIn("u7", self.engine.trust_ranks)
+        self.assertEqual(self.engine.nodes.uuids[self.engine.nodes.index["u7"]], "u7")
+
+    def test_background_recompute_coalesces_and_swaps(self):
+        """
+        A burst of notifications becomes one recompute, published as a single new state.
+        """
+        state_before = self.engine.state
+        scheduler = self.engine.start_background_recompute(debounce=0.05)
+        try:
+            for i in range(6, 10):
+                self.engine.notify_edges(added=[("u0", f"u{i}"), (f"u{i}", "u0")])
+            # Readers keep the old state until the swap
+            self.assertNotIn("u9", state_before.ranks)
+
+            deadline = time.time() + 5
+            while scheduler.runs == 0 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            self.engine.stop_background_recompute()
+
+        self.assertEqual(scheduler.runs, 1)
+        self.assertEqual(scheduler.notifications, 4)
+        self.assertEqual(self.engine.state.version, state_before.version + 1)
+        self.edges += [(a, b) for i in range(6, 10) for a, b in (("u0", f"u{i}"), (f"u{i}", "u0"))]
+        self.assertRanksClose(self.engine.trust_ranks, self.cold_ranks(), places=4)
+        metrics = self.engine.metrics()
+        self.assertEqual(metrics["pending_seconds"], 0.0)
+        self.assertIsNotNone(metrics["last_recompute_ms"])
+
+if __name__ == '__main__':
+    unittest.main()
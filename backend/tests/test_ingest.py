@@ -0,0 +1,71 @@
+import asyncio
+from backend.ingest import GroupCommitter
+import unittest
+
+class FakeVotesTable:
+    """
+    All-or-nothing multi-row insert with a UNIQUE (user_id, rumor_id) constraint, like Postgres.
+    """
+    def __init__(self):
+        self.rows = []
+        self.calls = []
+
+    async def insert(self, rows):
+        self.calls.append(len(rows))
+        await asyncio.sleep(0)
+        keys = {(row["user_id"], row["rumor_id"]) for row in self.rows}
+        for row in rows:
+            key = (row["user_id"], row["rumor_id"])
+            if key in keys:
+                raise Exception('duplicate key value violates unique constraint "votes_user_id_rumor_id_key"')
+            keys.add(key)
+        inserted = [dict(row, id=len(self.rows) + i) for i, row in enumerate(rows)]
+        self.rows += inserted
+        return inserted
+
+class TestGroupCommitter(unittest.TestCase):
+    def test_one_insert_per_batch(self):
+        table = FakeVotesTable()
+
+        async def main():
+            writer = GroupCommitter(table.insert, max_batch=4, max_delay=0.01)
+            votes = [writer.submit({"user_id": f"u{i}", "rumor_id": "r1"}) for i in range(10)]
+            return writer, await asyncio.gather(*votes)
+
+        writer, inserted = asyncio.run(main())
+        self.assertEqual([row["user_id"] for row in inserted], [f"u{i}" for i in range(10)])
+        # Two full batches, then the rest after max_delay
+        self.assertEqual(table.calls, [4, 4, 2])
+        self.assertEqual(writer.metrics()["max_batch_size"], 4)
+        self.assertEqual(writer.metrics()["avg_batch_size"], 3.33)
+
+    def test_duplicate_fails_only_its_caller(self):
+        table = FakeVotesTable()
+
+        async def main():
+            writer = GroupCommitter(table.insert, max_batch=100, max_delay=0.01)
+            await writer.submit({"user_id": "u1", "rumor_id": "r1"})
+            votes = [writer.submit({"user_id": user, "rumor_id": "r1"}) for user in ("u2", "u1", "u3")]
+            return writer, await asyncio.gather(*votes, return_exceptions=True)
+
+        writer, results = asyncio.run(main())
+        self.assertEqual(results[0]["user_id"], "u2")
+        self.assertIn("unique constraint", str(results[1]))
+        self.assertEqual(results[2]["user_id"], "u3")
+        self.assertEqual(len(table.rows), 3)
+        self.assertEqual((writer.metrics()["retried_batches"], writer.metrics()["failed_rows"]), (1, 1))
+
+    def test_close_flushes_buffer(self):
+        table = FakeVotesTable()
+
+        async def main():
+            writer = GroupCommitter(table.insert, max_batch=100, max_delay=60)
+            vote = asyncio.ensure_future(writer.submit({"user_id": "u1", "rumor_id": "r1"}))
+            await asyncio.sleep(0)
+            await writer.close()
+            return await vote
+
+        self.assertEqual(asyncio.run(main())["id"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
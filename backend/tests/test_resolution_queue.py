@@ -0,0 +1,143 @@
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+
+import time
+import networkx as nx
+from backend.trust_engine import TrustEngine, ResolutionQueue
+import unittest
+
+class TestResolutionQueue(unittest.TestCase):
+    def setUp(self):
+        self.engine = TrustEngine()
+        self.engine.trust_ranks = {f"user_{i}": 0.01 for i in range(10)}
+        self.scans = []
+        self.saved = []
+
+        def fake_pages(rumor_ids=None):
+            self.scans.append(list(rumor_ids))
+            yield [{"rumor_id": rumor_id, "user_id": f"user_{i}", "vote": True, "prediction": 0.3}
+                   for rumor_id in rumor_ids for i in range(6)]
+        self.fake_pages = fake_pages
+        self.fake_counts = lambda rumor_ids: {rumor_id: 6 for rumor_id in rumor_ids}
+        self.engine.iter_vote_pages = fake_pages
+        self.engine.fetch_vote_counts = self.fake_counts
+        self.engine.save_resolutions = lambda results: self.saved.append(results) or len(results)
+
+    def test_burst_is_one_bulk_write(self):
+        queue = self.engine.start_resolution_queue(interval=0.1)
+        try:
+            for _ in range(20):
+                for rumor_id in ("r1", "r2", "r3"):
+                    self.engine.queue_resolution(rumor_id)
+            deadline = time.time() + 5
+            while queue.flushes == 0 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            self.engine.stop_resolution_queue()
+
+        self.assertEqual(queue.flushes, 1)
+        self.assertEqual(len(self.saved), 1)
+        self.assertEqual(set(self.saved[0]), {"r1", "r2", "r3"})
+        self.assertEqual(self.saved[0]["r1"]["status"], "verified")
+        # Votes of all three rumors came from one bulk scan
+        self.assertEqual(len(self.scans), 1)
+        self.assertEqual(queue.metrics()["resolution_rows_written"], 3)
+
+    def test_stop_flushes_pending(self):
+        queue = self.engine.start_resolution_queue(interval=60)
+        self.engine.queue_resolution("r1")
+        self.engine.stop_resolution_queue()
+        self.assertEqual(queue.flushes, 1)
+        self.assertEqual(set(self.saved[0]), {"r1"})
+
+    def test_waits_for_first_ranks(self):
+        # Background recompute still building the first ranks: nothing is written meanwhile
+        engine = TrustEngine()
+        engine.iter_vote_pages, engine.fetch_vote_counts = self.fake_pages, self.fake_counts
+        engine.save_resolutions = lambda results: self.saved.append(results) or len(results)
+        engine.scheduler = MagicMock(running=True, rebuild_pending=False)
+        engine.scheduler.notify.side_effect = lambda **kwargs: setattr(engine.scheduler, "rebuild_pending", True)
+
+        queue = engine.start_resolution_queue(interval=0.02)
+        try:
+            engine.queue_resolution("r1")
+            deadline = time.time() + 5
+            while queue.deferred < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.saved, [])
+            # Every deferred flush asks for ranks, but only one rebuild is queued
+            engine.scheduler.notify.assert_called_once_with(rebuild=True)
+
+            engine.trust_ranks = {f"user_{i}": 0.01 for i in range(10)}
+            while not self.saved and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            engine.stop_resolution_queue()
+        self.assertEqual(self.saved[0]["r1"]["status"], "verified")
+        self.assertEqual(queue.failures, 0)
+
+    def test_empty_graph_resolves(self):
+        # Fresh deploy: no edges yet, so nobody is ranked and every voter weighs UNRANKED_WEIGHT
+        engine = TrustEngine()
+        engine.iter_vote_pages, engine.fetch_vote_counts = self.fake_pages, self.fake_counts
+        engine.save_resolutions = lambda results: self.saved.append(results) or len(results)
+        loads = []
+        engine._load_graph = lambda: loads.append(1) or (nx.DiGraph(), None)
+
+        engine.start_background_recompute(debounce=0.01)
+        queue = engine.start_resolution_queue(interval=0.02)
+        try:
+            engine.queue_resolution("r1")
+            deadline = time.time() + 5
+            while not self.saved and time.time() < deadline:
+                time.sleep(0.01)
+            engine.queue_resolution("r2")
+            while len(self.saved) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            engine.stop_resolution_queue()
+            engine.stop_background_recompute()
+        self.assertEqual([set(results) for results in self.saved], [{"r1"}, {"r2"}])
+        self.assertEqual(self.saved[0]["r1"]["status"], "verified")
+        self.assertEqual(len(loads), 1)
+
+    def test_failed_write_back_is_retried(self):
+        calls = []
+        save = self.engine.save_resolutions
+        def flaky(results):
+            calls.append(set(results))
+            if len(calls) <= 2:
+                raise ConnectionError("PostgREST timed out")
+            return save(results)
+        self.engine.save_resolutions = flaky
+
+        queue = self.engine.start_resolution_queue(interval=0.02)
+        try:
+            self.engine.queue_resolution("r1")
+            self.engine.queue_resolution("r2")
+            deadline = time.time() + 5
+            while not self.saved and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            self.engine.stop_resolution_queue()
+        self.assertEqual(calls, [{"r1", "r2"}] * 3)
+        self.assertEqual(set(self.saved[0]), {"r1", "r2"})
+        self.assertEqual((queue.failures, queue.dropped, queue.metrics()["resolution_pending"]), (2, 0, 0))
+
+    def test_retries_are_capped(self):
+        def down(results):
+            raise ConnectionError("PostgREST is down")
+        self.engine.save_resolutions = down
+
+        queue = ResolutionQueue(self.engine, interval=60, max_retries=2)
+        queue.notify("r1")
+        for _ in range(3):
+            queue.flush()
+        self.assertEqual((queue.failures, queue.dropped, queue.metrics()["resolution_pending"]), (3, 1, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+# main.py imports its siblings the way the server runs it (from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import threading
+import networkx as nx
+import numpy as np
+import random
+from backend import main
+from backend.trust_engine import TrustEngine
+import unittest
+
+class TestRippleIndex(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(4)
+        self.engine = TrustEngine()
+        self.engine.seeds = ["u0"]
+        self.edges = []
+        for i in range(1, 120):
+            self.invite(f"u{rng.randrange(i)}", f"u{i}")
+        self.engine.load_edges(self.edges)
+        self.engine.calculate_trust_ranks()
+        self.users = [f"u{i}" for i in range(120)]
+
+    def invite(self, inviter, invitee):
+        self.edges += [(inviter, invitee), (invitee, inviter)]
+        return [(inviter, invitee), (invitee, inviter)]
+
+    def expected(self, viewer):
+        near = nx.single_source_shortest_path_length(nx.DiGraph(self.edges), viewer, cutoff=2)
+        return [user in near for user in self.users]
+
+    def test_matches_bfs(self):
+        for viewer in ("u0", "u17", "u99"):
+            self.assertEqual(self.engine.ripple_visible(viewer, self.users), self.expected(viewer))
+        self.assertEqual(self.engine.ripple.builds, 3)
+        self.engine.ripple_visible("u17", self.users)
+        self.assertEqual(self.engine.ripple.hits, 1)
+        # Users without edges only see themselves
+        self.assertEqual(self.engine.ripple_visible("nobody", ["nobody", "u0"]), [True, False])
+
+    def test_edge_inserts_extend_cached_sets(self):
+        for viewer in ("u5", "u60"):
+            self.engine.ripple_visible(viewer, self.users)
+        # Bridge two distant users, then a new user hanging off the bridge
+        self.engine.apply_edge_delta(added=self.invite("u5", "u60"))
+        self.engine.apply_edge_delta(added=self.invite("u60", "u120"))
+        self.users.append("u120")
+        for viewer in ("u5", "u60"):
+            self.assertEqual(self.engine.ripple_visible(viewer, self.users), self.expected(viewer))
+        self.assertEqual(self.engine.ripple.builds, 2)
+        self.assertGreater(self.engine.ripple.extended, 0)
+
+    def test_removal_drops_affected_sets(self):
+        self.engine.ripple_visible("u5", self.users)
+        neighbor = next(target for source, target in self.edges if source == "u5")
+        removed = [("u5", neighbor), (neighbor, "u5")]
+        self.edges = [edge for edge in self.edges if edge not in removed]
+        self.engine.apply_edge_delta(removed=removed)
+        self.assertEqual(self.engine.ripple_visible("u5", self.users), self.expected("u5"))
+        self.assertEqual(self.engine.ripple.dropped, 1)
+
+    def test_build_racing_a_delta_is_not_cached(self):
+        viewer = self.engine.nodes.index["u5"]
+        state = self.engine.state
+        engine = self.engine
+        invite = self.invite
+
+        class Racing:
+            # The delta lands while the BFS is walking the old state
+            version = state.version
+            published = False
+
+            def successors(self, node):
+                if not Racing.published:
+                    Racing.published = True
+                    engine.apply_edge_delta(added=invite("u5", "u121"))
+                return state.successors(node)
+
+        self.engine.ripple.neighborhood(Racing(), viewer)
+        self.assertNotIn(viewer, self.engine.ripple.sets)
+        # Built from a state older than the last delta: also served but not kept
+        self.engine.ripple.neighborhood(state, viewer)
+        self.assertEqual((self.engine.ripple.discarded, len(self.engine.ripple.sets)), (2, 0))
+
+        self.users.append("u121")
+        self.assertEqual(self.engine.ripple_visible("u5", self.users), self.expected("u5"))
+        ids, distances = self.engine.ripple.sets[viewer]
+        self.assertEqual((ids.dtype, distances.dtype), (np.int32, np.int8))
+        self.assertTrue((np.diff(ids) > 0).all())
+
+class TestRippleFilter(unittest.TestCase):
+    def setUp(self):
+        # main imports trust_engine as a top-level module: use its TrustEngine
+        engine = main.trust_engine.TrustEngine()
+        engine.load_edges([("u0", "u1"), ("u1", "u0"), ("u1", "u2"), ("u2", "u1"), ("u2", "u3"), ("u3", "u2"),
+                           ("u3", "u4"), ("u4", "u3")])
+        self._engine, main.engine = main.engine, engine
+        self.rumors = [
+            {"id": "open", "author_id": "u3", "is_shadowbanned": False, "verified_result": None},
+            {"id": "quarantined", "author_id": "u1", "is_shadowbanned": True, "verified_result": None},
+            {"id": "cleared", "author_id": "u3", "is_shadowbanned": True, "verified_result": True},
+        ]
+
+    def tearDown(self):
+        main.engine = self._engine
+
+    def visible(self, user_id):
+        return [rumor["id"] for rumor in asyncio.run(main.ripple_filter(self.rumors, user_id))]
+
+    def test_anonymous_readers_are_outside_every_circle(self):
+        # Without a token nobody is near the author: quarantined rumors only show once verified
+        self.assertEqual(self.visible(None), ["open", "cleared"])
+        self.assertEqual(main.engine.ripple.builds, 0)
+
+    def test_bfs_runs_off_the_event_loop(self):
+        threads = []
+        neighborhood = main.engine.ripple.neighborhood
+        def recording(state, node):
+            threads.append(threading.current_thread())
+            return neighborhood(state, node)
+        main.engine.ripple.neighborhood = recording
+
+        self.assertEqual(self.visible("u0"), ["open", "quarantined", "cleared"])
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+        # Cached now: answered inline, no second BFS
+        self.assertEqual(main.engine.ripple_visible("u0", ["u1", "u3"], cached_only=True), [True, False])
+        # Three hops from the author: outside the circle
+        self.assertEqual(self.visible("u4"), ["open", "cleared"])
+        self.assertEqual(self.visible("u0"), ["open", "quarantined", "cleared"])
+        self.assertEqual(len(threads), 2)
+
+if __name__ == '__main__':
+    unittest.main()
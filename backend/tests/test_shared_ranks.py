@@ -0,0 +1,117 @@
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+
+import os
+import tempfile
+import time
+from backend.trust_engine import TrustEngine
+import unittest
+
+def no_new_edges(since=None):
+    return iter(())
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+class TestSharedRanks(unittest.TestCase):
+    """
+    Two engines in one process stand in for two workers: flock is per open file, so they compete for the lock.
+    """
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "trust_snapshot.bin")
+
+        self.leader = TrustEngine()
+        edges = []
+        for inviter, invitee in [("u0", "u1"), ("u0", "u2"), ("u1", "u3")]:
+            edges += [(inviter, invitee), (invitee, inviter)]
+        self.leader.load_edges(edges)
+        self.leader.seeds = ["u0"]
+        self.leader.calculate_trust_ranks()
+        self.leader.iter_edge_pages = no_new_edges
+        self.assertEqual(self.leader.start_shared_mode(self.path, poll=0.02), "leader")
+        self.leader.save_snapshot(self.path)
+
+        self.follower = TrustEngine()
+        self.follower.iter_edge_pages = no_new_edges
+        self.assertEqual(self.follower.start_shared_mode(self.path, poll=0.02), "follower")
+
+    def tearDown(self):
+        for engine in (self.follower, self.leader):
+            engine.stop_background_recompute()
+            engine.stop_shared_mode()
+        self.dir.cleanup()
+
+    def test_follower_maps_leader_versions(self):
+        self.assertTrue(wait_for(lambda: self.follower.shared.reloads == 1))
+        self.assertEqual(dict(self.follower.trust_ranks), dict(self.leader.trust_ranks))
+        self.assertEqual(self.follower.state.version, self.leader.state.version)
+        table = self.follower.nodes
+
+        self.leader.apply_edge_delta(added=[("u3", "u4"), ("u4", "u3")])
+        self.leader.save_snapshot(self.path)
+        self.assertTrue(wait_for(lambda: self.follower.shared.reloads == 2))
+        self.assertEqual(dict(self.follower.trust_ranks), dict(self.leader.trust_ranks))
+        # Same leader id space: the follower appended u4 instead of rebuilding its table
+        self.assertIs(self.follower.nodes, table)
+        self.assertIn("u4", table.index)
+        # Followers never overwrite the leader's file
+        self.assertFalse(self.follower.save_snapshot(self.path))
+
+    def test_follower_reload_keeps_deltas(self):
+        self.assertTrue(wait_for(lambda: self.follower.shared.reloads == 1))
+        since = self.follower.state.version
+
+        self.leader.apply_edge_delta(added=[("u3", "u4"), ("u4", "u3")], removed=[("u0", "u2"), ("u2", "u0")])
+        self.leader.save_snapshot(self.path)
+        self.assertTrue(wait_for(lambda: self.follower.shared.reloads == 2))
+        # The reload is logged as a delta instead of restarting the changelog
+        self.assertEqual(self.follower.changelog.resets, 1)
+        delta = self.follower.graph_delta(self.follower.state, since)
+        self.assertEqual(delta["links"]["added"], [{"source": "u3", "target": "u4"}, {"source": "u4", "target": "u3"}])
+        self.assertEqual(delta["links"]["removed"], [{"source": "u0", "target": "u2"}, {"source": "u2", "target": "u0"}])
+        self.assertEqual([node["id"] for node in delta["nodes"]["added"]], ["u4"])
+        self.assertEqual(delta["nodes"]["removed"], ["u2"])
+
+    def test_follower_edges_wake_leader(self):
+        self.follower.notify_edges(added=[("u3", "u5"), ("u5", "u3")])
+        self.assertTrue(wait_for(lambda: self.leader.shared.catch_ups == 1))
+
+    def test_follower_takes_over(self):
+        self.assertTrue(wait_for(lambda: self.follower.shared.reloads == 1))
+        self.leader.stop_shared_mode()
+        self.assertTrue(wait_for(lambda: self.follower.is_shared_leader))
+        self.assertTrue(self.follower.scheduler.running)
+        self.assertEqual(dict(self.follower.trust_ranks), dict(self.leader.trust_ranks))
+
+class TestSharedEmptyGraph(unittest.TestCase):
+    def test_follower_ranked_on_empty_graph(self):
+        # Fresh deploy: no edges yet. Followers must not wait for ranks that will never come.
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trust_snapshot.bin")
+            leader, follower = TrustEngine(), TrustEngine()
+            for engine in (leader, follower):
+                engine.iter_edge_pages = no_new_edges
+            try:
+                self.assertEqual(leader.start_shared_mode(path, poll=0.02), "leader")
+                self.assertFalse(leader.save_snapshot())
+                leader.refresh()
+                self.assertTrue(leader.save_snapshot())
+
+                self.assertEqual(follower.start_shared_mode(path, poll=0.02), "follower")
+                self.assertTrue(wait_for(lambda: follower.state.ranked))
+                self.assertEqual(len(follower.require_ranks().ranks), 0)
+            finally:
+                for engine in (follower, leader):
+                    engine.stop_background_recompute()
+                    engine.stop_shared_mode()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+
+import os
+import tempfile
+from backend.trust_engine import TrustEngine
+import unittest
+
+class TestTrustSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "trust_snapshot.bin")
+        self.engine = TrustEngine()
+        edges = []
+        for inviter, invitee in [("genesis", "u1"), ("genesis", "u2"), ("u1", "u3"), ("u2", "u4")]:
+            edges += [(inviter, invitee), (invitee, inviter)]
+        self.engine.load_edges(edges)
+        self.engine.seeds = ["genesis"]
+        self.engine.edges_high_water = "2024-01-04T00:00:00"
+        self.engine.nodes.set_genesis(["genesis"])
+        self.engine.calculate_trust_ranks()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip(self):
+        self.assertTrue(self.engine.save_snapshot(self.path))
+
+        restored = TrustEngine()
+        self.assertTrue(restored.load_snapshot(self.path))
+        self.assertEqual(dict(restored.trust_ranks), dict(self.engine.trust_ranks))
+        self.assertEqual(restored.seeds, ["genesis"])
+        self.assertEqual(restored.edges_high_water, "2024-01-04T00:00:00")
+        self.assertTrue(restored.nodes.genesis[restored.nodes.index["genesis"]])
+
+        uuids = restored.nodes.uuids
+        restored_edges = {(uuids[u], uuids[v]) for u, v in restored.graph.edges()}
+        original_edges = {(self.engine.nodes.uuids[u], self.engine.nodes.uuids[v]) for u, v in self.engine.graph.edges()}
+        self.assertEqual(restored_edges, original_edges)
+
+    def test_catch_up_after_load(self):
+        """
+        Only edges newer than the snapshot's high-water mark are fetched and applied.
+        """
+        self.engine.save_snapshot(self.path)
+        restored = TrustEngine()
+        restored.load_snapshot(self.path)
+
+        requested = []
+        def fake_pages(since=None):
+            requested.append(since)
+            yield [{"source_user": "u4", "target_user": "u5", "created_at": "2024-01-05T00:00:00"},
+                   {"source_user": "u5", "target_user": "u4", "created_at": "2024-01-05T00:00:00"}]
+        restored.iter_edge_pages = fake_pages
+
+        self.assertEqual(restored.catch_up_edges(), 2)
+        self.assertEqual(requested, ["2024-01-04T00:00:00"])
+        self.assertIn("u5", restored.trust_ranks)
+        self.assertEqual(restored.edges_high_water, "2024-01-05T00:00:00")
+
+    def test_rejects_bad_or_stale_files(self):
+        restored = TrustEngine()
+        self.assertFalse(restored.load_snapshot(self.path))  # Missing
+
+        with open(self.path, "wb") as f:
+            f.write(b"not a snapshot at all, just some bytes padding it out")
+        self.assertFalse(restored.load_snapshot(self.path))
+
+        self.engine.save_snapshot(self.path)
+        self.assertFalse(restored.load_snapshot(self.path, max_age=-1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,6 @@ from unittest.mock import MagicMock
 # MOCK Dependencies to run test without installing Supabase/DotEnv
 sys.modules["supabase"] = MagicMock()
 sys.modules["dotenv"] = MagicMock()
-sys.modules["os"] = MagicMock()
 
 # Now import the engine
 from backend.trust_engine import TrustEngine
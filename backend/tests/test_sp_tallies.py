@@ -0,0 +1,57 @@
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+
+import random
+from backend.trust_engine import TrustEngine
+import unittest
+
+class TestSPTallies(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(5)
+        self.engine = TrustEngine()
+        self.engine.trust_ranks = {f"user_{i}": self.rng.random() / 100 for i in range(60)}
+
+        # The DB already holds 2 votes when the rumor is first resolved
+        self.votes = [self.new_vote(i) for i in range(2)]
+        stored = list(self.votes)
+        self.engine.iter_vote_pages = lambda rumor_ids=None: iter([stored])
+
+    def new_vote(self, i):
+        return {"rumor_id": "rumor_1", "user_id": f"user_{i}", "vote": self.rng.random() < 0.7, "prediction": round(self.rng.random(), 2)}
+
+    def test_running_sums_match_scalar(self):
+        self.engine.resolve_rumor("rumor_1")
+        for i in range(2, 70):  # users 60+ are unranked
+            vote = self.new_vote(i)
+            self.engine.record_vote("rumor_1", vote)
+            self.votes.append(vote)
+            self.assertEqual(self.engine.resolve_rumor("rumor_1"), self.engine.resolve_rumor("rumor_1", list(self.votes)))
+        self.assertEqual(self.engine.tally_loads, 1)
+
+    def test_rank_change_rederives(self):
+        self.engine.resolve_rumor("rumor_1")
+        for i in range(2, 25):
+            vote = self.new_vote(i)
+            self.engine.record_vote("rumor_1", vote)
+            self.votes.append(vote)
+        self.engine.resolve_rumor("rumor_1")
+
+        self.engine.trust_ranks = {f"user_{i}": self.rng.random() / 100 for i in range(60)}
+        self.assertEqual(self.engine.resolve_rumor("rumor_1"), self.engine.resolve_rumor("rumor_1", list(self.votes)))
+        self.assertEqual(self.engine.tally_rederives, 1)
+
+    def test_votes_from_other_processes_reload(self):
+        self.engine.resolve_rumor("rumor_1")
+        self.engine.save_resolutions = lambda results: len(results)
+        # Another worker inserted a vote we never saw: the DB count disagrees, so the tally is reloaded
+        self.engine.fetch_vote_counts = lambda rumor_ids: {"rumor_1": 3}
+        self.engine.resolve_and_save(["rumor_1"])
+        self.assertEqual(self.engine.tally_resyncs, 1)
+        self.assertEqual(self.engine.tally_loads, 2)
+
+if __name__ == '__main__':
+    unittest.main()
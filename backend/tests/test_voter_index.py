@@ -0,0 +1,51 @@
+import sys
+from unittest.mock import MagicMock
+
+# MOCK Dependencies to run test without a live Supabase project
+sys.modules["supabase"] = MagicMock()
+sys.modules["dotenv"] = MagicMock()
+
+import random
+from backend.trust_engine import TrustEngine, VoterIndex, VoterSet
+import unittest
+
+class TestVoterIndex(unittest.TestCase):
+    def test_voter_set_matches_set(self):
+        rng = random.Random(2)
+        voters, expected = VoterSet(), set()
+        for _ in range(3000):
+            user = rng.randrange(2000)
+            voters.add(user)
+            expected.add(user)
+        self.assertEqual(len(voters), len(expected))
+        self.assertGreater(len(voters.ids), len(voters.recent))  # mostly merged into the sorted array
+        self.assertEqual([user in voters for user in range(2100)], [user in expected for user in range(2100)])
+
+    def test_reload_keeps_votes_cast_meanwhile(self):
+        engine = TrustEngine()
+        index = VoterIndex(engine, interval=60)
+
+        def pages(columns=None):
+            yield [{"id": "v1", "rumor_id": "r1", "user_id": "alice"}, {"id": "v2", "rumor_id": "r2", "user_id": "alice"}]
+            # Recorded through the API while the reload streams
+            index.add("r1", "bob")
+            yield [{"id": "v3", "rumor_id": "r1", "user_id": "carol"}]
+        engine.iter_vote_pages = pages
+
+        self.assertIsNone(index.has_voted("r1", "alice"))
+        self.assertTrue(index.reload())
+        self.assertEqual([index.has_voted("r1", user) for user in ("alice", "bob", "carol", "dave")], [True, True, True, False])
+        self.assertEqual(index.voted_on("alice", ["r1", "r2", "r3"]), {"r1", "r2"})
+        self.assertEqual(index.voted_on("dave", ["r1"]), set())
+
+    def test_record_vote_feeds_index(self):
+        engine = TrustEngine()
+        engine.voters = VoterIndex(engine, interval=60)
+        engine.iter_vote_pages = lambda columns=None: iter(())
+        engine.voters.reload()
+        self.assertFalse(engine.has_voted("r1", "alice"))
+        engine.record_vote("r1", {"user_id": "alice", "vote": True, "prediction": 0.5})
+        self.assertTrue(engine.has_voted("r1", "alice"))
+
+if __name__ == '__main__':
+    unittest.main()
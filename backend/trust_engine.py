@@ -1,8 +1,25 @@
 import networkx as nx
+import numpy as np
+from collections import OrderedDict, deque
+from contextlib import nullcontext
+from collections.abc import Mapping
 from supabase import create_client, Client
 import os
 from dotenv import load_dotenv
+import base64
+import hashlib
+import json
 import math
+import random
+import secrets
+import struct
+import threading
+import time
+
+try:
+    import fcntl  # Leader election for multi-worker mode (POSIX only)
+except ImportError:
+    fcntl = None
 
 load_dotenv()
 
@@ -17,259 +34,2588 @@ url = os.getenv("SUPABASE_URL", "https://placeholder.supabase.co")
 key = os.getenv("SUPABASE_KEY", "placeholder_key")
 supabase: Client = create_client(url, key)
 
-class TrustEngine:
-    def __init__(self):
-        self.graph = None
-        self.trust_ranks = {}
+# PageRank damping factor and number of "Trusted Seeds" anchoring the personalization vector
+ALPHA = 0.85
+SEED_COUNT = 10
+
+# PPR backend: "networkx" (dict-of-dicts graph) or "csr" (NumPy power iteration, for large graphs)
+PPR_BACKENDS = ("networkx", "csr")
+PPR_BACKEND = os.getenv("TRUST_PPR_BACKEND", "networkx")
+
+# On-disk snapshot of graph + ranks, loaded at startup instead of a full rebuild.
+# Snapshots older than TRUST_SNAPSHOT_MAX_AGE seconds are ignored (edge deletions are not caught up).
+SNAPSHOT_PATH = os.getenv("TRUST_SNAPSHOT_PATH", "trust_snapshot.bin")
+SNAPSHOT_MAX_AGE = float(os.getenv("TRUST_SNAPSHOT_MAX_AGE", str(24 * 3600)))
+# While the background recompute runs, re-save the snapshot at most this often (seconds)
+SNAPSHOT_INTERVAL = float(os.getenv("TRUST_SNAPSHOT_INTERVAL", "300"))
+
+# Multi-worker mode: one process computes ranks, the others map its snapshot read-only.
+# Followers check the snapshot (and leader lock) every TRUST_SHARED_POLL seconds.
+SHARED_RANKS = os.getenv("TRUST_SHARED_RANKS", "0") == "1"
+SHARED_POLL_INTERVAL = float(os.getenv("TRUST_SHARED_POLL", "1.0"))
+
+# Seconds the background recompute waits after a change so bursts collapse into one run
+RECOMPUTE_DEBOUNCE = float(os.getenv("TRUST_RECOMPUTE_DEBOUNCE", "0.5"))
+# Rumor resolutions triggered by votes are written back at most once per this many seconds
+RESOLUTION_INTERVAL = float(os.getenv("TRUST_RESOLUTION_INTERVAL", "2.0"))
+# A rumor whose write-back keeps failing is retried on this many more flushes before it is dropped
+RESOLUTION_MAX_RETRIES = int(os.getenv("TRUST_RESOLUTION_MAX_RETRIES", "5"))
+
+# Weight of a voter with no trust rank (new/disconnected), prevents divide-by-zero
+UNRANKED_WEIGHT = 0.0000001
+
+# Rows per request when streaming the edges table (keep at or below PostgREST's max-rows)
+EDGE_PAGE_SIZE = int(os.getenv("TRUST_EDGE_PAGE_SIZE", "1000"))
+# Same for the votes table in batch resolution; rumor ids per IN (...) filter keep URLs short
+VOTE_PAGE_SIZE = int(os.getenv("TRUST_VOTE_PAGE_SIZE", "1000"))
+RUMOR_ID_CHUNK = 200
+
+# Rumors whose running SP sums are kept in memory (least recently used are dropped and reloaded on demand)
+SP_TALLY_CAPACITY = int(os.getenv("TRUST_SP_TALLY_CAPACITY", "10000"))
+# Ripple Protocol: shadowbanned rumors reach users within RIPPLE_HOPS edges of their author.
+# Each user's neighborhood is capped at RIPPLE_MAX_NEIGHBORS nodes, for the RIPPLE_CACHE most recent users
+# (5 bytes per node: at most ~50 MB with the defaults).
+RIPPLE_HOPS = int(os.getenv("TRUST_RIPPLE_HOPS", "2"))
+RIPPLE_MAX_NEIGHBORS = int(os.getenv("TRUST_RIPPLE_MAX_NEIGHBORS", "10000"))
+RIPPLE_CACHE = int(os.getenv("TRUST_RIPPLE_CACHE", "1000"))
+# Seconds between full reloads of the in-memory voter index (picks up other workers' votes)
+VOTER_RESYNC_INTERVAL = float(os.getenv("TRUST_VOTER_RESYNC_INTERVAL", "600"))
+
+
+def edge_arrays(graph: nx.DiGraph):
+    """
+    (src, dst) int32 arrays of the graph's edges, in graph.edges() order.
+    """
+    edges = np.array(graph.edges(), dtype=np.int32).reshape(-1, 2)
+    return np.ascontiguousarray(edges[:, 0]), np.ascontiguousarray(edges[:, 1])
+
+
+def cow_graph(graph: nx.DiGraph, nodes) -> nx.DiGraph:
+    """
+    Copy of `graph` that may be edited at `nodes`: the outer node/adjacency dicts are copied
+    and so are the neighbour dicts of `nodes`; every other node's adjacency is shared.
+    Costs O(nodes in graph) pointer copies instead of copy()'s O(edges) rebuild. Only safe for
+    add_edge/remove_edge between `nodes` and remove_node of isolated ones (relies on the DiGraph
+    internals of the pinned networkx).
+    """
+    copy = nx.DiGraph()
+    copy.graph = dict(graph.graph)
+    copy._node = dict(graph._node)
+    copy._succ = copy._adj = dict(graph._succ)
+    copy._pred = dict(graph._pred)
+    for node in nodes:
+        if node in graph._succ:
+            copy._succ[node] = dict(graph._succ[node])
+            copy._pred[node] = dict(graph._pred[node])
+    return copy
+
+
+# --- SNAPSHOT FORMAT ---
+# Little-endian, every array section starts on an 8-byte boundary so it can be np.memmap'd in place:
+#   header | meta (JSON) | uuids S<width>[n] | rank float64[n] | genesis uint8[n] | src int32[m] | dst int32[m]
+SNAPSHOT_MAGIC = b"TRSTSNAP"
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_HEADER = struct.Struct("<8sIIQQII")  # magic, format, uuid width, nodes, edges, meta length, reserved
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def write_snapshot(path: str, uuids: np.ndarray, rank: np.ndarray, genesis: np.ndarray,
+                   src: np.ndarray, dst: np.ndarray, meta: dict):
+    """
+    Atomically write a snapshot: readers see either the old file or the complete new one.
+    """
+    meta_bytes = json.dumps(meta).encode("utf-8")
+    sections = [
+        uuids,
+        rank.astype("<f8", copy=False),
+        genesis.astype(np.uint8, copy=False),
+        src.astype("<i4", copy=False),
+        dst.astype("<i4", copy=False),
+    ]
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, uuids.dtype.itemsize, len(uuids), len(src), len(meta_bytes), 0))
+        f.write(meta_bytes)
+        for section in sections:
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(np.ascontiguousarray(section).tobytes())
+    os.replace(tmp_path, path)
+
+def read_snapshot(path: str) -> dict:
+    """
+    Map a snapshot read-only. Arrays are zero-copy views over the mmap'd file.
+
+    Raises: FileNotFoundError if missing, ValueError if the file is not a valid snapshot.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    if len(data) < SNAPSHOT_HEADER.size:
+        raise ValueError("snapshot truncated")
+    magic, fmt, width, n, m, meta_len, _ = SNAPSHOT_HEADER.unpack(data[:SNAPSHOT_HEADER.size].tobytes())
+    if magic != SNAPSHOT_MAGIC or fmt != SNAPSHOT_FORMAT:
+        raise ValueError(f"unsupported snapshot (magic={magic!r}, format={fmt})")
+
+    offset = SNAPSHOT_HEADER.size
+    meta = json.loads(data[offset:offset + meta_len].tobytes())
+    offset += meta_len
+
+    snapshot = {"meta": meta}
+    for name, dtype, count in (("uuids", f"S{max(width, 1)}", n), ("rank", "<f8", n), ("genesis", np.uint8, n),
+                               ("src", "<i4", m), ("dst", "<i4", m)):
+        offset = _align(offset)
+        size = np.dtype(dtype).itemsize * count
+        if offset + size > len(data):
+            raise ValueError("snapshot truncated")
+        snapshot[name] = data[offset:offset + size].view(dtype)
+        offset += size
+    return snapshot
+
+
+def csr_rows(src: np.ndarray, dst: np.ndarray, n: int):
+    """
+    (indptr, indices) with the out-neighbours of row i in indices[indptr[i]:indptr[i + 1]].
+    """
+    # Sort edges by source row and count them into the row pointer array
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order]
+
+
+def csr_slices(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray):
+    """
+    (src, dst) of the edges leaving `rows`, gathered without a Python loop over rows.
+    """
+    rows = rows[rows < len(indptr) - 1]
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(int(counts.sum()))
+    return np.repeat(rows, counts), indices[offsets]
+
+
+class RanksUnavailable(RuntimeError):
+    """
+    Raised by the SP write-back paths while no trust ranks have been computed or loaded yet,
+    instead of persisting results that weigh every voter the same.
+    """
+
+
+class UnknownUser(LookupError):
+    """
+    Raised by graph views centered on a user that is not in the trust graph (no edges).
+    """
+
+
+class CSRGraph:
+    """
+    Compressed Sparse Row adjacency of the trust graph with dense integer node ids.
+    Row i holds the out-neighbours of node i: indices[indptr[i]:indptr[i + 1]].
+    """
+    def __init__(self, nodes: list, indptr: np.ndarray, indices: np.ndarray):
+        self.nodes = nodes
+        self._index = None  # node -> position, only needed by the dict API (pagerank())
+        self.indptr = indptr
+        self.indices = indices
+        self.out_degree = np.diff(indptr)
+        self.iterations = 0  # Power iterations used by the last pagerank() call
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            self._index = {node: i for i, node in enumerate(list(self.nodes))}
+        return self._index
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph):
+        nodes = list(graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        src = np.fromiter((index[u] for u, _ in graph.edges()), dtype=np.int32, count=graph.number_of_edges())
+        dst = np.fromiter((index[v] for _, v in graph.edges()), dtype=np.int32, count=graph.number_of_edges())
+        return cls.from_edges(nodes, src, dst)
+
+    @classmethod
+    def from_edges(cls, nodes: list, src: np.ndarray, dst: np.ndarray):
+        """
+        Build from edge arrays whose endpoints are positions in `nodes` (a list or an id array).
+        """
+        return cls(nodes, *csr_rows(src, dst, len(nodes)))
+
+    def _vector(self, values: dict):
+        # Dense vector over node ids; keys outside the graph are ignored (like nx.pagerank)
+        vec = np.zeros(len(self.nodes), dtype=np.float64)
+        for node, value in values.items():
+            i = self.index.get(node)
+            if i is not None:
+                vec[i] = value
+        return vec
+
+    def pagerank(self, alpha: float = ALPHA, personalization: dict = None, nstart: dict = None,
+                 max_iter: int = 100, tol: float = 1.0e-6):
+        """
+        Vectorized power iteration with the same semantics as nx.pagerank on an unweighted
+        DiGraph: dangling nodes redistribute their mass along the personalization vector.
+
+        Returns: {node: rank} for every node in the graph.
+        """
+        if len(self.nodes) == 0:
+            return {}
+        p = None if personalization is None else self._vector(personalization)
+        x = None if nstart is None else self._vector(nstart)
+        x = self.power_iteration(p, x, alpha=alpha, max_iter=max_iter, tol=tol)
+        return dict(zip(self.nodes, x.tolist()))
+
+    def power_iteration(self, p: np.ndarray = None, x: np.ndarray = None, alpha: float = ALPHA,
+                        max_iter: int = 100, tol: float = 1.0e-6):
+        """
+        Array form of pagerank(): p and x are dense vectors aligned with self.nodes
+        (None = uniform). Returns the rank vector aligned with self.nodes.
+        """
+        n = len(self.nodes)
+
+        if p is None:
+            p = np.full(n, 1.0 / n)
+        else:
+            total = p.sum()
+            if total == 0:
+                # Same failure as networkx, so callers fall back to global PageRank
+                raise ZeroDivisionError("personalization vector has no nodes in the graph")
+            p = p / total
+
+        if x is None:
+            x = np.full(n, 1.0 / n)
+        else:
+            total = x.sum()
+            x = x / total if total > 0 else np.full(n, 1.0 / n)
+
+        inv_out = np.zeros(n, dtype=np.float64)
+        has_out = self.out_degree > 0
+        inv_out[has_out] = 1.0 / self.out_degree[has_out]
+        dangling = ~has_out
+
+        for iteration in range(1, max_iter + 1):
+            xlast = x
+            # x @ A: every edge carries x[src] / out_degree[src] to its target
+            flow = np.bincount(self.indices, weights=np.repeat(xlast * inv_out, self.out_degree), minlength=n)
+            x = alpha * (flow + xlast[dangling].sum() * p) + (1 - alpha) * p
+            if np.abs(x - xlast).sum() < n * tol:
+                self.iterations = iteration
+                return x
+
+        raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+class NodeTable:
+    """
+    Bidirectional interning table: user UUID <-> dense int32 id, plus array-backed
+    per-node flags indexed by that id. Ids are append-only and never reused, so an id
+    handed out stays valid (and safe to share between threads) for the engine's lifetime.
+    """
+    def __init__(self, capacity: int = 1024):
+        self.index = {}  # uuid -> id
+        self.uuids = []  # id -> uuid
+        self.genesis = np.zeros(capacity, dtype=bool)
+        # Names this id space; snapshots carry it so a reader can extend its table instead of rebuilding it
+        self.token = secrets.token_hex(8)
+
+    def __len__(self):
+        return len(self.uuids)
+
+    def intern(self, user_id: str) -> int:
+        node = self.index.get(user_id)
+        if node is None:
+            node = len(self.uuids)
+            if node >= len(self.genesis):
+                grown = np.zeros(2 * len(self.genesis), dtype=bool)
+                grown[:len(self.genesis)] = self.genesis
+                self.genesis = grown
+            # Append before publishing the id so readers never see an id without its uuid
+            self.uuids.append(user_id)
+            self.index[user_id] = node
+        return node
+
+    def lookup(self, user_ids: list) -> np.ndarray:
+        """
+        Map UUIDs to ids in bulk; unknown users map to -1.
+        """
+        get = self.index.get
+        return np.fromiter((get(u, -1) for u in user_ids), dtype=np.int64, count=len(user_ids))
+
+    def set_genesis(self, user_ids):
+        """
+        Replace the genesis flags. Users not interned yet (no edges) are skipped, so this
+        never allocates ids and is safe to call from reader threads.
+        """
+        nodes = [node for node in (self.index.get(user_id) for user_id in user_ids) if node is not None]
+        flags = np.zeros(len(self.genesis), dtype=bool)
+        flags[nodes] = True
+        self.genesis = flags
+
+
+class RankView(Mapping):
+    """
+    Read-only {user_id: rank} view over a rank array indexed by interned node id.
+    NaN marks nodes without a rank. The array is never mutated once published, so a
+    view keeps describing the ranks it was created from.
+    """
+    def __init__(self, table: NodeTable, rank: np.ndarray):
+        self.table = table
+        self.rank = rank
+        self._len = None
+
+    def _score(self, user_id):
+        node = self.table.index.get(user_id)
+        if node is None or node >= len(self.rank):
+            return None
+        score = self.rank[node]
+        return None if math.isnan(score) else float(score)
+
+    def __getitem__(self, user_id):
+        score = self._score(user_id)
+        if score is None:
+            raise KeyError(user_id)
+        return score
+
+    def get(self, user_id, default=None):
+        score = self._score(user_id)
+        return default if score is None else score
+
+    def __contains__(self, user_id):
+        return self._score(user_id) is not None
+
+    def __iter__(self):
+        uuids = self.table.uuids
+        for node in np.flatnonzero(~np.isnan(self.rank)).tolist():
+            yield uuids[node]
+
+    def __len__(self):
+        if self._len is None:
+            self._len = int(np.count_nonzero(~np.isnan(self.rank)))
+        return self._len
+
+    def weights(self, nodes: np.ndarray, default: float) -> np.ndarray:
+        """
+        Vectorized lookup by node id (-1 = unknown user); unranked nodes get `default`.
+        """
+        known = (nodes >= 0) & (nodes < len(self.rank))
+        weights = np.full(len(nodes), default, dtype=np.float64)
+        weights[known] = self.rank[nodes[known]]
+        weights[np.isnan(weights)] = default
+        return weights
+
+
+def _pair_arrays(pairs) -> tuple:
+    pairs = np.array(pairs, dtype=np.int32).reshape(-1, 2)
+    return pairs[:, 0].copy(), pairs[:, 1].copy()
+
+
+def _edge_keys(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    # One int64 per edge, so edge sets can be compared with NumPy set operations
+    return (src.astype(np.int64) << 32) | dst.astype(np.int64)
+
+
+def _key_pairs(keys: np.ndarray) -> np.ndarray:
+    return np.column_stack((keys >> 32, keys & 0xFFFFFFFF)).astype(np.int32).reshape(-1, 2)
+
+
+def _edge_diff(old: tuple, new: tuple) -> tuple:
+    """
+    (added, removed) id pairs, as (k, 2) arrays, between two (src, dst) edge sets over the same node ids.
+    """
+    old_keys, new_keys = _edge_keys(*old), _edge_keys(*new)
+    return _key_pairs(np.setdiff1d(new_keys, old_keys)), _key_pairs(np.setdiff1d(old_keys, new_keys))
+
+
+def _degrees(src: np.ndarray, dst: np.ndarray, n: int):
+    return (np.bincount(src, minlength=n).astype(np.int32),
+            np.bincount(dst, minlength=n).astype(np.int32))
+
+
+class TrustState:
+    """
+    One published, immutable version of the trust graph and its ranks.
+    Readers grab engine.state once per operation and use it without locks; writers build
+    the next state off to the side and publish it with a single reference swap.
+    """
+    def __init__(self, version: int, nodes: NodeTable, graph: nx.DiGraph, ranks: RankView,
+                 degrees: tuple = None, csr: CSRGraph = None, edges: tuple = None, adjacency: tuple = None,
+                 ranked: bool = False):
+        self.version = version
+        self.nodes = nodes
+        self._graph = graph
+        self._edges = edges  # (src, dst) id arrays; the DiGraph is built from them on first use
+        self.ranks = ranks
+        # Ranks have been computed (or loaded) at least once, even if the graph was empty
+        self.ranked = ranked
+        self._degrees = degrees  # (out, in) indexed by node id; derived from the edges if not given
+        self.csr = csr  # Derived lazily by the csr backend
+        self._adjacency = adjacency  # csr_rows() over node ids, for neighborhood queries
+        self._rank_order = None
+        self.computed_at = time.time()
+
+    @property
+    def graph(self) -> nx.DiGraph:
+        if self._graph is None and self._edges is not None:
+            src, dst = self._edges
+            graph = nx.DiGraph()
+            graph.add_edges_from(zip(src.tolist(), dst.tolist()))
+            self._graph = graph
+        return self._graph
+
+    def edges(self):
+        """
+        (src, dst) int32 id arrays, without building the DiGraph when the state came from a snapshot.
+        """
+        if self._edges is None:
+            if self._graph is None:
+                empty = np.zeros(0, dtype=np.int32)
+                return empty, empty
+            self._edges = edge_arrays(self._graph)
+        return self._edges
+
+    def size(self):
+        """
+        (nodes, edges) of the graph.
+        """
+        if self._graph is not None:
+            return self._graph.number_of_nodes(), self._graph.number_of_edges()
+        out_degree, in_degree = self.degrees()
+        return int(np.count_nonzero(out_degree + in_degree)), len(self.edges()[0])
+
+    def degrees(self):
+        """
+        (out_degree, in_degree) arrays indexed by node id; may be shorter than nodes (= 0).
+        """
+        if self._degrees is None:
+            self._degrees = _degrees(*self.edges(), len(self.nodes))
+        return self._degrees
+
+    def adjacency(self):
+        """
+        (indptr, indices) out-neighbour index over node ids (see csr_rows), built once per edge set.
+        """
+        if self._adjacency is None:
+            src, dst = self.edges()
+            self._adjacency = csr_rows(src, dst, len(self.degrees()[0]))
+        return self._adjacency
+
+    def successors(self, node: int) -> list:
+        """
+        Out-neighbours of a node id: from the DiGraph when it is built, else from the adjacency index.
+        """
+        if self._graph is not None:
+            return list(self._graph.successors(node)) if node in self._graph else []
+        indptr, indices = self.adjacency()
+        if node >= len(indptr) - 1:
+            return []
+        return indices[indptr[node]:indptr[node + 1]].tolist()
+
+    def rank_order(self):
+        """
+        (ids, scores) of the nodes with edges, highest rank first (unranked = 0), built once per state.
+        """
+        if self._rank_order is None:
+            out_degree, in_degree = self.degrees()
+            ids = np.flatnonzero(out_degree + in_degree)
+            scores = self.ranks.weights(ids, default=0.0)
+            order = np.lexsort((ids, -scores))
+            self._rank_order = (ids[order], scores[order])
+        return self._rank_order
+
+
+class RecomputeScheduler:
+    """
+    Background worker that coalesces change notifications and recomputes the trust
+    graph off the request path. A burst of invites becomes one warm-started recompute.
+    """
+    def __init__(self, engine, debounce: float):
+        self.engine = engine
+        self.debounce = debounce
+        self._cond = threading.Condition()
+        self._added = []
+        self._removed = []
+        self._rebuild = False
+        self._rebuilding = False
+        self._catch_up = False
+        self._pending_since = None
+        self._stopping = False
+        self._thread = None
+
+        # Metrics
+        self.notifications = 0
+        self.runs = 0
+        self.failures = 0
+        self.last_duration = None
+        self.last_run_at = None
+        self.last_snapshot_at = time.time()
+        self.last_snapshot_version = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def rebuild_pending(self) -> bool:
+        """
+        A full rebuild is queued or running.
+        """
+        return self._rebuild or self._rebuilding
+
+    def start(self):
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="trust-recompute", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def notify(self, added=(), removed=(), rebuild: bool = False, catch_up: bool = False):
+        with self._cond:
+            self._added.extend(added)
+            self._removed.extend(removed)
+            self._rebuild = self._rebuild or rebuild
+            self._catch_up = self._catch_up or catch_up
+            if self._pending_since is None:
+                self._pending_since = time.time()
+            self.notifications += 1
+            self._cond.notify()
+
+    def _has_pending(self) -> bool:
+        return self._rebuild or self._catch_up or bool(self._added) or bool(self._removed)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._has_pending() and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+
+            # Let the rest of a burst arrive so it is folded into the same recompute
+            time.sleep(self.debounce)
+
+            with self._cond:
+                added, removed, rebuild, catch_up = self._added, self._removed, self._rebuild, self._catch_up
+                self._added, self._removed, self._rebuild, self._catch_up = [], [], False, False
+                self._rebuilding = rebuild
+                self._pending_since = None
+
+            started = time.perf_counter()
+            try:
+                if rebuild:
+                    self.engine.refresh()
+                else:
+                    if added or removed:
+                        self.engine.apply_edge_delta(added=added, removed=removed)
+                    if catch_up:
+                        self.engine.catch_up_edges()
+                # A shared-mode leader republishes every new version for the other workers
+                version = self.engine.state.version
+                due = self.engine.is_shared_leader or time.time() - self.last_snapshot_at >= SNAPSHOT_INTERVAL
+                if due and version != self.last_snapshot_version:
+                    self.engine.save_snapshot()
+                    self.last_snapshot_at = time.time()
+                    self.last_snapshot_version = version
+            except Exception as e:
+                self.failures += 1
+                print(f"❌ Background trust recompute failed: {e}")
+            finally:
+                self._rebuilding = False
+                self.runs += 1
+                self.last_duration = time.perf_counter() - started
+                self.last_run_at = time.time()
+
+    def metrics(self) -> dict:
+        pending_since = self._pending_since
+        return {
+            "running": self.running,
+            "notifications": self.notifications,
+            "recomputes": self.runs,
+            "failures": self.failures,
+            "last_recompute_ms": round(self.last_duration * 1000, 1) if self.last_duration is not None else None,
+            # Age of the oldest change not yet visible to readers
+            "pending_seconds": round(time.time() - pending_since, 3) if pending_since else 0.0,
+        }
+
+
+class SharedRanks:
+    """
+    Multi-worker mode. Server processes elect one leader through an exclusive flock next
+    to the snapshot file. The leader computes ranks and republishes the snapshot after
+    every recompute; followers never run PPR, they map the snapshot read-only and reload
+    it whenever the leader replaces it. Followers report new edges by touching a marker
+    file, which makes the leader catch up from the DB. If the leader exits its lock is
+    released and the next follower to poll takes over.
+    """
+    def __init__(self, engine, path: str, poll: float):
+        self.engine = engine
+        self.path = path
+        self.poll = poll
+        self.lock_path = f"{path}.lock"
+        self.dirty_path = f"{path}.dirty"
+        self.role = None
+        self._lock_file = None
+        self._loaded = None  # stat stamp of the snapshot file last loaded
+        self._dirty_seen = None
+        self._stopping = threading.Event()
+        self._thread = None
+
+        # Metrics
+        self.reloads = 0
+        self.reload_failures = 0
+        self.catch_ups = 0
+        self.last_reload_ms = None
+
+    @staticmethod
+    def _stamp(path: str):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def try_lead(self) -> bool:
+        """
+        Take the leader lock if no other process holds it.
+        """
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        self.role = "leader"
+        return True
+
+    def start(self) -> str:
+        if not self.try_lead():
+            self.role = "follower"
+        self._dirty_seen = self._stamp(self.dirty_path)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="trust-shared", daemon=True)
+        self._thread.start()
+        return self.role
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+        if self._lock_file:
+            self._lock_file.close()  # Releases the flock
+            self._lock_file = None
+
+    def mark_dirty(self):
+        """
+        Follower: tell the leader the edges table changed.
+        """
+        with open(self.dirty_path, "a"):
+            pass
+        os.utime(self.dirty_path)
+
+    def reload(self) -> bool:
+        """
+        Follower: map the snapshot again if the leader replaced it since the last load.
+        """
+        stamp = self._stamp(self.path)
+        if stamp is None or stamp == self._loaded:
+            return False
+        started = time.perf_counter()
+        # The leader replaces the file atomically, so a bad one stays bad until the next version
+        self._loaded = stamp
+        if not self.engine.load_snapshot(self.path, max_age=math.inf):
+            self.reload_failures += 1
+            return False
+        self.reloads += 1
+        self.last_reload_ms = (time.perf_counter() - started) * 1000
+        return True
+
+    def _promote(self):
+        print("👑 Trust leader is gone, this worker takes over the recompute")
+        self.reload()
+        self.engine.start_background_recompute()
+        self.engine.notify_catch_up()
+
+    def _run(self):
+        while not self._stopping.wait(self.poll):
+            try:
+                if self.role == "follower":
+                    if self.try_lead():
+                        self._promote()
+                    else:
+                        self.reload()
+                else:
+                    dirty = self._stamp(self.dirty_path)
+                    if dirty != self._dirty_seen:
+                        self._dirty_seen = dirty
+                        self.catch_ups += 1
+                        self.engine.notify_catch_up()
+            except Exception as e:
+                print(f"❌ Shared trust ranks poll failed: {e}")
+
+    def metrics(self) -> dict:
+        return {
+            "shared_role": self.role,
+            "shared_reloads": self.reloads,
+            "shared_reload_failures": self.reload_failures,
+            "shared_catch_ups": self.catch_ups,
+            "shared_last_reload_ms": round(self.last_reload_ms, 1) if self.last_reload_ms is not None else None,
+        }
+
+
+# --- SURPRISINGLY POPULAR MATH ---
+
+def sp_totals(groups: np.ndarray, weights: np.ndarray, user_votes: np.ndarray, predictions: np.ndarray, n: int):
+    """
+    Per-rumor SP sums for votes grouped by rumor index (0..n-1).
+    np.bincount adds each group's values in vote order, so a rumor's totals do not
+    depend on which other rumors share the batch.
+
+    Returns: (weighted_true, total_weight, sum_predictions, count) arrays of length n.
+    """
+    return (np.bincount(groups, weights=np.where(user_votes, weights, 0.0), minlength=n),
+            np.bincount(groups, weights=weights, minlength=n),
+            np.bincount(groups, weights=predictions, minlength=n),
+            np.bincount(groups, minlength=n))
+
+
+def sp_results(weighted_true: np.ndarray, total_weight: np.ndarray, sum_predictions: np.ndarray,
+               count: np.ndarray) -> list:
+    """
+    Surprisingly Popular classification for many rumors at once, from their sums.
+    Element-wise float64 math, so each rumor gets exactly the result of a scalar computation.
+
+    Returns: one resolve_rumor result dict per rumor.
+    """
+    count = np.asarray(count, dtype=np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # P(True | Vote): The "Popular" vote (weighted by Trust)
+        actual_vote_prob = np.where(total_weight > 0, weighted_true / total_weight, 0.5)
+        # P(True | Prediction): The "Expected" vote (average of the crowd's predictions)
+        avg_predicted_prob = np.where(count > 0, sum_predictions / count, 0.5)
+    # Information Gain / Delta
+    delta = actual_vote_prob - avg_predicted_prob
+
+    # TIERED VERIFICATION LOGIC
+    # Tier 1 (Circle): < 20 votes. Needs High Consensus.
+    # Tier 2 (Neighbor): 20-50 votes. Needs Medium Consensus.
+    # Tier 3 (Global): > 50 votes. Standard SP.
+    tier = np.where(count >= 50, "GLOBAL", np.where(count >= 20, "NEIGHBOR", "CIRCLE"))
+    min_votes_required = np.where(count >= 50, 50, np.where(count >= 20, 20, 5))
+
+    # If More people voted True than was predicted -> TRUE, Fewer -> FALSE
+    status = np.where(delta > THRESHOLD, "verified", np.where(delta < -THRESHOLD, "disputed", "uncertain"))
+
+    # Trust Score: confidence in the result.
+    # Combines magnitude of Delta + Volume of votes (saturating at 20 votes)
+    volume_factor = np.minimum(1.0, count / 20.0)
+    confidence = np.minimum(1.0, np.abs(delta) * 5)  # Scale delta so 0.2 gap = 100% confidence
+    trust_score = confidence * volume_factor
+
+    results = []
+    for n, tier_name, required, state, score, actual, predicted, gap in zip(
+            count.tolist(), tier.tolist(), min_votes_required.tolist(), status.tolist(), trust_score.tolist(),
+            actual_vote_prob.tolist(), avg_predicted_prob.tolist(), delta.tolist()):
+        if n < 3:  # Minimum threshold to attempt math
+            results.append({
+                "status": "pending",
+                "message": "Not enough votes to determine truth (need min 3)",
+                "verified_result": None,
+                "trust_score": 0.0,
+                "stats": {"total": n}
+            })
+        elif n < required:
+            results.append({
+                "status": "pending",
+                "message": f"Need {required - n} more votes for {tier_name} verification",
+                "verified_result": None,
+                "trust_score": 0.0,
+                "stats": {"total": n, "tier": tier_name}
+            })
+        else:
+            results.append({
+                "status": state,
+                "verified_result": {"verified": True, "disputed": False}.get(state),
+                "trust_score": round(score, 4),
+                "stats": {
+                    "total_votes": n,
+                    "weighted_true_pct": round(actual, 4),
+                    "avg_predicted_pct": round(predicted, 4),
+                    "delta": round(gap, 4)
+                }
+            })
+    return results
+
+
+class RumorTally:
+    """
+    Running SP sums for one rumor. A new vote is folded in with O(1) work; the weights are
+    re-derived from the kept votes only when a new rank vector is published. Sums are
+    added in vote order, exactly like sp_totals, so results match the batch path.
+    """
+    __slots__ = ("users", "votes", "predictions", "ranks", "weighted_true", "total_weight", "sum_predictions")
+
+    def __init__(self, rows: list, ranks: RankView):
+        self.users = [row["user_id"] for row in rows]
+        self.votes = [bool(row["vote"]) for row in rows]
+        self.predictions = [float(row["prediction"]) for row in rows]
+        self.derive(ranks)
+
+    @property
+    def count(self) -> int:
+        return len(self.users)
+
+    def derive(self, ranks: RankView):
+        """
+        Recompute the sums from scratch with the given ranks.
+        """
+        n = len(self.users)
+        weights = ranks.weights(ranks.table.lookup(self.users), default=UNRANKED_WEIGHT)
+        weighted_true, total_weight, sum_predictions, _ = sp_totals(
+            np.zeros(n, dtype=np.int64), weights, np.array(self.votes, dtype=bool), np.array(self.predictions), 1)
+        self.weighted_true = float(weighted_true[0])
+        self.total_weight = float(total_weight[0])
+        self.sum_predictions = float(sum_predictions[0])
+        self.ranks = ranks
+
+    def add(self, user_id: str, vote: bool, prediction: float):
+        weight = self.ranks.get(user_id, UNRANKED_WEIGHT)
+        self.users.append(user_id)
+        self.votes.append(bool(vote))
+        self.predictions.append(float(prediction))
+        # bincount adds 0.0 for a FALSE vote, which leaves the sum unchanged
+        if vote:
+            self.weighted_true += weight
+        self.total_weight += weight
+        self.sum_predictions += float(prediction)
+
+    def result(self) -> dict:
+        return sp_results(np.array([self.weighted_true]), np.array([self.total_weight]),
+                          np.array([self.sum_predictions]), np.array([self.count]))[0]
+
+
+class ResolutionQueue:
+    """
+    Background write-back of SP results. A vote only enqueues its rumor. Every `interval`
+    seconds the pending rumors are resolved from their running tallies and written back
+    with one bulk update, so a burst of votes on a hot rumor costs one resolution.
+    """
+    def __init__(self, engine, interval: float, max_retries: int = RESOLUTION_MAX_RETRIES):
+        self.engine = engine
+        self.interval = interval
+        self.max_retries = max_retries
+        self._cond = threading.Condition()
+        self._pending = set()
+        self._retries = {}  # rumor_id -> failed write-backs in a row
+        self._stopping = threading.Event()
+        self._thread = None
+
+        # Metrics
+        self.enqueued = 0
+        self.flushes = 0
+        self.failures = 0
+        self.deferred = 0
+        self.dropped = 0
+        self.written = 0
+        self.last_batch = 0
+        self.last_duration = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="trust-resolution", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._cond:
+            self._stopping.set()
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+        # Don't lose the last interval's votes
+        self.flush()
+
+    def notify(self, rumor_id: str):
+        with self._cond:
+            self._pending.add(rumor_id)
+            self.enqueued += 1
+            self._cond.notify()
+
+    def flush(self):
+        with self._cond:
+            rumor_ids, self._pending = list(self._pending), set()
+        if not rumor_ids:
+            return
+        started = time.perf_counter()
+        try:
+            self.written += self.engine.resolve_and_save(rumor_ids)
+            for rumor_id in rumor_ids:
+                self._retries.pop(rumor_id, None)
+        except RanksUnavailable:
+            # Retried next interval, once the first recompute (or snapshot) has published ranks
+            self.deferred += 1
+            with self._cond:
+                self._pending.update(rumor_ids)
+        except Exception as e:
+            self.failures += 1
+            # Transient DB/RPC errors: put the batch back, but give up on rumors that keep failing
+            retry = []
+            for rumor_id in rumor_ids:
+                attempts = self._retries.get(rumor_id, 0) + 1
+                if attempts > self.max_retries:
+                    self._retries.pop(rumor_id, None)
+                    self.dropped += 1
+                else:
+                    self._retries[rumor_id] = attempts
+                    retry.append(rumor_id)
+            with self._cond:
+                self._pending.update(retry)
+            print(f"❌ Rumor resolution write-back failed ({len(retry)} of {len(rumor_ids)} rumors requeued): {e}")
+        finally:
+            self.flushes += 1
+            self.last_batch = len(rumor_ids)
+            self.last_duration = time.perf_counter() - started
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping.is_set():
+                    self._cond.wait()
+            # Collect the rest of the interval's votes (stop() wakes us early)
+            if self._stopping.wait(self.interval):
+                return
+            self.flush()
+
+    def metrics(self) -> dict:
+        return {
+            "resolution_enqueued": self.enqueued,
+            "resolution_pending": len(self._pending),
+            "resolution_flushes": self.flushes,
+            "resolution_failures": self.failures,
+            "resolution_deferred": self.deferred,
+            "resolution_dropped": self.dropped,
+            "resolution_rows_written": self.written,
+            "resolution_last_batch": self.last_batch,
+            "resolution_last_flush_ms": round(self.last_duration * 1000, 1) if self.last_duration is not None else None,
+        }
+
+
+class VoterSet:
+    """
+    Interned ids of the users who voted on one rumor: a sorted int32 array plus a small set
+    of recent additions, merged into the array once it passes 1/16 of the array's size.
+    """
+    __slots__ = ("ids", "recent")
+
+    def __init__(self, ids: np.ndarray = None):
+        self.ids = np.zeros(0, dtype=np.int32) if ids is None else ids
+        self.recent = set()
+
+    def __contains__(self, user: int) -> bool:
+        if user in self.recent:
+            return True
+        i = np.searchsorted(self.ids, user)
+        return i < len(self.ids) and self.ids[i] == user
+
+    def __len__(self):
+        return len(self.ids) + len(self.recent)
+
+    def add(self, user: int):
+        if user in self:
+            return
+        self.recent.add(user)
+        if len(self.recent) > max(32, len(self.ids) // 16):
+            self.ids = np.union1d(self.ids, np.fromiter(self.recent, dtype=np.int32, count=len(self.recent)))
+            self.recent = set()
+
+
+class VoterIndex:
+    """
+    In-memory index of who voted on what, so duplicate votes are rejected and "has this user
+    voted" is answered without touching the DB. Users are interned in a table of their own (the
+    graph's table is swapped on snapshot loads); each rumor keeps a VoterSet.
+
+    Loaded by streaming the votes table, then kept current by the votes this process writes.
+    Votes written by other workers arrive with the full reload every `interval` seconds; until
+    then the DB's unique constraint still catches their duplicates.
+    """
+    def __init__(self, engine, interval: float):
+        self.engine = engine
+        self.interval = interval
+        self.users = NodeTable()
+        self.rumors = {}  # rumor_id -> VoterSet
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._changes = None  # add() calls made while a reload is streaming
+        self._stopping = threading.Event()
+        self._thread = None
+
+        # Metrics
+        self.lookups = 0
+        self.duplicates = 0
+        self.reloads = 0
+        self.reload_failures = 0
+        self.last_reload_ms = None
+
+    def has_voted(self, rumor_id: str, user_id: str):
+        """
+        True/False once loaded; None while the first load is still running.
+        """
+        if not self.loaded:
+            return None
+        self.lookups += 1
+        voters = self.rumors.get(rumor_id)
+        user = self.users.index.get(user_id)
+        found = voters is not None and user is not None and user in voters
+        if found:
+            self.duplicates += 1
+        return found
+
+    def voted_on(self, user_id: str, rumor_ids: list):
+        """
+        The subset of `rumor_ids` the user voted on, or None while the first load is still running.
+        """
+        if not self.loaded:
+            return None
+        user = self.users.index.get(user_id)
+        if user is None:
+            return set()
+        return {rumor_id for rumor_id in rumor_ids if user in self.rumors.get(rumor_id, ())}
+
+    def add(self, rumor_id: str, user_id: str):
+        with self._lock:
+            self._add(self.rumors, rumor_id, self.users.intern(user_id))
+            if self._changes is not None:
+                self._changes.append((rumor_id, user_id))
+
+    @staticmethod
+    def _add(rumors: dict, rumor_id: str, user: int):
+        voters = rumors.get(rumor_id)
+        if voters is None:
+            voters = rumors[rumor_id] = VoterSet()
+        voters.add(user)
+
+    def reload(self) -> bool:
+        """
+        Rebuild the index from the votes table, keeping votes added while it streamed.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._changes = []
+        try:
+            voters = {}
+            for rows in self.engine.iter_vote_pages(columns="id,rumor_id,user_id"):
+                with self._lock:
+                    intern = self.users.intern
+                    for row in rows:
+                        voters.setdefault(row["rumor_id"], []).append(intern(row["user_id"]))
+            rumors = {rumor_id: VoterSet(np.unique(np.array(users, dtype=np.int32))) for rumor_id, users in voters.items()}
+        except Exception as e:
+            self.reload_failures += 1
+            print(f"⚠️ Could not load the voter index: {e}")
+            with self._lock:
+                self._changes = None
+            return False
+        with self._lock:
+            for rumor_id, user_id in self._changes:
+                self._add(rumors, rumor_id, self.users.intern(user_id))
+            self.rumors = rumors
+            self._changes = None
+        self.loaded = True
+        self.reloads += 1
+        self.last_reload_ms = (time.perf_counter() - started) * 1000
+        return True
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="voter-index", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        # First load in the background: votes fall back on the DB constraint until it's done
+        self.reload()
+        print(f"🗳️ Voter index loaded: {self.size()} votes on {len(self.rumors)} rumors")
+        while not self._stopping.wait(self.interval):
+            self.reload()
+
+    def size(self) -> int:
+        return sum(len(voters) for voters in list(self.rumors.values()))
+
+    def metrics(self) -> dict:
+        return {
+            "voter_index_loaded": self.loaded,
+            "voter_index_rumors": len(self.rumors),
+            "voter_index_users": len(self.users),
+            "voter_index_lookups": self.lookups,
+            "voter_index_duplicates": self.duplicates,
+            "voter_index_reloads": self.reloads,
+            "voter_index_reload_failures": self.reload_failures,
+            "voter_index_last_reload_ms": round(self.last_reload_ms, 1) if self.last_reload_ms is not None else None,
+        }
+
+
+class RippleIndex:
+    """
+    Ripple Protocol visibility: which users are within `hops` trust edges of a given user.
+    Each user's set is a (node ids, distances) pair of int32/int8 arrays sorted by id, of at most
+    `max_size` nodes (nearest first), built by a BFS the first time the user needs it and kept for
+    the `capacity` most recent users. Edge inserts extend the cached sets; removals drop the sets
+    they could shrink, and a new graph or node table drops them all.
+
+    A BFS runs outside the lock on the caller's state: its result is only kept if no delta or
+    clear came in meanwhile and that state is not older than the last one applied.
+    """
+    def __init__(self, hops: int, max_size: int, capacity: int):
+        self.hops = hops
+        self.max_size = max_size
+        self.capacity = capacity
+        self.sets = OrderedDict()  # node id -> (node ids, distances), in LRU order
+        self._lock = threading.Lock()
+        self.generation = 0  # Bumped by apply() and clear()
+        self.version = 0  # Version of the last state applied or cleared for
+
+        # Metrics
+        self.hits = 0
+        self.builds = 0
+        self.discarded = 0
+        self.extended = 0
+        self.dropped = 0
+
+    @staticmethod
+    def contains(neighborhood: tuple, nodes: np.ndarray) -> np.ndarray:
+        """
+        Membership of each id in `nodes` (-1 for unknown users) in a neighborhood.
+        """
+        ids = neighborhood[0]
+        if len(ids) == 0 or len(nodes) == 0:
+            return np.zeros(len(nodes), dtype=bool)
+        positions = np.minimum(np.searchsorted(ids, nodes), len(ids) - 1)
+        return ids[positions] == nodes
+
+    @staticmethod
+    def _pack(distances: dict) -> tuple:
+        ids = np.fromiter(distances.keys(), dtype=np.int32, count=len(distances))
+        hops = np.fromiter(distances.values(), dtype=np.int8, count=len(distances))
+        order = np.argsort(ids, kind="stable")
+        return ids[order], hops[order]
+
+    def _relax(self, state, distances: dict, frontier: list):
+        # BFS from (node, distance) pairs, lowering distances and adding nodes up to the bounds
+        while frontier:
+            next_frontier = []
+            for node, distance in frontier:
+                if distance >= self.hops:
+                    continue
+                for neighbor in state.successors(node):
+                    known = distances.get(neighbor)
+                    if known is not None and known <= distance + 1:
+                        continue
+                    if known is None and len(distances) >= self.max_size:
+                        continue
+                    distances[neighbor] = distance + 1
+                    next_frontier.append((neighbor, distance + 1))
+            frontier = next_frontier
+
+    def cached(self, node: int):
+        """
+        The node's neighborhood if it is cached, else None (no BFS).
+        """
+        with self._lock:
+            neighborhood = self.sets.get(node)
+            if neighborhood is not None:
+                self.sets.move_to_end(node)
+                self.hits += 1
+            return neighborhood
+
+    def neighborhood(self, state, node: int) -> tuple:
+        with self._lock:
+            neighborhood = self.sets.get(node)
+            if neighborhood is not None:
+                self.sets.move_to_end(node)
+                self.hits += 1
+                return neighborhood
+            generation = self.generation
+        distances = {node: 0}
+        self._relax(state, distances, [(node, 0)])
+        neighborhood = self._pack(distances)
+        with self._lock:
+            self.builds += 1
+            if self.generation != generation or state.version < self.version:
+                # Built against a graph that has changed since: serve it, don't keep it
+                self.discarded += 1
+                return neighborhood
+            self.sets[node] = neighborhood
+            while len(self.sets) > self.capacity:
+                self.sets.popitem(last=False)
+        return neighborhood
+
+    def apply(self, state, added: tuple, removed: tuple):
+        """
+        Fold a published edge delta into the cached sets (`state` is the state that includes it).
+        """
+        with self._lock:
+            self.generation += 1
+            self.version = max(self.version, state.version)
+            cached = list(self.sets.items())
+        stale, extended = [], {}
+        for node, neighborhood in cached:
+            if len(removed[0]) and (self.contains(neighborhood, removed[0]) & self.contains(neighborhood, removed[1])).any():
+                stale.append(node)
+                continue
+            reached = self.contains(neighborhood, added[0])
+            if not reached.any():
+                continue
+            distances = dict(zip(neighborhood[0].tolist(), neighborhood[1].tolist()))
+            size = len(distances)
+            self._relax(state, distances, [(source, distances[source]) for source in added[0][reached].tolist()])
+            if len(distances) > size:
+                extended[node] = (neighborhood, self._pack(distances))
+        with self._lock:
+            for node in stale:
+                self.sets.pop(node, None)
+            for node, (before, after) in extended.items():
+                if self.sets.get(node) is before:
+                    self.sets[node] = after
+        self.dropped += len(stale)
+        self.extended += len(extended)
+
+    def clear(self, state=None):
+        with self._lock:
+            self.generation += 1
+            if state is not None:
+                self.version = max(self.version, state.version)
+            self.dropped += len(self.sets)
+            self.sets.clear()
+
+    def metrics(self) -> dict:
+        return {
+            "ripple_cached_users": len(self.sets),
+            "ripple_cached_nodes": sum(len(ids) for ids, _ in list(self.sets.values())),
+            "ripple_hits": self.hits,
+            "ripple_builds": self.builds,
+            "ripple_discarded": self.discarded,
+            "ripple_extended": self.extended,
+            "ripple_dropped": self.dropped,
+        }
+
+
+GRAPH_FORMATS = ("json", "compact")
+GRAPH_NODE_TYPES = ("GENESIS", "HIGH_TRUST", "LOW_TRUST")
+# Serialized graph payloads kept (the whole graph per format plus recent level-of-detail views)
+GRAPH_PAYLOAD_CACHE = int(os.getenv("TRUST_GRAPH_PAYLOAD_CACHE", "64"))
+# Changes kept for /api/graph?since= (edges + score updates), and the relative score move worth reporting
+GRAPH_CHANGELOG_SIZE = int(os.getenv("TRUST_GRAPH_CHANGELOG_SIZE", "100000"))
+GRAPH_SCORE_TOLERANCE = float(os.getenv("TRUST_GRAPH_SCORE_TOLERANCE", "0.01"))
+HIGH_TRUST_SCORE = 0.0005  # Non-genesis nodes above this rank are drawn as HIGH_TRUST
+
+
+class GraphPayload:
+    """
+    A serialized /api/graph response for one graph version.
+    """
+    __slots__ = ("version", "etag", "body")
+
+    def __init__(self, version: int, etag: str, body: bytes):
+        self.version = version
+        self.etag = etag
+        self.body = body
+
+
+class GraphChangelog:
+    """
+    Bounded history of what each published version changed, so clients can fetch deltas:
+    edges added/removed, and nodes whose score moved more than `tolerance` (relative) since
+    it was last logged, so small moves add up instead of being lost. A publish that replaces
+    the whole edge set (rebuild, snapshot load) starts the log over.
+    """
+    def __init__(self, max_items: int, tolerance: float):
+        self.max_items = max_items
+        self.tolerance = tolerance
+        self.entries = deque()  # (version, (added src, dst), (removed src, dst), changed node ids)
+        self.items = 0
+        self.base = 0  # Oldest version a delta can start from
+        self._logged = np.zeros(0)  # Each node's score as of its last logged change
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.resets = 0
+        self.truncations = 0
+
+    @staticmethod
+    def _scores(state) -> np.ndarray:
+        return np.nan_to_num(state.ranks.rank, nan=0.0)
+
+    def reset(self, state):
+        with self._lock:
+            self.entries.clear()
+            self.items = 0
+            self.base = state.version
+        self._logged = self._scores(state).copy()
+        self.resets += 1
+
+    def record(self, state, added: tuple, removed: tuple, rank_changed: bool):
+        changed = np.zeros(0, dtype=np.int32)
+        if rank_changed:
+            scores = self._scores(state)
+            logged = self._logged
+            if len(logged) < len(scores):
+                logged = np.concatenate([logged, np.zeros(len(scores) - len(logged))])
+            current = np.zeros(len(logged))
+            current[:len(scores)] = scores
+            moved = np.abs(current - logged) > self.tolerance * np.abs(logged)
+            # Crossing the HIGH_TRUST line changes how a node is drawn, however small the move
+            moved |= (current > HIGH_TRUST_SCORE) != (logged > HIGH_TRUST_SCORE)
+            changed = np.flatnonzero(moved).astype(np.int32)
+            logged[changed] = current[changed]
+            self._logged = logged
+
+        with self._lock:
+            self.entries.append((state.version, added, removed, changed))
+            self.items += max(1, len(added[0]) + len(removed[0]) + len(changed))
+            while self.items > self.max_items and self.entries:
+                version, added, removed, changed = self.entries.popleft()
+                self.items -= max(1, len(added[0]) + len(removed[0]) + len(changed))
+                self.base = version
+                self.truncations += 1
+
+    def since(self, since: int, version: int):
+        """
+        Entries after `since` up to `version`, oldest first; None if the log no longer reaches back that far.
+        """
+        with self._lock:
+            if since < self.base or since > version:
+                return None
+            return [entry for entry in self.entries if since < entry[0] <= version]
+
+    def metrics(self) -> dict:
+        return {
+            "graph_changelog_entries": len(self.entries),
+            "graph_changelog_items": self.items,
+            "graph_changelog_base": self.base,
+            "graph_changelog_resets": self.resets,
+            "graph_changelog_truncations": self.truncations,
+        }
+
+
+class TrustEngine:
+    def __init__(self, ppr_backend: str = None):
+        self.ppr_backend = ppr_backend or PPR_BACKEND
+        if self.ppr_backend not in PPR_BACKENDS:
+            raise ValueError(f"Unknown trust PPR backend {self.ppr_backend!r} (TRUST_PPR_BACKEND must be one of "
+                             f"{', '.join(PPR_BACKENDS)})")
+        # Users are interned to dense int ids; the graph and rank arrays only use those ids
+        nodes = NodeTable()
+        self.state = TrustState(0, nodes, None, RankView(nodes, np.empty(0)))
+        # Cached seed ids; refreshed on every full rebuild, reused by incremental updates
+        self.seeds = None
+        self.edges_high_water = None
+        # Where save_snapshot/load_snapshot go by default (shared mode: the file the workers share)
+        self.snapshot_path = SNAPSHOT_PATH
+        # Writers (rebuilds, deltas, recomputes) are serialized; readers never take this lock
+        self._write_lock = threading.RLock()
+        self.scheduler = None
+        self.shared = None
+        self.resolution_queue = None
+        self.voters = None
+        self.ripple = RippleIndex(RIPPLE_HOPS, RIPPLE_MAX_NEIGHBORS, RIPPLE_CACHE)
+        # rumor_id -> RumorTally, in LRU order
+        self.tallies = OrderedDict()
+        self._tally_lock = threading.Lock()
+        self.tally_hits = 0
+        self.tally_loads = 0
+        self.tally_rederives = 0
+        self.tally_resyncs = 0
+        # Visualization: genesis flags and serialized payloads, refreshed once per graph version
+        self._genesis_version = None
+        self._graph_payloads = OrderedDict()  # (format, view) -> GraphPayload, oldest build first
+        self._graph_payloads_lock = threading.Lock()
+        self._graph_payload_lock = threading.Lock()  # Serializes whole-graph builds
+        self.graph_payload_hits = 0
+        self.graph_payload_builds = 0
+        self.graph_view_builds = 0
+        self.graph_delta_fallbacks = 0
+        self.changelog = GraphChangelog(GRAPH_CHANGELOG_SIZE, GRAPH_SCORE_TOLERANCE)
+        self.last_graph_payload_ms = None
+
+    # --- READ SIDE: always the latest published state ---
+
+    @property
+    def nodes(self) -> NodeTable:
+        return self.state.nodes
+
+    @property
+    def graph(self) -> nx.DiGraph:
+        return self.state.graph
+
+    @graph.setter
+    def graph(self, graph: nx.DiGraph):
+        """
+        Publish an externally built graph; its nodes must already be interned ids.
+        """
+        self._publish(graph=graph)
+
+    @property
+    def trust_ranks(self) -> RankView:
+        """
+        {user_id: rank} for every ranked user. UUIDs only appear at this boundary.
+        """
+        return self.state.ranks
+
+    @trust_ranks.setter
+    def trust_ranks(self, ranks: dict):
+        with self._write_lock:
+            table = self.nodes
+            nodes = [table.intern(user_id) for user_id in ranks]
+            rank = np.full(len(table), np.nan)
+            rank[nodes] = list(ranks.values())
+            self._publish(rank=rank)
+
+    def _publish(self, graph: nx.DiGraph = None, rank: np.ndarray = None, nodes: NodeTable = None,
+                 degrees: tuple = None, csr: CSRGraph = None, edges: tuple = None, version: int = None,
+                 edge_delta: tuple = None):
+        """
+        Swap in the next TrustState. Parts not given carry over from the current state.
+        `edges` publishes a graph as (src, dst) arrays, built into a DiGraph only when needed.
+        `edge_delta` = (added, removed) id pairs says how a new graph differs from the current one;
+        without it a new graph restarts the changelog.
+        """
+        with self._write_lock:
+            current = self.state
+            if nodes is None:
+                nodes = current.nodes
+            adjacency = None
+            replaced = graph is not None or edges is not None
+            if not replaced:
+                graph, edges, csr = current._graph, current._edges, csr or current.csr
+                degrees = degrees or current._degrees
+                adjacency = current._adjacency
+            ranks = current.ranks if rank is None else RankView(nodes, rank)
+            version = max(current.version + 1, version or 0)
+            self.state = TrustState(version, nodes, graph, ranks, degrees=degrees, csr=csr, edges=edges,
+                                    adjacency=adjacency, ranked=rank is not None or current.ranked)
+            if (replaced and edge_delta is None) or nodes is not current.nodes:
+                self.changelog.reset(self.state)
+                self.ripple.clear(self.state)
+            else:
+                added, removed = _pair_arrays(edge_delta[0] if edge_delta else ()), _pair_arrays(edge_delta[1] if edge_delta else ())
+                self.changelog.record(self.state, added, removed, rank is not None)
+                if edge_delta:
+                    self.ripple.apply(self.state, added, removed)
+            return self.state
+
+    # --- WRITE SIDE ---
+
+    def iter_edge_pages(self, page_size: int = EDGE_PAGE_SIZE, since: str = None):
+        """
+        Stream the edges table with keyset pagination on its (source_user, target_user)
+        primary key, so no request is silently truncated by the PostgREST row cap and only
+        one page is held in memory at a time.
+
+        Args:
+            since: Only stream edges with created_at >= this timestamp (snapshot catch-up).
+
+        Yields: one list of edge rows per page.
+        """
+        last = None
+        while True:
+            query = supabase.table("edges").select("source_user,target_user,created_at")
+            if since:
+                query = query.gte("created_at", since)
+            if last:
+                source, target = last["source_user"], last["target_user"]
+                query = query.or_(f"source_user.gt.{source},and(source_user.eq.{source},target_user.gt.{target})")
+            rows = query.order("source_user").order("target_user").limit(page_size).execute().data
+            # Stop on an empty page rather than a short one: the server may cap pages below page_size
+            if not rows:
+                return
+            yield rows
+            last = rows[-1]
+
+    def _load_graph(self):
+        """
+        Stream all edges from Supabase page by page into a new DiGraph over interned ids.
+        Nothing is published; returns (graph, high_water).
+        """
+        graph = nx.DiGraph()
+        intern = self.nodes.intern
+        high_water = None
+        total = 0
+        started = time.perf_counter()
+
+        for page_no, rows in enumerate(self.iter_edge_pages(), start=1):
+            page_started = time.perf_counter()
+            for edge in rows:
+                graph.add_edge(intern(edge["source_user"]), intern(edge["target_user"]))
+                created_at = edge.get("created_at")
+                if created_at and (high_water is None or created_at > high_water):
+                    high_water = created_at
+            total += len(rows)
+            print(f"    -> Page {page_no}: {len(rows)} edges ({total} total) in {(time.perf_counter() - page_started) * 1000:.0f}ms")
+
+        print(f"✅ Graph built: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges in {time.perf_counter() - started:.2f}s")
+        return graph, high_water
 
     def build_trust_graph(self):
         """
-        Fetch all edges from Supabase and build a NetworkX DiGraph.
+        Stream all edges from Supabase into a new graph and publish it (ranks are kept until recomputed).
         """
         print("🔄 Building Trust Graph...")
-        try:
-            # Fetch edges from database
-            # Pagination might be needed for large datasets, fetching all for now as per Hackathon scope
-            response = supabase.table("edges").select("source_user,target_user").execute()
-            edges = response.data
-            
-            # Build directed graph
-            self.graph = nx.DiGraph()
-            for edge in edges:
-                self.graph.add_edge(edge["source_user"], edge["target_user"])
-            
-            print(f"✅ Graph built: {len(self.graph.nodes())} nodes, {len(self.graph.edges())} edges")
-            return self.graph
-        except Exception as e:
-            print(f"❌ Error building graph: {e}")
-            return nx.DiGraph()
+        with self._write_lock:
+            try:
+                graph, high_water = self._load_graph()
+            except Exception as e:
+                print(f"❌ Error building graph: {e}")
+                return nx.DiGraph()
+            self.seeds = None
+            # Newest edge timestamp seen; edges created after it are not in the graph yet
+            self.edges_high_water = high_water
+            self._publish(graph=graph)
+            return graph
 
-    def calculate_trust_ranks(self):
+    def refresh(self):
         """
-        Run Personalized PageRank (PPR) on the graph.
-        We use 'Trusted Seeds' (the first 10 users) to anchor the trust graph.
-        This prevents massive bot farms from hijacking the global score.
+        Full rebuild: load the graph, rank it, and publish both in a single swap.
         """
-        if not self.graph:
-            self.build_trust_graph()
-        
-        if len(self.graph.nodes()) == 0:
-            return {}
-        
+        print("🔄 Rebuilding Trust Graph + Ranks...")
+        with self._write_lock:
+            graph, high_water = self._load_graph()
+            self.seeds = None
+            self.edges_high_water = high_water
+            rank, csr = self._compute_ranks(graph)
+            self._publish(graph=graph, rank=rank, csr=csr)
+            return self.trust_ranks
+
+    def load_edges(self, edges):
+        """
+        Replace the graph with the given (source_user, target_user) pairs, without touching the DB.
+        """
+        with self._write_lock:
+            intern = self.nodes.intern
+            graph = nx.DiGraph()
+            graph.add_edges_from((intern(source), intern(target)) for source, target in edges)
+            self._publish(graph=graph)
+            return graph
+
+    def load_trusted_seeds(self):
+        """
+        Fetch the Trusted Seeds (first SEED_COUNT users) used as the PPR personalization vector.
+        """
+        # We assume the first 10 users are human (University Admins/Students)
+        response = supabase.table("users").select("id").order("created_at").limit(SEED_COUNT).execute()
+        self.seeds = [s["id"] for s in response.data]
+        return self.seeds
+
+    def _pagerank(self, graph: nx.DiGraph, csr: CSRGraph = None, seed_nodes: list = None,
+                  previous: np.ndarray = None):
+        """
+        Run PPR on the configured backend.
+
+        Args:
+            seed_nodes: Interned ids of the Trusted Seeds, or None for global PageRank.
+            previous: Rank array to warm-start from, or None for a uniform start.
+
+        Returns: (rank array indexed by node id with NaN outside the graph, CSR view or None).
+        """
+        table = self.nodes
+        rank = np.full(len(table), np.nan)
+
+        if self.ppr_backend == "csr":
+            if csr is None:
+                csr = CSRGraph.from_networkx(graph)
+            ids = np.asarray(csr.nodes, dtype=np.int64)
+            p = None
+            if seed_nodes is not None:
+                p = np.isin(ids, seed_nodes).astype(np.float64)
+            x = None
+            if previous is not None:
+                x = RankView(table, previous).weights(ids, default=0.0)
+            rank[ids] = csr.power_iteration(p, x, alpha=ALPHA)
+            print(f"    -> CSR power iteration converged in {csr.iterations} iterations")
+            return rank, csr
+
+        personalization = None if seed_nodes is None else {node: 1.0 for node in seed_nodes}
+        nstart = None
+        if previous is not None:
+            nodes = np.fromiter(graph, dtype=np.int64, count=graph.number_of_nodes())
+            weights = RankView(table, previous).weights(nodes, default=0.0)
+            nstart = dict(zip(nodes.tolist(), weights.tolist()))
+        ranks = nx.pagerank(graph, alpha=ALPHA, personalization=personalization, nstart=nstart)
+        rank[list(ranks.keys())] = list(ranks.values())
+        return rank, None
+
+    def _compute_ranks(self, graph: nx.DiGraph, csr: CSRGraph = None, warm_start: bool = False):
+        """
+        Personalized PageRank over `graph` anchored on the Trusted Seeds. Nothing is published.
+        Returns: (rank array, CSR view or None). An empty graph ranks nobody (all NaN), so every
+                 voter falls back to UNRANKED_WEIGHT.
+        """
+        if (len(csr.nodes) if csr is not None else graph.number_of_nodes() if graph is not None else 0) == 0:
+            return np.full(len(self.nodes), np.nan), None
+
         print("🧮 Calculating Trust Scores (Personalized PageRank)...")
-        
+
+        previous = self.trust_ranks.rank if (warm_start and len(self.trust_ranks) > 0) else None
+        if previous is not None:
+            print("    -> Warm start from previous trust ranks")
+
         # 1. Fetch Trusted Seeds (Early Adopters / Admins)
         try:
-            # We assume the first 10 users are human (University Admins/Students)
-            response = supabase.table("users").select("id").order("created_at").limit(10).execute()
-            seeds = response.data # [{"id": "uuid"}, ...]
+            seeds = self.seeds if self.seeds is not None else self.load_trusted_seeds()
             
             if seeds:
-                # Create optimization vector: {user_id: 1.0, ...}
-                personalization = { s["id"]: 1.0 for s in seeds }
+                # Create optimization vector over the seeds that are in the graph
+                seed_nodes = [self.nodes.index[s] for s in seeds if s in self.nodes.index]
                 print(f"    -> Using {len(seeds)} Trusted Seeds for Sybil Resistance")
                 
                 # 2. Run PPR
                 # Trust flows from these seeds. Bots with no path from seeds get 0 score.
-                self.trust_ranks = nx.pagerank(self.graph, alpha=0.85, personalization=personalization)
+                return self._pagerank(graph, csr, seed_nodes=seed_nodes, previous=previous)
             else:
                 print("    -> No users found, using Global PageRank (Warning: Sybil-vulnerable)")
-                self.trust_ranks = nx.pagerank(self.graph, alpha=0.85)
+                return self._pagerank(graph, csr, previous=previous)
 
         except Exception as e:
             print(f"    -> Error fetching seeds ({e}), falling back to Global PageRank")
-            self.trust_ranks = nx.pagerank(self.graph, alpha=0.85)
+            return self._pagerank(graph, csr, previous=previous)
+
+    def calculate_trust_ranks(self, warm_start: bool = False):
+        """
+        Run Personalized PageRank (PPR) on the graph.
+        We use 'Trusted Seeds' (the first 10 users) to anchor the trust graph.
+        This prevents massive bot farms from hijacking the global score.
+
+        Args:
+            warm_start: Start power iteration from the previous trust_ranks vector instead of
+                        a uniform one. After a small graph delta this converges in a few iterations.
+        """
+        with self._write_lock:
+            if not self.graph:
+                self.build_trust_graph()
+            
+            state = self.state
+            rank, csr = self._compute_ranks(state.graph, state.csr, warm_start=warm_start)
+            self._publish(rank=rank, csr=csr)
+            return self.trust_ranks
+
+    def apply_edge_delta(self, added: list = (), removed: list = ()):
+        """
+        Apply inserted/deleted invite edges and re-rank incrementally.
+        Instead of refetching every edge, the delta is applied to a copy of the current
+        graph, PPR is warm-started from the previous trust_ranks (a single new edge
+        converges in a few iterations), and graph + ranks are published in one swap.
 
+        Args:
+            added: Iterable of (source_user, target_user) pairs that were inserted.
+            removed: Iterable of (source_user, target_user) pairs that were deleted.
+
+        Returns: the updated trust_ranks mapping.
+        """
+        with self._write_lock:
+            state = self.state
+            if state.size()[0] == 0:
+                # Nothing to patch yet: do a single cold build (the delta is already in the DB)
+                return self.refresh()
+
+            table = state.nodes
+            added = [(table.intern(source), table.intern(target)) for source, target in added]
+            removed = [(table.index.get(source), table.index.get(target)) for source, target in removed]
+            if self.ppr_backend == "csr":
+                return self._apply_edge_delta_arrays(state, added, removed)
+
+            # Copy-on-write: readers keep using the published graph until the swap. Only the
+            # adjacency of the delta's endpoints is copied, the rest is shared with it
+            graph = cow_graph(state.graph, {node for edge in added + removed for node in edge if node is not None})
+            previous_out, previous_in = state.degrees()
+            out_degree = np.zeros(len(table), dtype=np.int32)
+            out_degree[:len(previous_out)] = previous_out
+            in_degree = np.zeros(len(table), dtype=np.int32)
+            in_degree[:len(previous_in)] = previous_in
+            applied_added, applied_removed = [], []
+
+            for source, target in added:
+                if not graph.has_edge(source, target):
+                    graph.add_edge(source, target)
+                    out_degree[source] += 1
+                    in_degree[target] += 1
+                    applied_added.append((source, target))
+
+            for source, target in removed:
+                if graph.has_edge(source, target):
+                    graph.remove_edge(source, target)
+                    out_degree[source] -= 1
+                    in_degree[target] -= 1
+                    applied_removed.append((source, target))
+                    # A fresh build only knows nodes through their edges, so drop orphans too
+                    for node in (source, target):
+                        if node in graph and graph.degree(node) == 0:
+                            graph.remove_node(node)
+
+            if not applied_added and not applied_removed:
+                return self.trust_ranks
+
+            print(f"🔁 Applied edge delta: +{len(applied_added)} / -{len(applied_removed)} edges")
+            rank, csr = self._compute_ranks(graph, warm_start=True)
+            self._publish(graph=graph, rank=rank, degrees=(out_degree, in_degree), csr=csr,
+                          edge_delta=(applied_added, applied_removed))
+            return self.trust_ranks
+
+    def _apply_edge_delta_arrays(self, state: TrustState, added: list, removed: list):
+        """
+        apply_edge_delta for the csr backend: the delta is applied to the (src, dst) edge arrays and
+        the CSR is rebuilt from them with NumPy, so no DiGraph is copied, converted or kept.
+        """
+        src, dst = state.edges()
+        keys = _edge_keys(src, dst)
+        new = np.unique(_edge_keys(*_pair_arrays(added)))
+        new = new[~np.isin(new, keys)]
+        gone = np.isin(keys, _edge_keys(*_pair_arrays([edge for edge in removed if None not in edge])))
+        if not len(new) and not gone.any():
+            return self.trust_ranks
+
+        applied_added, applied_removed = _key_pairs(new), _key_pairs(keys[gone])
+        src = np.concatenate([src[~gone], applied_added[:, 0]])
+        dst = np.concatenate([dst[~gone], applied_added[:, 1]])
+        degrees = _degrees(src, dst, len(state.nodes))
+        # CSR rows are the nodes that still have edges (orphans drop out, like a fresh build)
+        nodes = np.flatnonzero(degrees[0] + degrees[1])
+        csr = CSRGraph.from_edges(nodes, np.searchsorted(nodes, src), np.searchsorted(nodes, dst))
+
+        print(f"🔁 Applied edge delta: +{len(applied_added)} / -{len(applied_removed)} edges")
+        rank, csr = self._compute_ranks(None, csr, warm_start=True)
+        self._publish(edges=(src, dst), rank=rank, degrees=degrees, csr=csr,
+                      edge_delta=(applied_added, applied_removed))
         return self.trust_ranks
 
+    def catch_up_edges(self):
+        """
+        Apply only the edges created since the graph's high-water mark (e.g. after a snapshot load).
+        Returns: number of edges fetched.
+        """
+        with self._write_lock:
+            started = time.perf_counter()
+            since = self.edges_high_water
+            high_water = since
+            added = []
+            for rows in self.iter_edge_pages(since=since):
+                for edge in rows:
+                    added.append((edge["source_user"], edge["target_user"]))
+                    created_at = edge.get("created_at")
+                    if created_at and (high_water is None or created_at > high_water):
+                        high_water = created_at
+
+            print(f"⏩ Catch-up: {len(added)} edges since {since} in {time.perf_counter() - started:.2f}s")
+            if added:
+                self.apply_edge_delta(added=added)
+            # apply_edge_delta may have fallen back to a full build, which sets its own mark
+            marks = [mark for mark in (self.edges_high_water, high_water) if mark]
+            self.edges_high_water = max(marks) if marks else None
+            return len(added)
+
+    # --- BACKGROUND RECOMPUTE ---
+
+    def start_background_recompute(self, debounce: float = RECOMPUTE_DEBOUNCE):
+        """
+        Move graph/rank recomputation to a background thread (see RecomputeScheduler).
+        """
+        if self.scheduler and self.scheduler.running:
+            return self.scheduler
+        self.scheduler = RecomputeScheduler(self, debounce)
+        self.scheduler.start()
+        print(f"🧵 Background trust recompute started (debounce {debounce}s)")
+        return self.scheduler
+
+    def stop_background_recompute(self):
+        if self.scheduler:
+            self.scheduler.stop()
+
+    def notify_edges(self, added: list = (), removed: list = ()):
+        """
+        Report edge changes. Coalesced in the background when the scheduler runs, applied inline otherwise.
+        A shared-mode follower only signals the leader, which reads the new edges from the DB.
+        """
+        if self.is_shared_follower:
+            self.shared.mark_dirty()
+        elif self.scheduler and self.scheduler.running:
+            self.scheduler.notify(added=added, removed=removed)
+        else:
+            self.apply_edge_delta(added=added, removed=removed)
+
+    def notify_catch_up(self):
+        """
+        Pick up edges written by other processes (see catch_up_edges), in the background if possible.
+        """
+        if self.scheduler and self.scheduler.running:
+            self.scheduler.notify(catch_up=True)
+        else:
+            self.catch_up_edges()
+
+    def start_resolution_queue(self, interval: float = RESOLUTION_INTERVAL):
+        """
+        Move vote-triggered rumor resolution and its write-back off the request path (see ResolutionQueue).
+        """
+        if self.resolution_queue and self.resolution_queue.running:
+            return self.resolution_queue
+        self.resolution_queue = ResolutionQueue(self, interval)
+        self.resolution_queue.start()
+        print(f"🧵 Rumor resolution queue started (interval {interval}s)")
+        return self.resolution_queue
+
+    def stop_resolution_queue(self):
+        if self.resolution_queue:
+            self.resolution_queue.stop()
+
+    def queue_resolution(self, rumor_id: str):
+        """
+        Re-resolve a rumor after a vote. Coalesced in the background when the queue runs, inline otherwise.
+        """
+        if self.resolution_queue and self.resolution_queue.running:
+            self.resolution_queue.notify(rumor_id)
+        else:
+            try:
+                self.resolve_and_save([rumor_id])
+            except RanksUnavailable:
+                print(f"⏳ Trust ranks not ready, rumor {rumor_id} is resolved on its next vote")
+
+    def start_voter_index(self, interval: float = VOTER_RESYNC_INTERVAL):
+        """
+        Load the voter index in the background and keep reloading it (see VoterIndex).
+        """
+        if self.voters is None:
+            self.voters = VoterIndex(self, interval)
+            self.voters.start()
+        return self.voters
+
+    def stop_voter_index(self):
+        if self.voters:
+            self.voters.stop()
+
+    def has_voted(self, rumor_id: str, user_id: str):
+        """
+        Whether the user already voted on the rumor, from memory; None when the index can't tell yet.
+        """
+        return self.voters.has_voted(rumor_id, user_id) if self.voters else None
+
+    def ripple_visible(self, viewer_id: str, author_ids: list, cached_only: bool = False):
+        """
+        For each author, whether the viewer is within RIPPLE_HOPS trust edges of them (Ripple Protocol).
+        One neighborhood lookup for the viewer, then a set-membership test per author.
+        With cached_only, returns None instead of running the BFS when the viewer's set isn't cached,
+        so async callers can move that work off the event loop.
+        """
+        state = self.state
+        index = state.nodes.index
+        viewer = index.get(viewer_id)
+        if viewer is None:
+            return [author_id == viewer_id for author_id in author_ids]
+        neighborhood = self.ripple.cached(viewer) if cached_only else self.ripple.neighborhood(state, viewer)
+        if neighborhood is None:
+            return None
+        authors = np.fromiter((index.get(author_id, -1) for author_id in author_ids), dtype=np.int64,
+                              count=len(author_ids))
+        return self.ripple.contains(neighborhood, authors).tolist()
+
+    def request_rebuild(self):
+        """
+        Ask for a full rebuild. Returns immediately when the scheduler runs, rebuilds inline otherwise.
+        """
+        if self.is_shared_follower:
+            self.shared.mark_dirty()
+        elif self.scheduler and self.scheduler.running:
+            self.scheduler.notify(rebuild=True)
+        else:
+            self.refresh()
+
+    def require_ranks(self) -> TrustState:
+        """
+        Like _ensure_ranks, for paths that persist SP results.
+        An empty graph counts as ranked: everyone then votes with UNRANKED_WEIGHT.
+        Raises: RanksUnavailable while ranks are still being computed (scheduler) or awaited (follower).
+        """
+        state = self._ensure_ranks()
+        if not state.ranked:
+            raise RanksUnavailable("Trust ranks are not computed yet")
+        return state
+
+    def _ensure_ranks(self) -> TrustState:
+        """
+        Current state, making sure ranks exist. Never blocks a request when the scheduler runs.
+        """
+        state = self.state
+        if not state.ranked:
+            if self.is_shared_follower:
+                # Ranks arrive with the leader's next snapshot
+                self.shared.mark_dirty()
+            elif self.scheduler and self.scheduler.running:
+                # One rebuild at a time: callers polling for ranks must not queue a reload each
+                if not self.scheduler.rebuild_pending:
+                    self.request_rebuild()
+            else:
+                self.calculate_trust_ranks()
+                state = self.state
+        return state
+
+    # --- MULTI-WORKER MODE ---
+
+    def start_shared_mode(self, path: str = None, poll: float = SHARED_POLL_INTERVAL) -> str:
+        """
+        Share ranks with the other server processes through the snapshot file (see SharedRanks).
+        Returns: "leader" (compute and publish), "follower" (map the leader's snapshot),
+                 or "standalone" where file locks are unavailable.
+        """
+        if fcntl is None:
+            print("⚠️ Shared trust ranks need POSIX file locks, running standalone")
+            return "standalone"
+        self.snapshot_path = path or self.snapshot_path
+        self.shared = SharedRanks(self, self.snapshot_path, poll)
+        role = self.shared.start()
+        print(f"🤝 Shared trust ranks: this worker is the {role}")
+        return role
+
+    def stop_shared_mode(self):
+        if self.shared:
+            self.shared.stop()
+
+    @property
+    def is_shared_leader(self) -> bool:
+        return self.shared is not None and self.shared.role == "leader"
+
+    @property
+    def is_shared_follower(self) -> bool:
+        return self.shared is not None and self.shared.role == "follower"
+
+    def metrics(self) -> dict:
+        state = self.state
+        nodes, edges = state.size()
+        metrics = {
+            "version": state.version,
+            "nodes": nodes,
+            "edges": edges,
+            "ranked_users": len(state.ranks),
+            # How long readers have been served this exact state
+            "state_age_seconds": round(time.time() - state.computed_at, 3),
+        }
+        if self.scheduler:
+            metrics.update(self.scheduler.metrics())
+        if self.shared:
+            metrics.update(self.shared.metrics())
+        if self.resolution_queue:
+            metrics.update(self.resolution_queue.metrics())
+        if self.voters:
+            metrics.update(self.voters.metrics())
+        metrics.update(self.ripple.metrics())
+        metrics.update({
+            "sp_tallies": len(self.tallies),
+            "sp_tally_hits": self.tally_hits,
+            "sp_tally_loads": self.tally_loads,
+            "sp_tally_rederives": self.tally_rederives,
+            "sp_tally_resyncs": self.tally_resyncs,
+            "graph_payload_hits": self.graph_payload_hits,
+            "graph_payload_builds": self.graph_payload_builds,
+            "graph_view_builds": self.graph_view_builds,
+            "last_graph_payload_ms": round(self.last_graph_payload_ms, 1) if self.last_graph_payload_ms is not None else None,
+            "graph_delta_fallbacks": self.graph_delta_fallbacks,
+        })
+        metrics.update(self.changelog.metrics())
+        return metrics
+
+    # --- SNAPSHOTS ---
+
+    def save_snapshot(self, path: str = None):
+        """
+        Persist graph, ranks, genesis flags, seeds and the edge high-water mark (see write_snapshot).
+        Followers never write: the file belongs to the leader. An empty graph is only saved once it
+        has been ranked, so followers learn that there is nothing to wait for.
+        """
+        state = self.state
+        if self.is_shared_follower or (state.size()[0] == 0 and not state.ranked):
+            return False
+        path = path or self.snapshot_path
+        started = time.perf_counter()
+        table = state.nodes
+        n = len(table)
+        uuids = np.array(table.uuids[:n], dtype="S") if n else np.zeros(0, dtype="S1")
+        rank = np.full(n, np.nan)
+        current = state.ranks.rank[:n]
+        rank[:len(current)] = current
+        src, dst = state.edges()
+        meta = {
+            "version": state.version,
+            "table_token": table.token,
+            "edges_high_water": self.edges_high_water,
+            "seeds": self.seeds,
+            "saved_at": time.time(),
+        }
+        write_snapshot(path, uuids, rank, table.genesis[:n], src, dst, meta)
+        print(f"💾 Trust snapshot saved: {n} nodes, {len(src)} edges in {time.perf_counter() - started:.2f}s")
+        return True
+
+    def load_snapshot(self, path: str = None, max_age: float = SNAPSHOT_MAX_AGE):
+        """
+        Restore graph and ranks from a snapshot instead of refetching every edge and rerunning PPR.
+        Ranks and edges stay zero-copy views over the mmap'd file; the DiGraph is only built on demand.
+        If the snapshot extends the id space already loaded, new users are appended in place.
+
+        Returns: True if loaded; False if missing, stale or unreadable (caller should do a full build).
+        """
+        path = path or self.snapshot_path
+        started = time.perf_counter()
+        try:
+            snapshot = read_snapshot(path)
+        except FileNotFoundError:
+            print(f"📭 No trust snapshot at {path}")
+            return False
+        except (ValueError, OSError) as e:
+            print(f"⚠️ Ignoring unreadable trust snapshot {path}: {e}")
+            return False
+
+        meta = snapshot["meta"]
+        age = time.time() - meta.get("saved_at", 0)
+        if age > max_age:
+            print(f"⚠️ Trust snapshot is {age / 3600:.1f}h old, ignoring it")
+            return False
+
+        uuids = snapshot["uuids"]
+        src, dst = snapshot["src"], snapshot["dst"]
+
+        with self._write_lock:
+            table = self.nodes
+            n = len(table)
+            # Same id space (same leader) and nothing renumbered: only intern the new tail
+            if meta.get("table_token") == table.token and len(uuids) >= n and (n == 0 or uuids[n - 1].decode("ascii") == table.uuids[n - 1]):
+                for uuid in uuids[n:].tolist():
+                    table.intern(uuid.decode("ascii"))
+            else:
+                table = NodeTable(capacity=max(1024, 2 * len(uuids)))
+                table.uuids = [uuid.decode("ascii") for uuid in uuids.tolist()]
+                table.index = dict(zip(table.uuids, range(len(table.uuids))))
+                table.token = meta.get("table_token") or table.token
+            genesis = np.zeros(max(len(table.genesis), len(uuids)), dtype=bool)
+            genesis[:len(uuids)] = snapshot["genesis"]
+            table.genesis = genesis
+
+            # Same id space (a follower's next load): log the edges that changed so since= keeps working
+            edge_delta = None
+            if table is self.nodes and self.state.size()[1] > 0:
+                edge_delta = _edge_diff(self.state.edges(), (src, dst))
+            self._publish(edges=(src, dst), rank=snapshot["rank"], nodes=table, degrees=_degrees(src, dst, len(table)),
+                          version=meta.get("version"), edge_delta=edge_delta)
+            self.seeds = meta.get("seeds")
+            self.edges_high_water = meta.get("edges_high_water")
+        print(f"📦 Trust snapshot loaded: {len(uuids)} nodes, {len(src)} edges in {time.perf_counter() - started:.2f}s")
+        return True
+
     def resolve_rumor(self, rumor_id: str, votes: list = None):
         """
         Implement the Surprisingly Popular (SP) algorithm.
         
         Args:
             rumor_id: The ID of the rumor to resolve.
-            votes: Optional list of votes. If None, fetches from DB.
+            votes: Optional list of votes. If None, uses the rumor's running tally (see record_vote).
         
         Returns: dict with prediction results and scores.
         """
-        # 1. Fetch votes if not provided
+        # 1. Without explicit votes, read the rumor's running sums (loaded from the DB once)
         if votes is None:
-            # Fix for "Deleted Rumor" bug: Ensure we are NOT fetching votes for shadowbanned/deleted rumors
-            # However, typically we are resolving a specific rumor_id.
-            # The bug description "deleted rumors affecting trust scores" implies cross-contamination.
-            # By strictly querying `eq("rumor_id", rumor_id)`, we isolate this calculation.
-            # If the bug was about *user reputation* from deleted rumors, we would handle that in user scoring.
-            # Here, we just ensure we operate on clean data for this specific rumor.
-            response = supabase.table("votes").select("*").eq("rumor_id", rumor_id).execute()
-            votes = response.data
-
-        if len(votes) < 3: # Minimum threshold to attempt math
-            return {
-                "status": "pending",
-                "message": "Not enough votes to determine truth (need min 3)",
-                "verified_result": None,
-                "trust_score": 0.0,
-                "stats": {"total": len(votes)}
-            }
+            return self._resolve_tally(rumor_id)
 
-        # 2. Ensure Trust Ranks are available
-        if not self.trust_ranks:
-            self.calculate_trust_ranks()
+        # 2. Weighted SP math, shared with the batch path (a batch of one rumor)
+        return self._resolve_groups(np.zeros(len(votes), dtype=np.int64), votes, 1)[0]
 
-        # 3. Calculate Weighted Probabilities
-        weighted_true = 0.0
-        weighted_false = 0.0
-        sum_predictions = 0.0
-        
-        # Track effective total weight to normalize
-        total_weight = 0.0
+    def record_vote(self, rumor_id: str, vote: dict):
+        """
+        Fold a just-inserted vote into the rumor's running tally in O(1), and into the voter index.
+        Votes inserted by other processes are reconciled in bulk by resolve_and_save.
 
-        for vote in votes:
-            user_id = vote["user_id"]
-            user_vote = vote["vote"] # Boolean: True/False
-            user_prediction = vote["prediction"] # Float: 0.0 to 1.0
-            
-            # Get user's trust weight (PageRank)
-            # Default to a minimal epsilon if user is new/disconnected, preventing divide-by-zero
-            weight = self.trust_ranks.get(user_id, 0.0000001)
-            
-            if user_vote:
-                weighted_true += weight
-            else:
-                weighted_false += weight
-            
-            total_weight += weight
-            sum_predictions += user_prediction
+        Args:
+            vote: The vote row (user_id, vote, prediction).
+        """
+        with self._tally_lock:
+            tally = self.tallies.get(rumor_id)
+            if tally is not None:
+                tally.add(vote["user_id"], vote["vote"], vote["prediction"])
+        if self.voters:
+            self.voters.add(rumor_id, vote["user_id"])
 
-        # 4. The Math (SP Logic)
-        
-        # P(True | Vote): The "Popular" vote (weighted by Trust)
-        actual_vote_prob = weighted_true / total_weight if total_weight > 0 else 0.5
-        
-        # P(True | Prediction): The "Expected" vote
-        # We average the predictions of the crowd
-        avg_predicted_prob = sum_predictions / len(votes) if votes else 0.5
-        
-        # Information Gain / Delta
-        delta = actual_vote_prob - avg_predicted_prob
-        
-        # Classification
-        # If More people voted True than was predicted -> TRUE
-        # If Fewer people voted True than was predicted -> FALSE
-        
-        # TIERED VERIFICATION LOGIC
-        # 1. Determine Tier based on Vote Count
-        vote_count = len(votes)
-        
-        # Tier Definition:
-        # Tier 1 (Circle): < 20 votes. Needs High Consensus.
-        # Tier 2 (Neighbor): 20-50 votes. Needs Medium Consensus.
-        # Tier 3 (Global): > 50 votes. Standard SP.
-        
-        tier = "CIRCLE"
-        min_votes_required = 5
-        
-        if vote_count >= 50:
-            tier = "GLOBAL"
-            min_votes_required = 50
-        elif vote_count >= 20:
-            tier = "NEIGHBOR"
-            min_votes_required = 20
-            
-        # 2. Check Min Votes
-        if vote_count < min_votes_required:
-             return {
-                "status": "pending",
-                "message": f"Need {min_votes_required - vote_count} more votes for {tier} verification",
-                "verified_result": None,
-                "trust_score": 0.0,
-                "stats": {"total": vote_count, "tier": tier}
-            }
-
-        if delta > THRESHOLD:
-            result = True
-            status = "verified"
-        elif delta < -THRESHOLD:
-            result = False
-            status = "disputed"
+    def fetch_vote_counts(self, rumor_ids: list) -> dict:
+        """
+        {rumor_id: rumors.vote_count} (kept by the trg_update_vote_count trigger), in bulk.
+        """
+        counts = {}
+        for i in range(0, len(rumor_ids), RUMOR_ID_CHUNK):
+            rows = supabase.table("rumors").select("id,vote_count").in_("id", rumor_ids[i:i + RUMOR_ID_CHUNK]).execute().data
+            counts.update((row["id"], row.get("vote_count")) for row in rows)
+        return counts
+
+    def _load_tallies(self, rumor_ids: list) -> dict:
+        """
+        Fetch the votes of `rumor_ids` in bulk and start a running tally for each rumor.
+        """
+        # Fix for "Deleted Rumor" bug: Ensure we are NOT fetching votes for shadowbanned/deleted rumors
+        # However, typically we are resolving a specific rumor_id.
+        # The bug description "deleted rumors affecting trust scores" implies cross-contamination.
+        # By strictly filtering on the requested rumor ids, we isolate this calculation.
+        # If the bug was about *user reputation* from deleted rumors, we would handle that in user scoring.
+        # Here, we just ensure we operate on clean data for these specific rumors.
+        rows_by_rumor = {rumor_id: [] for rumor_id in rumor_ids}
+        for rows in self.iter_vote_pages(list(rows_by_rumor)):
+            for row in rows:
+                rows_by_rumor[row["rumor_id"]].append(row)
+
+        ranks = self.state.ranks
+        tallies = {rumor_id: RumorTally(rows, ranks) for rumor_id, rows in rows_by_rumor.items()}
+        with self._tally_lock:
+            self.tally_loads += len(tallies)
+            self.tallies.update(tallies)
+            while len(self.tallies) > SP_TALLY_CAPACITY:
+                self.tallies.popitem(last=False)
+        return tallies
+
+    def _resolve_tally(self, rumor_id: str) -> dict:
+        with self._tally_lock:
+            tally = self.tallies.get(rumor_id)
+            if tally is not None:
+                self.tallies.move_to_end(rumor_id)
+                self.tally_hits += 1
+
+        if tally is None:
+            tally = self._load_tallies([rumor_id])[rumor_id]
+
+        if tally.count >= 3:
+            # Ranks changed since the sums were taken: re-derive once for this rank version
+            state = self._ensure_ranks()
+            with self._tally_lock:
+                if tally.ranks is not state.ranks:
+                    tally.derive(state.ranks)
+                    self.tally_rederives += 1
+        with self._tally_lock:
+            return tally.result()
+
+    def resolve_and_save(self, rumor_ids: list) -> int:
+        """
+        Resolve `rumor_ids` from their running tallies (votes of untracked rumors are fetched
+        in one bulk scan) and write status + trust_score back in bulk.
+        Returns: number of rumors whose stored values changed.
+        Raises: RanksUnavailable before touching anything if there are no ranks to weigh votes with yet.
+        """
+        self.require_ranks()
+        # A tally whose count disagrees with the DB missed votes from another process
+        # (or raced with its own load): drop it so it is reloaded below
+        counts = self.fetch_vote_counts(rumor_ids)
+        with self._tally_lock:
+            for rumor_id, count in counts.items():
+                tally = self.tallies.get(rumor_id)
+                if tally is not None and count is not None and tally.count != count:
+                    del self.tallies[rumor_id]
+                    self.tally_resyncs += 1
+            missing = [rumor_id for rumor_id in rumor_ids if rumor_id not in self.tallies]
+        if missing:
+            self._load_tallies(missing)
+        results = {rumor_id: self.resolve_rumor(rumor_id) for rumor_id in rumor_ids}
+        return self.save_resolutions(results)
+
+    def iter_vote_pages(self, rumor_ids: list = None, page_size: int = VOTE_PAGE_SIZE,
+                        columns: str = "id,rumor_id,user_id,vote,prediction"):
+        """
+        Stream votes, optionally only those on `rumor_ids`, with keyset pagination on the votes primary key.
+
+        Yields: one list of vote rows per page.
+        """
+        if rumor_ids is None:
+            chunks = [None]
         else:
-            result = None
-            status = "uncertain"
-            
-        # Trust Score calculation
-        # This is the "confidence" in our result.
-        # Combines magnitude of Delta + Volume of votes (saturating at 20 votes)
-        volume_factor = min(1.0, len(votes) / 20.0)
-        confidence = min(1.0, abs(delta) * 5) # Scale delta so 0.2 gap = 100% confidence
-        trust_score = confidence * volume_factor
+            chunks = [rumor_ids[i:i + RUMOR_ID_CHUNK] for i in range(0, len(rumor_ids), RUMOR_ID_CHUNK)]
+        for chunk in chunks:
+            last = None
+            while True:
+                query = supabase.table("votes").select(columns)
+                if chunk is not None:
+                    query = query.in_("rumor_id", chunk)
+                if last:
+                    query = query.gt("id", last)
+                rows = query.order("id").limit(page_size).execute().data
+                if not rows:
+                    break
+                yield rows
+                last = rows[-1]["id"]
 
-        return {
-            "status": status,
-            "verified_result": result,
-            "trust_score": round(trust_score, 4),
-            "stats": {
-                "total_votes": len(votes),
-                "weighted_true_pct": round(actual_vote_prob, 4),
-                "avg_predicted_pct": round(avg_predicted_prob, 4),
-                "delta": round(delta, 4)
-            }
-        }
+    def resolve_rumors(self, rumor_ids: list = None, votes: list = None) -> dict:
+        """
+        Batch Surprisingly Popular resolution: votes for many rumors are fetched in bulk and
+        the sums, delta, tier and trust_score are computed with grouped NumPy operations.
+        Each result is identical to resolve_rumor on the same rumor.
 
-    # ... (existing methods)
+        Args:
+            rumor_ids: Rumors to resolve. None resolves every rumor that has votes.
+            votes: Optional vote rows (with rumor_id). If None, streamed from the DB.
 
-    def get_graph_visual_data(self):
+        Returns: {rumor_id: result dict}.
         """
-        Returns JSON structure for React Force Graph 2D.
-        Nodes: {id, type (GENESIS/HIGH_TRUST/LOW_TRUST), val (trust_score)}
-        Links: {source, target}
+        started = time.perf_counter()
+        if votes is None:
+            votes = [vote for rows in self.iter_vote_pages(rumor_ids) for vote in rows]
+
+        if rumor_ids is None:
+            index = {}
+            for vote in votes:
+                index.setdefault(vote["rumor_id"], len(index))
+        else:
+            index = {rumor_id: i for i, rumor_id in enumerate(dict.fromkeys(rumor_ids))}
+            votes = [vote for vote in votes if vote["rumor_id"] in index]
+
+        groups = np.fromiter((index[vote["rumor_id"]] for vote in votes), dtype=np.int64, count=len(votes))
+        results = dict(zip(index, self._resolve_groups(groups, votes, len(index))))
+        print(f"🧮 Resolved {len(results)} rumors from {len(votes)} votes in {time.perf_counter() - started:.2f}s")
+        return results
+
+    def _resolve_groups(self, groups: np.ndarray, votes: list, n: int) -> list:
         """
-        if not self.graph:
-            self.build_trust_graph()
-        
-        if not self.trust_ranks:
-            self.calculate_trust_ranks()
+        SP results for `n` rumors; groups[i] is the rumor index of votes[i].
+        """
+        count = np.bincount(groups, minlength=n)
+        if not (count >= 3).any():
+            # Nothing to weigh: skip the trust ranks entirely
+            zeros = np.zeros(n)
+            return sp_results(zeros, zeros, zeros, count)
+
+        # Ensure Trust Ranks are available (one published state for the whole calculation)
+        state = self._ensure_ranks()
+
+        # Get each voter's trust weight (PageRank) in one vectorized lookup over interned ids.
+        # Default to a minimal epsilon if user is new/disconnected, preventing divide-by-zero
+        voters = state.nodes.lookup([vote["user_id"] for vote in votes])
+        weights = state.ranks.weights(voters, default=UNRANKED_WEIGHT)
+        user_votes = np.fromiter((bool(vote["vote"]) for vote in votes), dtype=bool, count=len(votes))
+        predictions = np.fromiter((vote["prediction"] for vote in votes), dtype=np.float64, count=len(votes))
+        return sp_results(*sp_totals(groups, weights, user_votes, predictions, n))
 
-        # Dynamically fetch Genesis users from database
-        # Genesis users are those with invited_by=NULL (no inviter) or username='genesis'
+    def save_resolutions(self, results: dict, chunk_size: int = 500) -> int:
+        """
+        Write SP status + trust_score back to the rumors table in bulk
+        (apply_rumor_resolutions RPC, see migration_resolution.sql).
+
+        Returns: number of rumors whose stored values changed.
+        """
+        updates = [{"id": rumor_id, "status": result["status"], "trust_score": result["trust_score"]}
+                   for rumor_id, result in results.items()]
+        changed = 0
+        for i in range(0, len(updates), chunk_size):
+            response = supabase.rpc("apply_rumor_resolutions", {"updates": updates[i:i + chunk_size]}).execute()
+            changed += response.data or 0
+        return changed
+
+    # ... (existing methods)
+
+    def fetch_genesis_ids(self) -> set:
+        """
+        Genesis users: those with invited_by=NULL (no inviter) or username='genesis'.
+        """
         genesis_ids = set()
         try:
             # Fetch users with no inviter (genesis users)
             response = supabase.table("users").select("id").is_("invited_by", "null").execute()
             genesis_ids.update([user["id"] for user in response.data])
-            
+
             # Also fetch user named 'genesis' explicitly
             genesis_user = supabase.table("users").select("id").eq("username", "genesis").execute()
             if genesis_user.data:
                 genesis_ids.update([user["id"] for user in genesis_user.data])
-            
-            print(f"🌟 Found {len(genesis_ids)} genesis users: {genesis_ids}")
+
+            print(f"🌟 Found {len(genesis_ids)} genesis users")
         except Exception as e:
             print(f"⚠️ Error fetching genesis users: {e}")
-            genesis_ids = set()
+        return genesis_ids
 
-        nodes = []
+    def _visual_state(self) -> TrustState:
+        """
+        Current state with ranks, genesis flags refreshed once per version.
+        """
+        if self.state.size()[0] == 0:
+            self.request_rebuild()
+        state = self._ensure_ranks()
+        if self._genesis_version != state.version:
+            state.nodes.set_genesis(self.fetch_genesis_ids())
+            self._genesis_version = state.version
+        return state
 
-        # 1. Build Nodes
-        for node_id in self.graph.nodes():
-            score = self.trust_ranks.get(node_id, 0.0)
-            
-            node_type = "LOW_TRUST"
-            if node_id in genesis_ids:
-                node_type = "GENESIS"
-            elif score > 0.0005: 
-                node_type = "HIGH_TRUST"
-            
-            nodes.append({
-                "id": node_id,
-                "type": node_type,
-                "val": score
-            })
+    def _genesis_nodes(self, state: TrustState) -> np.ndarray:
+        genesis = state.nodes.genesis
+        n = len(state.degrees()[0])
+        return np.flatnonzero(genesis[:n])
+
+    def top_nodes(self, state: TrustState, limit: int) -> np.ndarray:
+        """
+        The `limit` highest-ranked nodes, read off the state's rank order.
+        """
+        return state.rank_order()[0][:limit]
+
+    def neighborhood_nodes(self, state: TrustState, user_id: str, hops: int, limit: int) -> np.ndarray:
+        """
+        Nodes within `hops` trust edges of the user, breadth first. When a hop would pass `limit`,
+        its highest-ranked nodes are kept. Cost follows the size of the neighborhood, not the graph.
+
+        Raises: UnknownUser if the user has no edges.
+        """
+        indptr, indices = state.adjacency()
+        node = state.nodes.index.get(user_id)
+        if node is None or node >= len(indptr) - 1 or indptr[node] == indptr[node + 1]:
+            raise UnknownUser(user_id)
+        seen = np.array([node], dtype=np.int64)
+        frontier = seen
+        for _ in range(hops):
+            if len(frontier) == 0 or len(seen) >= limit:
+                break
+            _, reached = csr_slices(indptr, indices, frontier)
+            frontier = np.setdiff1d(reached, seen)
+            room = limit - len(seen)
+            if len(frontier) > room:
+                scores = state.ranks.weights(frontier, default=0.0)
+                frontier = np.sort(frontier[np.lexsort((frontier, -scores))[:room]])
+            seen = np.union1d(seen, frontier)
+        return seen
+
+    def sample_nodes(self, state: TrustState, limit: int) -> np.ndarray:
+        """
+        Stratified sample: every genesis node, then high-trust nodes by rank, then a uniform sample
+        of the low-trust rest. Seeded by the version, so a version always yields the same sample.
+        """
+        ids, scores = state.rank_order()
+        high = int(np.count_nonzero(scores > HIGH_TRUST_SCORE))  # high-trust nodes lead the rank order
+        genesis = self._genesis_nodes(state)[:limit]
+        # Genesis nodes are usually high-trust too: skip them so their slots go to the next ranks
+        ranked = ids[:high]
+        picked = np.union1d(genesis, ranked[~np.isin(ranked, genesis)][:limit - len(genesis)])
+        room = limit - len(picked)
+        if room > 0 and len(ids) > high:
+            # O(room) draws from the low-trust tail; extra draws cover genesis nodes found there
+            draws = random.Random(state.version).sample(range(high, len(ids)), min(room + len(genesis), len(ids) - high))
+            rest = ids[draws]
+            picked = np.union1d(picked, rest[~np.isin(rest, picked)][:room])
+        return picked
+
+    def _visual_arrays(self, state: TrustState, ids: np.ndarray = None):
+        """
+        Columns of the visualization: node ids, type codes (index into GRAPH_NODE_TYPES),
+        scores, and each link's endpoints as positions in the node list.
+        `ids` (sorted) restricts it to the subgraph induced by those nodes.
+        """
+        if ids is None:
+            out_degree, in_degree = state.degrees()
+            ids = np.flatnonzero(out_degree + in_degree)
+            src, dst = state.edges()
+        else:
+            src, dst = csr_slices(*state.adjacency(), ids)
+            if len(ids):
+                inside = ids[np.minimum(np.searchsorted(ids, dst), len(ids) - 1)] == dst
+                src, dst = src[inside], dst[inside]
+        types, scores = self._node_columns(state, ids)
+        return ids, types, scores, np.searchsorted(ids, src), np.searchsorted(ids, dst)
+
+    def _node_columns(self, state: TrustState, ids: np.ndarray):
+        scores = state.ranks.weights(ids, default=0.0)
+        genesis = state.nodes.genesis
+        is_genesis = np.zeros(len(ids), dtype=bool)
+        known = ids < len(genesis)
+        is_genesis[known] = genesis[ids[known]]
+        types = np.where(is_genesis, 0, np.where(scores > HIGH_TRUST_SCORE, 1, 2)).astype(np.uint8)
+        return types, scores
 
-        # 2. Build Links
-        links = [{"source": u, "target": v} for u, v in self.graph.edges()]
+    def _node_records(self, state: TrustState, ids: np.ndarray) -> list:
+        types, scores = self._node_columns(state, ids)
+        uuids = state.nodes.uuids
+        return [
+            {"id": uuids[node], "type": GRAPH_NODE_TYPES[node_type], "val": score}
+            for node, node_type, score in zip(ids.tolist(), types.tolist(), scores.tolist())
+        ]
 
-        print(f"📊 Returning graph data: {len(nodes)} nodes, {len(links)} links")
-        return {"nodes": nodes, "links": links}
+    def graph_delta(self, state: TrustState, since: int):
+        """
+        What changed between version `since` and `state`, from the changelog:
+        nodes added (first edge), updated (score moved) and removed (last edge gone), links added and removed.
+        Returns: None if the changelog no longer reaches back to `since`.
+        """
+        entries = self.changelog.since(since, state.version)
+        if entries is None:
+            return None
+        # Net edge changes, in publish order (apply_edge_delta adds before it removes)
+        added, removed = set(), set()
+        changed = [np.zeros(0, dtype=np.int32)]
+        for _, (added_src, added_dst), (removed_src, removed_dst), ids in entries:
+            for edge in zip(added_src.tolist(), added_dst.tolist()):
+                if edge in removed:
+                    removed.discard(edge)
+                else:
+                    added.add(edge)
+            for edge in zip(removed_src.tolist(), removed_dst.tolist()):
+                if edge in added:
+                    added.discard(edge)
+                else:
+                    removed.add(edge)
+            changed.append(ids)
+
+        # Degree at `since` = degree now - net added + net removed, for the nodes those edges touch
+        out_degree, in_degree = state.degrees()
+        delta = {}
+        for edges, sign in ((added, -1), (removed, 1)):
+            for edge in edges:
+                for node in edge:
+                    delta[node] = delta.get(node, 0) + sign
+        touched = np.array(sorted(delta), dtype=np.int64)
+        now = np.zeros(len(touched), dtype=np.int64)
+        inside = touched < len(out_degree)
+        now[inside] = out_degree[touched[inside]] + in_degree[touched[inside]]
+        before = now + np.array([delta[node] for node in touched.tolist()], dtype=np.int64)
+        new_nodes = touched[(before == 0) & (now > 0)]
+        gone_nodes = touched[(before > 0) & (now == 0)]
+
+        present = np.unique(np.concatenate(changed)).astype(np.int64)
+        present = present[present < len(out_degree)]
+        present = present[(out_degree[present] + in_degree[present] > 0) & ~np.isin(present, new_nodes)]
+
+        uuids = state.nodes.uuids
+        return {
+            "version": state.version,
+            "since": since,
+            "nodes": {
+                "added": self._node_records(state, new_nodes),
+                "updated": self._node_records(state, present),
+                "removed": [uuids[node] for node in gone_nodes.tolist()],
+            },
+            "links": {
+                "added": [{"source": uuids[u], "target": uuids[v]} for u, v in sorted(added)],
+                "removed": [{"source": uuids[u], "target": uuids[v]} for u, v in sorted(removed)],
+            },
+        }
+
+    def get_graph_visual_data(self):
+        """
+        Returns JSON structure for React Force Graph 2D.
+        Nodes: {id, type (GENESIS/HIGH_TRUST/LOW_TRUST), val (trust_score)}
+        Links: {source, target}
+        """
+        state = self._visual_state()
+        return self._visual_json(state, *self._visual_arrays(state))
+
+    def _visual_json(self, state: TrustState, ids, types, scores, sources, targets) -> dict:
+        uuids = state.nodes.uuids
+        node_uuids = [uuids[node] for node in ids.tolist()]
+        nodes = [
+            {"id": uuid, "type": GRAPH_NODE_TYPES[node_type], "val": score}
+            for uuid, node_type, score in zip(node_uuids, types.tolist(), scores.tolist())
+        ]
+        links = [{"source": node_uuids[u], "target": node_uuids[v]} for u, v in zip(sources.tolist(), targets.tolist())]
+        return {"version": state.version, "nodes": nodes, "links": links}
+
+    def _visual_compact(self, state: TrustState, ids, types, scores, sources, targets) -> dict:
+        def column(values, dtype):
+            return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode("ascii")
+
+        uuids = state.nodes.uuids
+        return {
+            "version": state.version,
+            "format": "compact",
+            "ids": [uuids[node] for node in ids.tolist()],
+            "types": list(GRAPH_NODE_TYPES),
+            # Base64 little-endian typed arrays: node columns are parallel to ids, links index into ids
+            "type": column(types, "u1"),
+            "val": column(scores, "<f4"),
+            "source": column(sources, "<i4"),
+            "target": column(targets, "<i4"),
+        }
+
+    def _cached_payload(self, key: tuple, state: TrustState) -> GraphPayload:
+        payload = self._graph_payloads.get(key)
+        if payload is not None and payload.version == state.version:
+            self.graph_payload_hits += 1
+            return payload
+        return None
+
+    def _store_payload(self, key: tuple, state: TrustState, tag: str, data: dict) -> GraphPayload:
+        body = json.dumps(data, separators=(",", ":")).encode()
+        # Weak: workers sharing a leader's version may order keys or floats differently
+        payload = GraphPayload(state.version, f'W/"{state.nodes.token}-{state.version}-{tag}"', body)
+        with self._graph_payloads_lock:
+            self._graph_payloads[key] = payload
+            self._graph_payloads.move_to_end(key)
+            while len(self._graph_payloads) > GRAPH_PAYLOAD_CACHE:
+                self._graph_payloads.popitem(last=False)
+        return payload
+
+    def graph_delta_payload(self, since: int) -> GraphPayload:
+        """
+        Serialized graph_delta() from version `since` to the current one (JSON only), or the full
+        JSON payload when the changelog was truncated past `since` or restarted by a rebuild
+        (a follower's snapshot reloads are logged as deltas, see load_snapshot).
+        """
+        state = self._visual_state()
+        key = ("delta", since)
+        payload = self._cached_payload(key, state)
+        if payload is not None:
+            return payload
+        data = self.graph_delta(state, since)
+        if data is None:
+            self.graph_delta_fallbacks += 1
+            return self.graph_payload("json")
+        return self._store_payload(key, state, f"since-{since}", data)
+
+    def _view_nodes(self, state: TrustState, view: tuple) -> np.ndarray:
+        mode, *args = view
+        if mode == "top":
+            return np.sort(self.top_nodes(state, *args))
+        if mode == "neighborhood":
+            return self.neighborhood_nodes(state, *args)
+        if mode == "sample":
+            return self.sample_nodes(state, *args)
+        raise ValueError(f"Unknown graph view {mode!r}")
+
+    def graph_payload(self, fmt: str = "json", view: tuple = None) -> GraphPayload:
+        """
+        The visualization for the current graph version, serialized once per version, format and view.
+        view: None for the whole graph, or a level-of-detail subgraph served from the state's indexes:
+              ("top", limit), ("neighborhood", user_id, hops, limit) or ("sample", limit).
+
+        Raises: UnknownUser for a neighborhood around a user without edges.
+        """
+        if fmt not in GRAPH_FORMATS:
+            raise ValueError(f"Unknown graph format {fmt!r}")
+        state = self._visual_state()
+        key = (fmt, view)
+        payload = self._cached_payload(key, state)
+        if payload is not None:
+            return payload
+
+        # Views are small; only whole-graph builds are worth making other requests wait for
+        with self._graph_payload_lock if view is None else nullcontext():
+            # Another request may have built it while we waited
+            payload = self._cached_payload(key, state)
+            if payload is not None:
+                return payload
+            started = time.perf_counter()
+            arrays = self._visual_arrays(state, None if view is None else self._view_nodes(state, view))
+            build = self._visual_compact if fmt == "compact" else self._visual_json
+            data = build(state, *arrays)
+            if view is not None:
+                data["mode"] = view[0]
+            tag = "full" if view is None else hashlib.blake2b(repr(view).encode(), digest_size=8).hexdigest()
+            payload = self._store_payload(key, state, f"{fmt}-{tag}", data)
+            if view is None:
+                self.graph_payload_builds += 1
+                self.last_graph_payload_ms = (time.perf_counter() - started) * 1000
+                print(f"📊 Graph payload v{state.version} ({fmt}): {len(arrays[0])} nodes, {len(arrays[3])} links, "
+                      f"{len(payload.body)} bytes in {self.last_graph_payload_ms:.0f}ms")
+            else:
+                self.graph_view_builds += 1
+            return payload
 
 # Global Instance
 engine = TrustEngine()
@@ -15,6 +15,8 @@ interface CommentsSectionProps {
 
 export function CommentsSection({ rumorId, defaultOpen = false }: CommentsSectionProps) {
     const [comments, setComments] = useState<Comment[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [total, setTotal] = useState(0);
     const [newComment, setNewComment] = useState('');
     const [loading, setLoading] = useState(false);
     const [isOpen, setIsOpen] = useState(defaultOpen);
@@ -25,11 +27,14 @@ export function CommentsSection({ rumorId, defaultOpen = false }: CommentsSectio
         }
     }, [isOpen, rumorId]);
 
-    const loadComments = async () => {
+    // cursor: append the next page of threads; none: reload from the first page
+    const loadComments = async (cursor?: string | null) => {
         setLoading(true);
         try {
-            const data = await api.getComments(rumorId);
-            if (data.comments) setComments(data.comments);
+            const data = await api.getComments(rumorId, { cursor });
+            if (data.comments) setComments(prev => cursor ? [...prev, ...data.comments] : data.comments);
+            setNextCursor(data.next_cursor ?? null);
+            if (data.total !== undefined) setTotal(data.total);
         } catch (e) {
             console.error(e);
         } finally {
@@ -53,6 +58,7 @@ export function CommentsSection({ rumorId, defaultOpen = false }: CommentsSectio
         };
 
         setComments([...comments, optimisticComment]);
+        setTotal(total + 1);
         setNewComment('');
 
         try {
@@ -62,6 +68,7 @@ export function CommentsSection({ rumorId, defaultOpen = false }: CommentsSectio
             console.error("Failed to post", e);
             // Revert if failed
             setComments(prev => prev.filter(c => c.id !== tempId));
+            setTotal(prev => prev - 1);
         }
     };
 
@@ -75,7 +82,7 @@ export function CommentsSection({ rumorId, defaultOpen = false }: CommentsSectio
             >
                 <div className="flex items-center gap-2">
                     <MessageSquare size={14} />
-                    {comments.length > 0 ? `${comments.length} Comments` : 'Join the discussion'}
+                    {total > 0 ? `${total} Comments` : 'Join the discussion'}
                 </div>
                 <motion.div animate={{ rotate: isOpen ? 180 : 0 }}>
                     <ChevronDown size={14} />
@@ -102,38 +109,18 @@ export function CommentsSection({ rumorId, defaultOpen = false }: CommentsSectio
                                 )}
 
                                 {comments.map((comment, i) => (
-                                    <motion.div
-                                        key={comment.id}
-                                        initial={{ x: -10, opacity: 0 }}
-                                        animate={{ x: 0, opacity: 1 }}
-                                        transition={{ delay: i * 0.05 }}
-                                        className="bg-white/5 rounded-lg p-3 border border-white/5"
-                                    >
-                                        <div className="flex items-center justify-between mb-2">
-                                            <div className="flex items-center gap-2">
-                                                <div className="w-5 h-5 rounded-full bg-gradient-to-br from-blue-500/20 to-blue-500/20 flex items-center justify-center border border-white/10">
-                                                    <User size={10} className="text-muted-foreground" />
-                                                </div>
-                                                <span className="text-xs font-bold text-gray-200">
-                                                    {comment.users?.username || 'Anon'}
-                                                </span>
-                                                {/* Trust Score Mini Badge */}
-                                                {comment.users && (
-                                                    <span className={`text-[10px] px-1.5 py-0.5 rounded-full ${comment.users.trust_score >= 0.7 ? 'bg-blue-500/10 text-blue-400' : 'bg-red-500/10 text-red-400'
-                                                        }`}>
-                                                        {Math.round(comment.users.trust_score * 100)}% Trust
-                                                    </span>
-                                                )}
-                                            </div>
-                                            <span className="text-[10px] text-muted-foreground">
-                                                {formatTimeAgo(comment.created_at)}
-                                            </span>
-                                        </div>
-                                        <p className="text-sm text-gray-300 leading-relaxed pl-7">
-                                            {comment.content}
-                                        </p>
-                                    </motion.div>
+                                    <CommentItem key={comment.id} comment={comment} rumorId={rumorId} index={i} />
                                 ))}
+
+                                {nextCursor && (
+                                    <button
+                                        onClick={() => loadComments(nextCursor)}
+                                        disabled={loading}
+                                        className="w-full text-xs text-muted-foreground hover:text-foreground py-2 transition disabled:opacity-50"
+                                    >
+                                        Load more comments
+                                    </button>
+                                )}
                             </div>
 
                             {/* Input */}
@@ -161,3 +148,89 @@ export function CommentsSection({ rumorId, defaultOpen = false }: CommentsSectio
         </div>
     );
 }
+
+interface CommentItemProps {
+    comment: Comment;
+    rumorId: string;
+    index: number;
+}
+
+// One comment and its replies; replies beyond those nested in the page are fetched on demand
+function CommentItem({ comment, rumorId, index }: CommentItemProps) {
+    const [replies, setReplies] = useState<Comment[]>(comment.replies || []);
+    const [repliesCursor, setRepliesCursor] = useState<string | null>(comment.replies_cursor ?? null);
+    const [loadingReplies, setLoadingReplies] = useState(false);
+
+    useEffect(() => {
+        setReplies(comment.replies || []);
+        setRepliesCursor(comment.replies_cursor ?? null);
+    }, [comment]);
+
+    const loadReplies = async () => {
+        setLoadingReplies(true);
+        try {
+            const data = await api.getComments(rumorId, { parentId: comment.id, cursor: repliesCursor });
+            if (data.comments) setReplies(prev => [...prev, ...data.comments]);
+            setRepliesCursor(data.next_cursor ?? null);
+        } catch (e) {
+            console.error(e);
+        } finally {
+            setLoadingReplies(false);
+        }
+    };
+
+    const hiddenReplies = (comment.reply_count ?? replies.length) - replies.length;
+
+    return (
+        <div>
+            <motion.div
+                initial={{ x: -10, opacity: 0 }}
+                animate={{ x: 0, opacity: 1 }}
+                transition={{ delay: index * 0.05 }}
+                className="bg-white/5 rounded-lg p-3 border border-white/5"
+            >
+                <div className="flex items-center justify-between mb-2">
+                    <div className="flex items-center gap-2">
+                        <div className="w-5 h-5 rounded-full bg-gradient-to-br from-blue-500/20 to-blue-500/20 flex items-center justify-center border border-white/10">
+                            <User size={10} className="text-muted-foreground" />
+                        </div>
+                        <span className="text-xs font-bold text-gray-200">
+                            {comment.users?.username || 'Anon'}
+                        </span>
+                        {/* Trust Score Mini Badge */}
+                        {comment.users && (
+                            <span className={`text-[10px] px-1.5 py-0.5 rounded-full ${comment.users.trust_score >= 0.7 ? 'bg-blue-500/10 text-blue-400' : 'bg-red-500/10 text-red-400'
+                                }`}>
+                                {Math.round(comment.users.trust_score * 100)}% Trust
+                            </span>
+                        )}
+                    </div>
+                    <span className="text-[10px] text-muted-foreground">
+                        {formatTimeAgo(comment.created_at)}
+                    </span>
+                </div>
+                <p className="text-sm text-gray-300 leading-relaxed pl-7">
+                    {comment.content}
+                </p>
+            </motion.div>
+
+            {/* Replies */}
+            {(replies.length > 0 || hiddenReplies > 0) && (
+                <div className="ml-4 mt-2 pl-3 border-l border-white/10 space-y-2">
+                    {replies.map((reply, i) => (
+                        <CommentItem key={reply.id} comment={reply} rumorId={rumorId} index={i} />
+                    ))}
+                    {hiddenReplies > 0 && (
+                        <button
+                            onClick={loadReplies}
+                            disabled={loadingReplies}
+                            className="text-[11px] text-muted-foreground hover:text-foreground transition disabled:opacity-50"
+                        >
+                            {`Show ${hiddenReplies} more ${hiddenReplies === 1 ? 'reply' : 'replies'}`}
+                        </button>
+                    )}
+                </div>
+            )}
+        </div>
+    );
+}
@@ -70,7 +70,7 @@ export function RumorFeedItem({ rumor, onClick, onDiscuss }: RumorFeedItemProps)
                             className="flex items-center gap-1.5 text-xs font-medium text-muted-foreground hover:bg-secondary/50 px-2 py-1.5 rounded-md transition-colors"
                         >
                             <MessageSquare size={16} />
-                            <span>Discuss</span>
+                            <span>Discuss{rumor.comment_count ? ` (${rumor.comment_count})` : ''}</span>
                         </button>
                         {rumor.tags?.map((tag) => (
                             <span key={tag} className="text-xs text-muted-foreground bg-secondary/30 px-2 py-1 rounded-full border border-border/50">
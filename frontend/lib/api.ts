@@ -33,13 +33,29 @@ export const api = {
 
 
 
-    getComments: async (rumorId: string) => {
+    // Top-level threads (with nested replies) one page at a time; parentId pages the replies of one comment
+    getComments: async (rumorId: string, options: { cursor?: string | null; parentId?: string } = {}) => {
         const token = localStorage.getItem('token');
         const headers: Record<string, string> = {};
         if (token) headers['Authorization'] = `Bearer ${token}`;
 
-        const res = await fetch(`${API_URL}/comments/${rumorId}`, { headers });
-        if (!res.ok) return { comments: [] };
+        const params = new URLSearchParams();
+        if (options.cursor) params.set('cursor', options.cursor);
+        if (options.parentId) params.set('parent_id', options.parentId);
+        const res = await fetch(`${API_URL}/comments/${rumorId}?${params}`, { headers });
+        if (!res.ok) return { comments: [], next_cursor: null, total: 0 };
+        return res.json();
+    },
+
+    // Comment counts, SP status and the caller's vote for a page of feed cards, in one request
+    getFeedCards: async (rumorIds: string[]) => {
+        const token = localStorage.getItem('token');
+        const headers: Record<string, string> = {};
+        if (token) headers['Authorization'] = `Bearer ${token}`;
+
+        const params = new URLSearchParams({ ids: rumorIds.join(',') });
+        const res = await fetch(`${API_URL}/feed/cards?${params}`, { headers });
+        if (!res.ok) return { cards: {} };
         return res.json();
     },
 
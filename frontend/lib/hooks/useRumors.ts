@@ -21,10 +21,27 @@ export function useRumors(userId: string | null) {
         setLoading(true);
         try {
             // 1. Fetch Feed with Pagination & Sorting
-            const data = await api.get(`/feed?user_id=${userId}&page=${page}&limit=${limit}&sort=${sortBy}`);
+            const data = await api.get(`/feed?page=${page}&limit=${limit}&sort=${sortBy}`);
             if (data.rumors) {
                 setRumors(data.rumors);
                 if (data.total !== undefined) setTotalRumors(data.total);
+
+                // Comment counts, SP status and my vote for the whole page in one request
+                if (data.rumors.length > 0) {
+                    try {
+                        const { cards } = await api.getFeedCards(data.rumors.map((r: Rumor) => r.id));
+                        setRumors(data.rumors.map((r: Rumor) => cards?.[r.id] ? {
+                            ...r,
+                            comment_count: cards[r.id].comment_count,
+                            sp_status: cards[r.id].status,
+                            trust_score: cards[r.id].trust_score ?? r.trust_score,
+                            has_voted: cards[r.id].has_voted,
+                            my_vote: cards[r.id].my_vote,
+                        } : r));
+                    } catch (e) {
+                        console.warn("Could not fetch feed cards", e);
+                    }
+                }
             }
 
             // 2. Fetch User Stats (Trust Rank)
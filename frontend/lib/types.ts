@@ -10,6 +10,11 @@ export interface Rumor {
     vote_count?: number;
     tags?: string[];
     is_trap?: boolean;
+    // Feed card state (/feed/cards)
+    comment_count?: number;
+    sp_status?: string;
+    has_voted?: boolean;
+    my_vote?: boolean | null;
 }
 
 export interface Comment {
@@ -20,6 +25,10 @@ export interface Comment {
     rumor_id: string;
     parent_id?: string;
     users?: { username: string; trust_score: number }; // Joined data
+    // Threading (GET /comments/{rumor_id})
+    replies?: Comment[];
+    reply_count?: number;
+    replies_cursor?: string | null;
 }
 
 export type SwipeDirection = 'left' | 'right' | null;